@@ -0,0 +1,98 @@
+"""
+Microbenchmark for the per-task publish template used by QStashTask.delay().
+
+Compares publishing with the cached PublishTemplate against rebuilding the
+callback URL and envelope on every call (the behaviour before templates were
+introduced). The QStash client is replaced by a stub, so only django-qstash's
+own per-publish work is measured.
+
+Usage (from the repository root):
+
+    python benchmarks/publish_template.py
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+import tracemalloc
+from types import MappingProxyType
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django_qstash.app import QStashTask  # noqa: E402
+from django_qstash.app import stashed_task  # noqa: E402
+from django_qstash.callbacks import get_callback_url  # noqa: E402
+
+ITERATIONS = 20000
+
+
+class StubResponse:
+    message_id = "benchmark-message-id"
+
+
+class StubMessageApi:
+    def publish_json(self, **kwargs):
+        return StubResponse()
+
+
+class StubClient:
+    message = StubMessageApi()
+
+
+class UncachedQStashTask(QStashTask):
+    """Rebuilds the callback URL and envelope for every publish."""
+
+    def _get_template(self, request):
+        self._check_settings()
+        return self._build_template(
+            get_callback_url(), self.delay_seconds, MappingProxyType(self.options)
+        )
+
+
+def add(x, y):
+    return x + y
+
+
+def measure(task: QStashTask) -> tuple[float, float]:
+    """Return (microseconds per publish, peak bytes allocated per publish)."""
+    task.delay(1, 2)  # warm up (builds the cached template)
+
+    start = time.perf_counter()
+    for i in range(ITERATIONS):
+        task.delay(i, i)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    peak_total = 0
+    for i in range(ITERATIONS):
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        task.delay(i, i)
+        _, peak = tracemalloc.get_traced_memory()
+        peak_total += peak - current
+    tracemalloc.stop()
+    return elapsed / ITERATIONS * 1_000_000, peak_total / ITERATIONS
+
+
+def main() -> None:
+    cached = stashed_task(max_retries=5)(add)
+    uncached = UncachedQStashTask(add, max_retries=5)
+    with patch("django_qstash.app.base.qstash_client", StubClient()):
+        for label, task in (("uncached", uncached), ("template", cached)):
+            micros, peak_bytes = measure(task)
+            print(
+                f"{label:>9}: {micros:6.2f} us/publish, "
+                f"{peak_bytes:7.1f} peak bytes allocated/publish"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Microbenchmark for QStashWebhook.handle_request() throughput.
+
+Compares constructing a QStashWebhook (and its qstash Receiver) for every
+delivery, as the webhook view used to, against reusing the process-wide
+webhook from get_webhook(), and times the construction on its own. Requests carry a real HS256 signature so the
+signature check is included; storing task results is stubbed out so only the
+webhook's own work is measured.
+
+The two variants run in alternating order for several rounds, so drift in
+machine load or CPU frequency affects both alike, and the median of the
+rounds is reported with the spread.
+
+Usage (from the repository root):
+
+    python benchmarks/webhook_handler.py
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import os
+import statistics
+import sys
+import time
+import warnings
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+import jwt  # noqa: E402
+from django.conf import settings  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+
+from django_qstash.app import stashed_task  # noqa: E402
+from django_qstash.handlers import QStashWebhook  # noqa: E402
+from django_qstash.handlers import get_webhook  # noqa: E402
+
+ITERATIONS = 5000
+ROUNDS = 9
+URL = "https://localhost/qstash/webhook/"
+
+
+@stashed_task
+def add(x, y):
+    return x + y
+
+
+def build_request():
+    body = json.dumps(
+        {"function": "add", "module": "__main__", "args": [1, 2], "kwargs": {}}
+    )
+    body_hash = base64.urlsafe_b64encode(hashlib.sha256(body.encode()).digest())
+    now = int(time.time())
+    signature = jwt.encode(
+        {
+            "iss": "Upstash",
+            "sub": URL,
+            "exp": now + 3600,
+            "nbf": now - 60,
+            "body": body_hash.decode().rstrip("="),
+        },
+        settings.QSTASH_CURRENT_SIGNING_KEY,
+        algorithm="HS256",
+    )
+    return RequestFactory().post(
+        "/qstash/webhook/",
+        data=body,
+        content_type="application/json",
+        headers={"Upstash-Signature": signature, "Upstash-Message-Id": "msg-id"},
+        secure=True,
+        HTTP_HOST="localhost",
+    )
+
+
+def measure(get_handler, request) -> float:
+    """Return handled requests per second."""
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        get_handler().handle_request(request)
+    return ITERATIONS / (time.perf_counter() - start)
+
+
+def main() -> None:
+    # The test signing keys are shorter than PyJWT recommends
+    warnings.simplefilter("ignore")
+    variants = [("per-request", QStashWebhook), ("cached", get_webhook)]
+    rates: dict[str, list[float]] = {label: [] for label, _ in variants}
+    request = build_request()
+    with patch("django_qstash.handlers.store_task_result"):
+        for _label, get_handler in variants:
+            # Warm up imports and caches before timing
+            response, status = get_handler().handle_request(request)
+            assert status == 200, response
+        for round_number in range(ROUNDS):
+            order = variants if round_number % 2 == 0 else variants[::-1]
+            for label, get_handler in order:
+                rates[label].append(measure(get_handler, request))
+    for label, values in rates.items():
+        print(
+            f"{label:>11}: median {statistics.median(values):7.0f} requests/s "
+            f"(min {min(values):.0f}, max {max(values):.0f}, {ROUNDS} rounds)"
+        )
+    # The work the cached webhook saves on each request
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        QStashWebhook()
+    per_call = (time.perf_counter() - start) / ITERATIONS
+    print(f"QStashWebhook(): {per_call * 1e6:.1f} µs per construction")
+
+
+if __name__ == "__main__":
+    main()
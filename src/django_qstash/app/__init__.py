@@ -2,8 +2,16 @@ from __future__ import annotations
 
 from .base import AsyncResult
 from .base import QStashTask
+from .base import arevoke
 from .base import revoke
 from .decorators import shared_task
 from .decorators import stashed_task
 
-__all__ = ["AsyncResult", "QStashTask", "stashed_task", "shared_task", "revoke"]
+__all__ = [
+    "AsyncResult",
+    "QStashTask",
+    "stashed_task",
+    "shared_task",
+    "revoke",
+    "arevoke",
+]
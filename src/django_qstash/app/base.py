@@ -1,19 +1,110 @@
 from __future__ import annotations
 
 import functools
+import itertools
+from concurrent.futures import Future
+from dataclasses import dataclass
+from dataclasses import field
+from dataclasses import replace
+from datetime import timedelta
+from types import MappingProxyType
 from typing import Any
 from typing import Callable
+from typing import Iterable
+from typing import Mapping
 
+from asgiref.sync import sync_to_async
+from django.apps import apps
 from django.core.exceptions import ImproperlyConfigured
 
+from django_qstash.app.registry import task_registry
 from django_qstash.callbacks import get_callback_url
+from django_qstash.claimcheck import services as claimcheck_services
+from django_qstash.client import get_async_qstash_client
 from django_qstash.client import qstash_client
-from django_qstash.results.models import TaskResult
+from django_qstash.compression import compress_body
 from django_qstash.db.models import TaskStatus
+from django_qstash.exceptions import TaskFailed
+from django_qstash.outbox.services import enqueue_messages
+from django_qstash.publisher import get_background_publisher
+from django_qstash.results.services import READY_STATUSES
+from django_qstash.results.services import acreate_pending_results
+from django_qstash.results.services import create_pending_results
+from django_qstash.results.services import get_task_result
+from django_qstash.results.services import result_value
+from django_qstash.results.services import wait_for_task_result
+from django_qstash.serializers import batch_messages
+from django_qstash.serializers import get_serializer
+from django_qstash.serializers import publish_message
+from django_qstash.settings import DJANGO_QSTASH_BATCH_SIZE
 from django_qstash.settings import DJANGO_QSTASH_DOMAIN
+from django_qstash.settings import DJANGO_QSTASH_PUBLISH_MODE
 from django_qstash.settings import QSTASH_TOKEN
 
 
+@dataclass(frozen=True)
+class PublishRequest:
+    """
+    A single task invocation to publish.
+
+    Built per delay()/apply_async() call so concurrent callers never share or
+    mutate state on the module-level task object. `countdown` and `options` are
+    only set when the call overrides the task defaults.
+    """
+
+    args: tuple
+    kwargs: dict
+    countdown: int | None = None
+    options: Mapping[str, Any] | None = None
+    # Workflow state for django_qstash.canvas ("chain" and "chord" body fields)
+    canvas: Mapping[str, Any] | None = None
+    # Bundle state for bundle(); `args` then holds one argument list per item
+    bundle: Mapping[str, Any] | None = None
+
+
+@dataclass(frozen=True)
+class PublishTemplate:
+    """
+    The parts of a task's QStash message that do not change between calls.
+
+    Built once per task (and settings) so publishing only has to merge the
+    per-call args and kwargs into the envelope.
+    """
+
+    envelope: Mapping[str, Any]
+    message_options: Mapping[str, Any]
+    delay_seconds: int | None
+
+    def build_body(
+        self,
+        args: tuple,
+        kwargs: dict,
+        claim_check: dict[str, str] | None = None,
+        canvas: Mapping[str, Any] | None = None,
+        bundle: Mapping[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Build the message body the webhook expects for a single invocation.
+
+        With a claim check the arguments are left out of the body and loaded
+        by the webhook from the claim-check backend instead.
+        """
+        if claim_check is not None:
+            body = {**self.envelope, "args": (), "kwargs": {}}
+            body["claim_check"] = claim_check
+        else:
+            body = {**self.envelope, "args": args, "kwargs": kwargs}
+        if canvas:
+            body.update(canvas)
+        if bundle is not None:
+            body["bundle"] = dict(bundle)
+        return body
+
+    def build_message(self, body: dict[str, Any]) -> dict[str, Any]:
+        """Build the QStash publish_json/batch_json arguments for a message body"""
+        return {**self.message_options, "body": body}
+
+
 class QStashTask:
     def __init__(
         self,
@@ -21,16 +112,49 @@ class QStashTask:
         name: str | None = None,
         delay_seconds: int | None = None,
         deduplicated: bool = False,
+        idempotent: bool = False,
+        time_limit: float | None = None,
+        soft_time_limit: float | None = None,
+        concurrency: int | None = None,
+        store_result: bool = True,
+        store_errors_only: bool = False,
+        result_expires: int | timedelta | None = None,
         **options: dict[str, Any],
     ):
         self.func = func
         self.name = name or (func.__name__ if func else None)
         self.delay_seconds = delay_seconds
         self.deduplicated = deduplicated
+        # Skip redelivered messages in the webhook, see django_qstash.idempotency
+        self.idempotent = idempotent
+        # Enforced by the webhook, see django_qstash.timelimits
+        self.time_limit = time_limit
+        self.soft_time_limit = soft_time_limit
+        # Maximum deliveries running at once, see django_qstash.concurrency
+        self.concurrency = concurrency
+        # Which TaskResult rows the webhook writes, see should_store_result()
+        self.store_result = store_result
+        self.store_errors_only = store_errors_only
+        # Seconds the task's results are kept, see TaskResult.expires_at
+        if isinstance(result_expires, timedelta):
+            result_expires = int(result_expires.total_seconds())
+        self.result_expires = result_expires
         self.options = options
 
         if func is not None:
             functools.update_wrapper(self, func)
+            task_registry.register(self)
+
+    @property
+    def task_path(self) -> str:
+        """The dotted path the webhook uses to look the task up"""
+        return f"{self.func.__module__}.{self.func.__name__}"
+
+    def should_store_result(self, status: str) -> bool:
+        """Whether the webhook stores a TaskResult with this status"""
+        if not self.store_result:
+            return False
+        return not (self.store_errors_only and status == TaskStatus.SUCCESS)
 
     def __get__(self, obj, objtype):
         """Support for instance methods"""
@@ -38,12 +162,9 @@ class QStashTask:
 
     def __call__(self, *args, **kwargs):
         """
-        Execute the task, either directly or via QStash based on context
+        Execute the task directly. Use delay()/apply_async() to run it via QStash.
         """
-        if not QSTASH_TOKEN or not DJANGO_QSTASH_DOMAIN:
-            raise ImproperlyConfigured(
-                "QSTASH_TOKEN and DJANGO_QSTASH_DOMAIN must be set to use django-qstash"
-            )
+        self._check_settings()
         # Handle the case when the decorator is used without parameters
         if self.func is None:
             return self.__class__(
@@ -51,42 +172,143 @@ class QStashTask:
                 name=self.name,
                 delay_seconds=self.delay_seconds,
                 deduplicated=self.deduplicated,
+                idempotent=self.idempotent,
+                time_limit=self.time_limit,
+                soft_time_limit=self.soft_time_limit,
+                concurrency=self.concurrency,
+                store_result=self.store_result,
+                store_errors_only=self.store_errors_only,
+                result_expires=self.result_expires,
                 **self.options,
             )
+        return self.func(*args, **kwargs)
 
-        # If called directly (not through delay/apply_async), execute the function
-        if not getattr(self, "_is_delayed", False):
-            return self.func(*args, **kwargs)
+    def _check_settings(self) -> None:
+        if not QSTASH_TOKEN or not DJANGO_QSTASH_DOMAIN:
+            raise ImproperlyConfigured(
+                "QSTASH_TOKEN and DJANGO_QSTASH_DOMAIN must be set to use django-qstash"
+            )
 
-        # Reset the delayed flag
-        self._is_delayed = False
+    @functools.cached_property
+    def _publish_template(self) -> PublishTemplate:
+        """The task's default PublishTemplate, built on first publish"""
+        self._check_settings()
+        return self._build_template(
+            get_callback_url(), self.delay_seconds, MappingProxyType(self.options)
+        )
 
-        # Prepare the payload
-        payload = {
+    def _build_template(
+        self, url: str, delay_seconds: int | None, options: Mapping[str, Any]
+    ) -> PublishTemplate:
+        message_options = {
+            "url": url,
+            "retries": options.get("max_retries", 3),
+            "content_based_deduplication": self.deduplicated,
+        }
+        if delay_seconds:
+            message_options["delay"] = f"{delay_seconds}s"
+        envelope = {
             "function": self.func.__name__,
             "module": self.func.__module__,
-            "args": args,  # Send args as-is
-            "kwargs": kwargs,
             "task_name": self.name,
-            "options": self.options,
+            "options": dict(options),
         }
+        return PublishTemplate(
+            envelope=MappingProxyType(envelope),
+            message_options=MappingProxyType(message_options),
+            delay_seconds=delay_seconds,
+        )
+
+    def _get_template(self, request: PublishRequest) -> PublishTemplate:
+        """Get the template for a request, deriving one if it overrides defaults"""
+        template = self._publish_template
+        if request.countdown is None and request.options is None:
+            return template
+        return self._build_template(
+            template.message_options["url"],
+            request.countdown if request.countdown is not None else self.delay_seconds,
+            {**self.options, **(request.options or {})},
+        )
+
+    def _build_request(
+        self,
+        args: Iterable[Any] = (),
+        kwargs: dict | None = None,
+        countdown: int | None = None,
+        options: dict[str, Any] | None = None,
+        canvas: dict[str, Any] | None = None,
+        bundle: dict[str, Any] | None = None,
+    ) -> PublishRequest:
+        """Capture the per-call arguments, countdown and options"""
+        return PublishRequest(
+            args=tuple(args),
+            kwargs=kwargs or {},
+            countdown=countdown,
+            options=MappingProxyType(dict(options)) if options else None,
+            canvas=MappingProxyType(canvas) if canvas else None,
+            bundle=MappingProxyType(bundle) if bundle is not None else None,
+        )
+
+    def _prepare_body(
+        self, template: PublishTemplate, request: PublishRequest
+    ) -> dict[str, Any]:
+        """
+        Build the message body, offloading oversized arguments to a claim check
+        and compressing large bodies.
+        """
+        claim_check = None
+        if claimcheck_services.is_enabled():
+            claim_check = claimcheck_services.offload_arguments(
+                request.args, request.kwargs
+            )
+        body = template.build_body(
+            request.args, request.kwargs, claim_check, request.canvas, request.bundle
+        )
+        return compress_body(body, get_serializer())
+
+    def _prepare_message(self, request: PublishRequest) -> dict[str, Any]:
+        """Build the QStash publish_json/batch_json arguments for a request"""
+        template = self._get_template(request)
+        return template.build_message(self._prepare_body(template, request))
+
+    def _pending_result(
+        self, message_id: str, args: Iterable[Any], kwargs: dict
+    ) -> dict[str, Any]:
+        """The PENDING TaskResult fields for a published message"""
+        if not self.store_result or self.store_errors_only:
+            # The webhook would never complete the row
+            return {}
+        return {
+            "task_id": message_id,
+            "task_name": self.name,
+            "function_path": self.task_path,
+            "args": args,
+            "kwargs": kwargs,
+        }
+
+    def _publish(self, request: PublishRequest) -> AsyncResult:
+        """Publish a single request according to DJANGO_QSTASH_PUBLISH_MODE"""
+        if DJANGO_QSTASH_PUBLISH_MODE == "outbox":
+            # Published by the outbox flusher after the transaction commits
+            self._enqueue([request])
+            return AsyncResult(None)
+
+        message = self._prepare_message(request)
+        if DJANGO_QSTASH_PUBLISH_MODE == "background":
+            # The message id resolves once a publisher thread has sent the message
+            return AsyncResult(future=get_background_publisher().submit(message))
 
-        url = get_callback_url()
         # Send to QStash using the official SDK
-        response = qstash_client.message.publish_json(
-            url=url,
-            body=payload,
-            delay=f"{self.delay_seconds}s" if self.delay_seconds else None,
-            retries=self.options.get("max_retries", 3),
-            content_based_deduplication=self.deduplicated,
+        response = publish_message(qstash_client.message, message)
+        create_pending_results(
+            [self._pending_result(response.message_id, request.args, request.kwargs)]
         )
         # Return an AsyncResult-like object for Celery compatibility
         return AsyncResult(response.message_id)
 
     def delay(self, *args, **kwargs) -> AsyncResult:
         """Celery-compatible delay() method"""
-        self._is_delayed = True
-        return self(*args, **kwargs)
+        return self._publish(self._build_request(args, kwargs))
 
     def apply_async(
         self,
@@ -96,42 +318,373 @@ class QStashTask:
         **options: dict[str, Any],
     ) -> AsyncResult:
         """Celery-compatible apply_async() method"""
-        self._is_delayed = True
+        return self._publish(
+            self._build_request(args or (), kwargs, countdown, options)
+        )
+
+    def map(self, iterable: Iterable[Any], **options: Any) -> list[AsyncResult]:
+        """
+        Celery-compatible map() method.
+
+        Publishes one message per item, calling the task with a single
+        argument, using QStash batch requests.
+        """
+        return self.starmap(((item,) for item in iterable), **options)
+
+    def starmap(
+        self,
+        iterable: Iterable[tuple],
+        countdown: int | None = None,
+        **options: dict[str, Any],
+    ) -> list[AsyncResult]:
+        """
+        Celery-compatible starmap() method.
+
+        Publishes one message per argument tuple. Messages are sent in chunks of
+        DJANGO_QSTASH_BATCH_SIZE with a single batch request per chunk, and the
+        returned AsyncResults are in the same order as the input.
+        """
+        requests = (
+            self._build_request(args, None, countdown, options) for args in iterable
+        )
+        return publish_requests((self, request) for request in requests)
+
+    def bundle(
+        self,
+        iterable: Iterable[tuple],
+        size: int = 100,
+        countdown: int | None = None,
+        **options: dict[str, Any],
+    ) -> list[AsyncResult]:
+        """
+        Publish many small invocations, `size` argument tuples per message.
+
+        The webhook runs every item of a bundle in one delivery and stores one
+        TaskResult per item, with the task id `<message id>:<index>`. Items
+        that fail are re-published as a new bundle (up to `max_retries` times)
+        instead of redelivering the whole message, so the items that
+        succeeded never run twice.
+
+        Returns one AsyncResult per message, not per item; its result is a
+        summary of the items of the first delivery.
+        """
+        if size < 1:
+            raise ValueError("Bundle size must be at least 1")
+        items = iter(iterable)
+        chunks = iter(
+            lambda: [list(args) for args in itertools.islice(items, size)], []
+        )
+        bundle = {"attempt": 0}
         if countdown is not None:
-            self.delay_seconds = countdown
-        self.options.update(options)
+            # Failed items are re-published with the same countdown
+            bundle["countdown"] = countdown
+        requests = (
+            self._build_request(chunk, None, countdown, options, bundle=bundle)
+            for chunk in chunks
+        )
+        return publish_requests((self, request) for request in requests)
+
+    def _retry_bundle(
+        self,
+        items: list[list],
+        task_ids: list[str | None],
+        bundle: Mapping[str, Any],
+        options: Mapping[str, Any],
+    ) -> AsyncResult:
+        """
+        Re-publish the failed items of a bundle delivery as a new bundle.
+
+        The items keep their task ids, and the new message gets the countdown
+        and options of the original bundle() call.
+        """
+        state = {
+            **bundle,
+            "attempt": bundle.get("attempt", 0) + 1,
+            "task_ids": task_ids,
+        }
+        request = self._build_request(
+            items, None, bundle.get("countdown"), dict(options), bundle=state
+        )
+        return publish_requests([(self, request)])[0]
+
+    def s(self, *args, **kwargs) -> Signature:
+        """Celery-compatible signature, for use with django_qstash.canvas"""
+        return Signature(self, args, kwargs)
+
+    def si(self, *args, **kwargs) -> Signature:
+        """Immutable signature that ignores the result of the previous task"""
+        return Signature(self, args, kwargs, immutable=True)
+
+    async def adelay(self, *args, **kwargs) -> AsyncResult:
+        """Async counterpart of delay() using the async QStash client"""
+        return await self._apublish(self._build_request(args, kwargs))
+
+    async def aapply_async(
+        self,
+        args: tuple | None = None,
+        kwargs: dict | None = None,
+        countdown: int | None = None,
+        **options: dict[str, Any],
+    ) -> AsyncResult:
+        """Async counterpart of apply_async() using the async QStash client"""
+        return await self._apublish(
+            self._build_request(args or (), kwargs, countdown, options)
+        )
+
+    async def _apublish(self, request: PublishRequest) -> AsyncResult:
+        """Publish a single request without blocking the event loop"""
+        if DJANGO_QSTASH_PUBLISH_MODE == "outbox":
+            await sync_to_async(self._enqueue)([request])
+            return AsyncResult(None)
+
+        if claimcheck_services.is_enabled():
+            # Offloading large arguments writes to the claim-check backend
+            message = await sync_to_async(self._prepare_message)(request)
+        else:
+            message = self._prepare_message(request)
+        response = await publish_message(get_async_qstash_client().message, message)
+        await acreate_pending_results(
+            [self._pending_result(response.message_id, request.args, request.kwargs)]
+        )
+        return AsyncResult(response.message_id)
+
+    def _enqueue(self, requests: list[PublishRequest]) -> None:
+        """Write messages to the transactional outbox instead of publishing them"""
+        if not requests:
+            return
+        # Requests from a single call share their countdown and options
+        template = self._get_template(requests[0])
+        enqueue_messages(
+            task_name=self.name,
+            bodies=[self._prepare_body(template, request) for request in requests],
+            retries=template.message_options["retries"],
+            content_based_deduplication=self.deduplicated,
+            delay_seconds=template.delay_seconds,
+        )
 
-        # Fix: Ensure we're passing the arguments correctly
-        args = args or ()
-        kwargs = kwargs or {}
-        return self(*args, **kwargs)
+
+@dataclass(frozen=True)
+class Signature:
+    """
+    A task invocation that has not been published yet.
+
+    Signatures are the building blocks of django_qstash.canvas workflows. In a
+    chain, the previous task's result is prepended to the arguments unless the
+    signature is immutable.
+    """
+
+    task: QStashTask
+    args: tuple = ()
+    kwargs: Mapping[str, Any] = field(default_factory=dict)
+    countdown: int | None = None
+    options: Mapping[str, Any] = field(default_factory=dict)
+    immutable: bool = False
+
+    @property
+    def task_path(self) -> str:
+        return self.task.task_path
+
+    def set(self, countdown: int | None = None, **options: Any) -> Signature:
+        """Return a copy with a different countdown and extra publish options"""
+        return replace(
+            self,
+            countdown=countdown if countdown is not None else self.countdown,
+            options={**self.options, **options},
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Encode the signature for a message body"""
+        return {
+            "task": self.task_path,
+            "args": self.args,
+            "kwargs": dict(self.kwargs),
+            "countdown": self.countdown,
+            "options": dict(self.options),
+            "immutable": self.immutable,
+        }
+
+    def build_request(
+        self, parent_results: tuple = (), canvas: dict[str, Any] | None = None
+    ) -> PublishRequest:
+        """Build the PublishRequest, prepending `parent_results` unless immutable"""
+        args = self.args if self.immutable else (*parent_results, *self.args)
+        return self.task._build_request(
+            args, dict(self.kwargs), self.countdown, self.options, canvas
+        )
+
+    def apply_async(self) -> AsyncResult:
+        """Publish the signature on its own"""
+        return self.task._publish(self.build_request())
+
+    def delay(self) -> AsyncResult:
+        return self.apply_async()
+
+
+def publish_requests(
+    items: Iterable[tuple[QStashTask, PublishRequest]],
+) -> list[AsyncResult]:
+    """
+    Publish requests for one or more tasks according to DJANGO_QSTASH_PUBLISH_MODE.
+
+    Messages are sent in chunks of DJANGO_QSTASH_BATCH_SIZE with a single batch
+    request per chunk, and the returned AsyncResults are in the same order as
+    the input.
+    """
+    if DJANGO_QSTASH_PUBLISH_MODE == "outbox":
+        results = []
+        # _enqueue() expects requests sharing a task, countdown and options
+        for (task, *_), group in itertools.groupby(
+            items, key=lambda item: (item[0], item[1].countdown, item[1].options)
+        ):
+            requests = [request for _, request in group]
+            task._enqueue(requests)
+            results.extend(AsyncResult(None) for _ in requests)
+        return results
+
+    if DJANGO_QSTASH_PUBLISH_MODE == "background":
+        publisher = get_background_publisher()
+        return [
+            AsyncResult(future=publisher.submit(task._prepare_message(request)))
+            for task, request in items
+        ]
+
+    items = iter(items)
+    results = []
+    while chunk := list(itertools.islice(items, DJANGO_QSTASH_BATCH_SIZE)):
+        responses = batch_messages(
+            qstash_client.message,
+            [task._prepare_message(request) for task, request in chunk],
+        )
+        create_pending_results(
+            [
+                task._pending_result(response.message_id, request.args, request.kwargs)
+                for (task, request), response in zip(chunk, responses)
+            ]
+        )
+        results.extend(AsyncResult(response.message_id) for response in responses)
+    return results
 
 
 class AsyncResult:
-    """Minimal Celery AsyncResult-compatible class"""
+    """
+    Minimal Celery AsyncResult-compatible class
 
-    def __init__(self, task_id: str):
-        self.task_id = task_id  
+    `task_id` is the QStash message id. It is `None` for messages written to the
+    outbox, since the id is only assigned once the outbox is flushed. In the
+    background publish mode the id comes from `future` and accessing it blocks
+    until the message has been published, raising `PublishDropped` if the
+    publisher dropped it.
+    """
 
-    def get(self, timeout: int | None = None) -> Any:
-        """Simulate Celery's get() method"""
-        raise NotImplementedError("QStash doesn't support result retrieval")
+    def __init__(self, task_id: str | None = None, future: Future | None = None):
+        self._task_id = task_id
+        self._future = future
 
     @property
-    def id(self) -> str:
+    def task_id(self) -> str | None:
+        if self._future is not None:
+            self._task_id = self._future.result()
+            self._future = None
+        return self._task_id
+
+    def get(
+        self,
+        timeout: float | None = None,
+        propagate: bool = True,
+        interval: float = 0.1,
+        max_interval: float = 2.0,
+    ) -> Any:
+        """
+        Celery-compatible get(): wait for the task and return its result.
+
+        Needs django_qstash.results. Polls with exponential backoff from
+        `interval` up to `max_interval` seconds, woken up early when
+        DJANGO_QSTASH_RESULT_WAKEUP is set. Raises ResultTimeout after
+        `timeout` seconds, and TaskFailed for a failed task unless
+        `propagate` is False, in which case the TaskFailed is returned. A
+        failure QStash still retries (RETRY) is not final and is waited out.
+        """
+        if self.task_id is None:
+            raise ValueError(
+                "The message has no id yet, e.g. it is still in the outbox"
+            )
+        task_result = wait_for_task_result(
+            self.task_id, timeout, interval, max_interval
+        )
+        if task_result.status == TaskStatus.SUCCESS:
+            return result_value(task_result.result)
+        error = TaskFailed(
+            f"Task {self.task_id} finished with status {task_result.status}",
+            task_result.status,
+            task_result.traceback,
+        )
+        if propagate:
+            raise error
+        return error
+
+    @property
+    def status(self) -> str:
+        """The status of the latest stored result, PENDING if there is none"""
+        if self.task_id is None:
+            return TaskStatus.PENDING
+        task_result = get_task_result(self.task_id)
+        if task_result is None:
+            return TaskStatus.PENDING
+        return task_result.status
+
+    state = status
+
+    def ready(self) -> bool:
+        """Whether the task has finished, successfully or not"""
+        return self.status in READY_STATUSES
+
+    def successful(self) -> bool:
+        return self.status == TaskStatus.SUCCESS
+
+    def failed(self) -> bool:
+        status = self.status
+        return status in READY_STATUSES and status != TaskStatus.SUCCESS
+
+    @property
+    def id(self) -> str | None:
         return self.task_id
 
     def revoke(self) -> bool:
         """Revoke (cancel) the task using the revoke function."""
         return revoke(self.task_id)
 
+    async def arevoke(self) -> bool:
+        """Async counterpart of revoke() using the async QStash client."""
+        return await arevoke(self.task_id)
+
 
 def revoke(task_id: str) -> bool:
     """Revoke (cancel) a task using QStash's cancel API and update DB if possible."""
     try:
         qstash_client.message.cancel(task_id)
         # Update DB status if TaskResult exists
+        try:
+            TaskResult = apps.get_model("django_qstash_results", "TaskResult")
+        except LookupError:
+            return True
         TaskResult.objects.filter(task_id=task_id).update(status=TaskStatus.CANCELED)
         return True
     except Exception as e:
         return False
+
+
+async def arevoke(task_id: str) -> bool:
+    """Async counterpart of revoke() using the async QStash client and async ORM."""
+    try:
+        await get_async_qstash_client().message.cancel(task_id)
+        # Update DB status if TaskResult exists
+        try:
+            TaskResult = apps.get_model("django_qstash_results", "TaskResult")
+        except LookupError:
+            return True
+        await TaskResult.objects.filter(task_id=task_id).aupdate(
+            status=TaskStatus.CANCELED
+        )
+        return True
+    except Exception:
+        return False
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from datetime import timedelta
 from typing import Any
 from typing import Callable
 
@@ -10,6 +11,13 @@ def stashed_task(
     func: Callable | None = None,
     name: str | None = None,
     deduplicated: bool = False,
+    idempotent: bool = False,
+    time_limit: float | None = None,
+    soft_time_limit: float | None = None,
+    concurrency: int | None = None,
+    store_result: bool = True,
+    store_errors_only: bool = False,
+    result_expires: int | timedelta | None = None,
     **options: dict[str, Any],
 ) -> QStashTask:
     """
@@ -27,10 +35,32 @@ def stashed_task(
         @stashed_task(name="custom_name", deduplicated=True)
         def my_task():
             pass
+
+    With `idempotent=True` the webhook runs the task once per QStash message
+    id, even if QStash redelivers the message. `soft_time_limit` raises
+    SoftTimeLimitExceeded inside the task and `time_limit` makes the webhook
+    give up on it (both in seconds). `concurrency` caps how many deliveries
+    of the task run at once across all webhook processes.
+    `store_result=False` skips the TaskResult rows for the task and
+    `store_errors_only=True` only stores failed runs. `result_expires` (seconds
+    or a timedelta) sets when the task's results are deleted by
+    clear_stale_results, instead of DJANGO_QSTASH_RESULT_TTL.
     """
+    task_options = {
+        "name": name,
+        "deduplicated": deduplicated,
+        "idempotent": idempotent,
+        "time_limit": time_limit,
+        "soft_time_limit": soft_time_limit,
+        "concurrency": concurrency,
+        "store_result": store_result,
+        "store_errors_only": store_errors_only,
+        "result_expires": result_expires,
+        **options,
+    }
     if func is not None:
-        return QStashTask(func, name=name, deduplicated=deduplicated, **options)
-    return lambda f: QStashTask(f, name=name, deduplicated=deduplicated, **options)
+        return QStashTask(func, **task_options)
+    return lambda f: QStashTask(f, **task_options)
 
 
 def shared_task(func: Callable | None = None, **options: dict[str, Any]) -> QStashTask:
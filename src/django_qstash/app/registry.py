@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import logging
+import threading
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from django_qstash.app.base import QStashTask
+
+logger = logging.getLogger(__name__)
+
+
+class TaskRegistry:
+    """
+    Every QStashTask, keyed by dotted path and by task name.
+
+    Tasks register themselves when they are decorated. The webhook resolves
+    deliveries with a dict lookup and rejects paths that are not registered,
+    so a payload can never make the webhook import or call anything else.
+    """
+
+    def __init__(self):
+        self._by_path: dict[str, QStashTask] = {}
+        self._by_name: dict[str, QStashTask] = {}
+        self._lock = threading.Lock()
+        self._discovered = False
+
+    def register(self, task: QStashTask) -> None:
+        path = task.task_path
+        with self._lock:
+            self._by_path[path] = task
+            existing = self._by_name.setdefault(task.name, task)
+            if existing is not task and existing.task_path != path:
+                logger.warning(
+                    "Task name %r is used by both %s and %s; look it up by path",
+                    task.name,
+                    existing.task_path,
+                    path,
+                )
+
+    def get(self, path: str) -> QStashTask | None:
+        """Get a task by dotted path, discovering app tasks modules on a miss."""
+        task = self._by_path.get(path)
+        if task is None and not self._discovered:
+            self.autodiscover()
+            task = self._by_path.get(path)
+        return task
+
+    def get_by_name(self, name: str) -> QStashTask | None:
+        task = self._by_name.get(name)
+        if task is None and not self._discovered:
+            self.autodiscover()
+            task = self._by_name.get(name)
+        return task
+
+    def autodiscover(self) -> None:
+        """Import the tasks modules of installed apps so their tasks register."""
+        from django_qstash.discovery.utils import discover_tasks
+
+        discover_tasks()
+        self._discovered = True
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._by_path
+
+    def __len__(self) -> int:
+        return len(self._by_path)
+
+
+task_registry = TaskRegistry()
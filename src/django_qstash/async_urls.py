@@ -0,0 +1,9 @@
+from __future__ import annotations
+
+from django.urls import path
+
+from django_qstash.views import async_qstash_webhook_view
+
+urlpatterns = [
+    path("", async_qstash_webhook_view),
+]
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import atexit
+import os
+import threading
+from typing import Any
+from typing import Callable
+
+
+class ProcessSingleton:
+    """
+    A lazily created, process-wide instance of a class that runs daemon threads.
+
+    Used by the background publisher, the buffered result writer and the task
+    stats accumulator. The instance is shut down at exit, so it can send or
+    write what it still holds. In a forked child it is reset instead: what it
+    holds belongs to the parent and its threads do not survive fork(), so the
+    child starts its own threads on first use.
+
+    The instance needs a `_lock`, a `_reset()` that drops its threads and
+    state, and a `shutdown(timeout)`.
+    """
+
+    def __init__(
+        self, factory: Callable[[], Any], shutdown_timeout: float | None = None
+    ):
+        self.factory = factory
+        self.shutdown_timeout = shutdown_timeout
+        self.instance: Any = None
+        self._lock = threading.Lock()
+        atexit.register(self.shutdown)
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def get(self) -> Any:
+        """Get the instance, creating it on first use."""
+        if self.instance is None:
+            with self._lock:
+                if self.instance is None:
+                    self.instance = self.factory()
+        return self.instance
+
+    def shutdown(self) -> None:
+        """Shut the instance down if it was created."""
+        if self.instance is not None:
+            self.instance.shutdown(timeout=self.shutdown_timeout)
+
+    def _reset_after_fork(self) -> None:
+        self._lock = threading.Lock()
+        if self.instance is not None:
+            self.instance._lock = threading.Lock()
+            self.instance._reset()
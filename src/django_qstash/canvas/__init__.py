@@ -0,0 +1,9 @@
+from __future__ import annotations
+
+from django_qstash.app.base import Signature
+from django_qstash.canvas.primitives import GroupResult
+from django_qstash.canvas.primitives import chain
+from django_qstash.canvas.primitives import chord
+from django_qstash.canvas.primitives import group
+
+__all__ = ["Signature", "GroupResult", "group", "chain", "chord"]
@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+from django.contrib import admin
+
+from .models import ChordCounter
+
+
+@admin.register(ChordCounter)
+class ChordCounterAdmin(admin.ModelAdmin):
+    readonly_fields = ["id", "body", "total", "remaining", "date_created"]
+    list_display = ["id", "total", "remaining", "date_created"]
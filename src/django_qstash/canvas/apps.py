@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+from django.apps import AppConfig
+
+
+class CanvasConfig(AppConfig):
+    name = "django_qstash.canvas"
+    label = "django_qstash_canvas"
+    verbose_name = "django_qstash_canvas"
+    default_auto_field = "django.db.models.BigAutoField"
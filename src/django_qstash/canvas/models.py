@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import uuid
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+
+class ChordCounter(models.Model):
+    """
+    Tracks a chord until every header task has succeeded.
+
+    `remaining` is decremented under a row lock as header results arrive; the
+    delivery that brings it to zero publishes `body` with the header results.
+    """
+
+    id = models.UUIDField(
+        primary_key=True, default=uuid.uuid4, editable=False, unique=True
+    )
+    body = models.JSONField(encoder=DjangoJSONEncoder)
+    total = models.PositiveIntegerField()
+    remaining = models.PositiveIntegerField()
+    date_created = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        app_label = "django_qstash_canvas"
+        ordering = ["-date_created"]
+
+    def __str__(self):
+        return f"{self.id} ({self.total - self.remaining}/{self.total})"
+
+
+class ChordResult(models.Model):
+    """The result of a single chord header task."""
+
+    chord = models.ForeignKey(
+        ChordCounter, on_delete=models.CASCADE, related_name="results"
+    )
+    index = models.PositiveIntegerField()
+    result = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+
+    class Meta:
+        app_label = "django_qstash_canvas"
+        ordering = ["index"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["chord", "index"], name="unique_chord_result_index"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.chord_id}[{self.index}]"
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from typing import Any
+from typing import Iterable
+from typing import Iterator
+
+from django_qstash.app.base import AsyncResult
+from django_qstash.app.base import Signature
+from django_qstash.app.base import publish_requests
+from django_qstash.canvas.services import build_canvas
+from django_qstash.canvas.services import create_chord
+
+
+def _flatten(tasks: tuple) -> list:
+    """Accept both group(a, b) and group([a, b])"""
+    if len(tasks) == 1 and not isinstance(tasks[0], (Signature, chain)):
+        return list(tasks[0])
+    return list(tasks)
+
+
+class GroupResult:
+    """The AsyncResults of a group or chord header, in publish order"""
+
+    def __init__(self, results: list[AsyncResult]):
+        self.results = results
+
+    def __iter__(self) -> Iterator[AsyncResult]:
+        return iter(self.results)
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def __getitem__(self, index: int) -> AsyncResult:
+        return self.results[index]
+
+    def revoke(self) -> bool:
+        """Revoke every task in the group"""
+        revoked = [result.revoke() for result in self.results]
+        return all(revoked)
+
+
+class group:
+    """
+    Celery-compatible group: run tasks in parallel.
+
+    All messages are published with QStash batch requests. A chain member
+    publishes its first step, like a chord header entry.
+    """
+
+    def __init__(self, *tasks: Signature | chain | Iterable[Signature | chain]):
+        self.tasks = _flatten(tasks)
+
+    def apply_async(self) -> GroupResult:
+        return GroupResult(
+            publish_requests(self._build_request(item) for item in self.tasks)
+        )
+
+    def delay(self) -> GroupResult:
+        return self.apply_async()
+
+    def _build_request(self, item: Signature | chain) -> tuple:
+        if isinstance(item, chain):
+            return item.build_request()
+        return item.task, item.build_request()
+
+
+class chain:
+    """
+    Celery-compatible chain: run tasks one after another.
+
+    Only the first task is published. The remaining steps travel in its
+    message body, and each step's webhook publishes the next one with the
+    step's result prepended to its arguments (unless the signature is
+    immutable, see QStashTask.si()).
+    """
+
+    def __init__(self, *tasks: Signature | Iterable[Signature]):
+        self.tasks = _flatten(tasks)
+
+    def build_request(self, chord: dict[str, Any] | None = None) -> tuple:
+        first, *rest = self.tasks
+        canvas = build_canvas([sig.to_dict() for sig in rest], chord)
+        return first.task, first.build_request(canvas=canvas)
+
+    def apply_async(self) -> AsyncResult:
+        """Publish the first step and return its AsyncResult"""
+        task, request = self.build_request()
+        return task._publish(request)
+
+    def delay(self) -> AsyncResult:
+        return self.apply_async()
+
+
+class chord:
+    """
+    Celery-compatible chord: run a group, then call `body` with its results.
+
+    Header progress is tracked in a ChordCounter row (requires
+    `django_qstash.canvas` in INSTALLED_APPS). When the last header task
+    succeeds, `body` is published with the list of header results, in header
+    order, as its first argument. Header entries may be signatures or chains.
+    """
+
+    def __init__(
+        self,
+        header: Iterable[Signature | chain],
+        body: Signature | None = None,
+    ):
+        self.header = list(header)
+        self.body = body
+
+    def __call__(self, body: Signature) -> GroupResult:
+        return chord(self.header, body).apply_async()
+
+    def apply_async(self) -> GroupResult:
+        if self.body is None:
+            raise TypeError("chord() requires a body signature")
+        if not self.header:
+            return GroupResult(
+                [self.body.task._publish(self.body.build_request(([],)))]
+            )
+        counter = create_chord(len(self.header), self.body)
+        return GroupResult(
+            publish_requests(
+                self._build_header_request(item, {"id": str(counter.id), "index": i})
+                for i, item in enumerate(self.header)
+            )
+        )
+
+    def delay(self) -> GroupResult:
+        return self.apply_async()
+
+    def _build_header_request(self, item: Signature | chain, ref: dict) -> tuple:
+        if isinstance(item, chain):
+            return item.build_request(chord=ref)
+        return item.task, item.build_request(canvas=build_canvas(chord=ref))
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from django.apps import apps
+from django.core.exceptions import ImproperlyConfigured
+from django.db import models
+from django.db import transaction
+
+from django_qstash.app.base import Signature
+from django_qstash.app.registry import task_registry
+from django_qstash.exceptions import TaskError
+
+logger = logging.getLogger(__name__)
+
+
+def get_chord_models() -> tuple[type[models.Model], type[models.Model]]:
+    """Get the ChordCounter and ChordResult models or fail if canvas is missing."""
+    try:
+        return (
+            apps.get_model("django_qstash_canvas", "ChordCounter"),
+            apps.get_model("django_qstash_canvas", "ChordResult"),
+        )
+    except LookupError:
+        raise ImproperlyConfigured(
+            "Django QStash Canvas not installed. Add `django_qstash.canvas` to "
+            "INSTALLED_APPS and run migrations to use chords."
+        )
+
+
+def signature_from_dict(data: dict[str, Any]) -> Signature:
+    """Rebuild a Signature encoded with Signature.to_dict()"""
+    task = task_registry.get(data["task"])
+    if task is None:
+        raise TaskError(f"Unknown workflow task {data['task']!r}")
+    return Signature(
+        task,
+        tuple(data["args"]),
+        data["kwargs"],
+        countdown=data.get("countdown"),
+        options=data.get("options") or {},
+        immutable=data.get("immutable", False),
+    )
+
+
+def build_canvas(
+    chain: list[dict[str, Any]] | None = None,
+    chord: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Build the workflow fields of a message body"""
+    canvas = {}
+    if chain:
+        canvas["chain"] = chain
+    if chord:
+        canvas["chord"] = chord
+    return canvas
+
+
+def create_chord(total: int, body: Signature) -> models.Model:
+    ChordCounter, _ = get_chord_models()
+    return ChordCounter.objects.create(
+        body=body.to_dict(), total=total, remaining=total
+    )
+
+
+def complete_chord_part(chord_id: str, index: int, result: Any) -> bool:
+    """
+    Record a header task's result and publish the chord body once all are in.
+
+    Safe against redelivery: each header index is only counted once, and
+    results for chords that already completed are ignored. Returns True if the
+    body was published.
+    """
+    ChordCounter, ChordResult = get_chord_models()
+    with transaction.atomic():
+        counter = ChordCounter.objects.select_for_update().filter(id=chord_id).first()
+        if counter is None:
+            logger.warning(
+                "Chord %s not found, it may have already completed", chord_id
+            )
+            return False
+        _, created = ChordResult.objects.get_or_create(
+            chord=counter, index=index, defaults={"result": result}
+        )
+        if not created:
+            return False
+        counter.remaining -= 1
+        if counter.remaining > 0:
+            counter.save(update_fields=["remaining"])
+            return False
+        results = list(
+            counter.results.order_by("index").values_list("result", flat=True)
+        )
+        body = signature_from_dict(counter.body)
+        # Publishing inside the transaction means a failure rolls back this
+        # header result, so the delivery is retried by QStash
+        body.task._publish(body.build_request((results,)))
+        counter.delete()
+        return True
+
+
+def on_task_success(
+    chain: list[dict[str, Any]] | None,
+    chord: dict[str, Any] | None,
+    result: Any,
+) -> None:
+    """
+    Continue a workflow after a task succeeded in the webhook.
+
+    Publishes the next step of a chain with the task's result, or records the
+    result of a chord header task. A chain inside a chord header carries the
+    chord reference to its last step.
+    """
+    if chain:
+        next_step, *rest = chain
+        signature = signature_from_dict(next_step)
+        signature.task._publish(
+            signature.build_request((result,), build_canvas(rest, chord))
+        )
+    elif chord:
+        complete_chord_part(chord["id"], chord["index"], result)
@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from django.contrib import admin
+
+from .models import PayloadBlob
+
+
+@admin.register(PayloadBlob)
+class PayloadBlobAdmin(admin.ModelAdmin):
+    readonly_fields = ["id", "size", "date_created", "expires_at"]
+    exclude = ["data"]
+    list_display = ["id", "size", "date_created", "expires_at"]
@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+from django.apps import AppConfig
+
+
+class ClaimCheckConfig(AppConfig):
+    name = "django_qstash.claimcheck"
+    label = "django_qstash_claimcheck"
+    verbose_name = "django_qstash_claimcheck"
+    default_auto_field = "django.db.models.BigAutoField"
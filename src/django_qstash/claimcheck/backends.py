@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import datetime
+
+from django.apps import apps
+from django.utils import timezone
+
+
+class BaseClaimCheckBackend:
+    """
+    Stores compressed task arguments for claim-check offloading.
+
+    Subclass this and point DJANGO_QSTASH_CLAIM_CHECK_BACKEND at it to keep
+    blobs somewhere other than the database (e.g. object storage).
+    """
+
+    def save(self, data: bytes, size: int, expires_at: datetime.datetime) -> str:
+        """Store a blob and return the key to send in the QStash message."""
+        raise NotImplementedError
+
+    def load(self, key: str) -> bytes:
+        """Return the blob stored under `key`, raising KeyError if it is gone."""
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        """Delete the blob stored under `key` if it exists."""
+        raise NotImplementedError
+
+    def delete_expired(self) -> int:
+        """Delete every expired blob and return how many were deleted."""
+        raise NotImplementedError
+
+
+class DatabaseBackend(BaseClaimCheckBackend):
+    """Stores blobs in the `PayloadBlob` model of `django_qstash.claimcheck`."""
+
+    def get_model(self):
+        return apps.get_model("django_qstash_claimcheck", "PayloadBlob")
+
+    def save(self, data: bytes, size: int, expires_at: datetime.datetime) -> str:
+        blob = self.get_model().objects.create(
+            data=data, size=size, expires_at=expires_at
+        )
+        return str(blob.id)
+
+    def load(self, key: str) -> bytes:
+        PayloadBlob = self.get_model()
+        data = PayloadBlob.objects.filter(id=key).values_list("data", flat=True)
+        for value in data:
+            return bytes(value)
+        raise KeyError(key)
+
+    def delete(self, key: str) -> None:
+        self.get_model().objects.filter(id=key).delete()
+
+    def delete_expired(self) -> int:
+        deleted_count, _ = (
+            self.get_model().objects.filter(expires_at__lt=timezone.now()).delete()
+        )
+        return deleted_count
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:40
+
+from __future__ import annotations
+
+import uuid
+
+import django.utils.timezone
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="PayloadBlob",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                        unique=True,
+                    ),
+                ),
+                ("data", models.BinaryField()),
+                (
+                    "size",
+                    models.PositiveIntegerField(help_text="Uncompressed size in bytes"),
+                ),
+                (
+                    "date_created",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("expires_at", models.DateTimeField(db_index=True)),
+            ],
+            options={
+                "ordering": ["-date_created"],
+            },
+        ),
+    ]
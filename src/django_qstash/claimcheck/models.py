@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import uuid
+
+from django.db import models
+from django.utils import timezone
+
+
+class PayloadBlob(models.Model):
+    """
+    Compressed task arguments that were too large to send through QStash.
+
+    The QStash message only carries the blob id; the webhook loads the
+    arguments from here before running the task.
+    """
+
+    id = models.UUIDField(
+        primary_key=True, default=uuid.uuid4, editable=False, unique=True
+    )
+    data = models.BinaryField()
+    size = models.PositiveIntegerField(help_text="Uncompressed size in bytes")
+    date_created = models.DateTimeField(default=timezone.now)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        app_label = "django_qstash_claimcheck"
+        ordering = ["-date_created"]
+
+    def __str__(self):
+        return f"{self.id} ({self.size} bytes)"
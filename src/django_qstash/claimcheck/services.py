@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import functools
+import logging
+import zlib
+from datetime import timedelta
+
+from django.apps import apps
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from django_qstash.claimcheck.backends import BaseClaimCheckBackend
+from django_qstash.serializers import get_serializer
+from django_qstash.settings import DJANGO_QSTASH_CLAIM_CHECK_BACKEND
+from django_qstash.settings import DJANGO_QSTASH_CLAIM_CHECK_THRESHOLD
+from django_qstash.settings import DJANGO_QSTASH_CLAIM_CHECK_TTL
+
+logger = logging.getLogger(__name__)
+
+
+def is_enabled() -> bool:
+    """
+    Claim checks are used when `django_qstash.claimcheck` is installed and
+    DJANGO_QSTASH_CLAIM_CHECK_THRESHOLD is set.
+
+    Measuring the arguments means serializing them on every publish, so
+    offloading is opt-in rather than on for every project with the app.
+    """
+    return DJANGO_QSTASH_CLAIM_CHECK_THRESHOLD is not None and apps.is_installed(
+        "django_qstash.claimcheck"
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_backend() -> BaseClaimCheckBackend:
+    return import_string(DJANGO_QSTASH_CLAIM_CHECK_BACKEND)()
+
+
+def offload_arguments(args: tuple, kwargs: dict) -> dict[str, str] | None:
+    """
+    Store args and kwargs with the claim-check backend if they are too large.
+
+    Returns the claim check to send in place of the arguments, or None when
+    the arguments are below DJANGO_QSTASH_CLAIM_CHECK_THRESHOLD bytes.
+    """
+    serializer = get_serializer()
+    encoded = serializer.dumps({"args": args, "kwargs": kwargs}).encode()
+    if len(encoded) < DJANGO_QSTASH_CLAIM_CHECK_THRESHOLD:
+        return None
+    expires_at = timezone.now() + timedelta(seconds=DJANGO_QSTASH_CLAIM_CHECK_TTL)
+    key = get_backend().save(zlib.compress(encoded), len(encoded), expires_at)
+    return {"key": key, "serializer": serializer.name}
+
+
+def load_arguments(claim_check: dict[str, str]) -> tuple[list, dict]:
+    """Load the args and kwargs stored for a claim check."""
+    data = zlib.decompress(get_backend().load(claim_check["key"]))
+    decoded = get_serializer(claim_check["serializer"]).loads(data.decode())
+    return decoded["args"], decoded["kwargs"]
+
+
+def release_arguments(claim_check: dict[str, str]) -> None:
+    """Delete the arguments stored for a claim check once they are not needed."""
+    try:
+        get_backend().delete(claim_check["key"])
+    except Exception:
+        logger.exception("Failed to delete claim check %s", claim_check["key"])
+
+
+def delete_expired_arguments() -> int:
+    """Delete stored arguments whose TTL has passed."""
+    return get_backend().delete_expired()
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import asyncio
 import os
 import warnings
+from typing import Any
 from urllib.parse import urlparse
+from weakref import WeakKeyDictionary
 
+from qstash import AsyncQStash
 from qstash import QStash
 
 from django_qstash.settings import QSTASH_TOKEN
@@ -12,7 +16,7 @@ QSTASH_URL = os.environ.get("QSTASH_URL", None)
 UPSTASH_QSTASH_DOMAINS = ["upstash.io", "upstash.cloud", "upstash.com"]
 
 
-def init_qstash():
+def get_qstash_client_kwargs() -> dict[str, Any]:
     kwargs = {
         "token": QSTASH_TOKEN,
     }
@@ -21,9 +25,34 @@ def init_qstash():
         if domain.split(".")[-2:] not in UPSTASH_QSTASH_DOMAINS:
             warning_msg = f"\n\n\033[93mUsing {QSTASH_URL} as your QStash URL. \
                 \nThis configuration should only be used in development.\n\033[0m"
-            warnings.warn(warning_msg, RuntimeWarning, stacklevel=2)
+            warnings.warn(warning_msg, RuntimeWarning, stacklevel=3)
             kwargs["base_url"] = QSTASH_URL
-    return QStash(**kwargs)
+    return kwargs
+
+
+def init_qstash():
+    return QStash(**get_qstash_client_kwargs())
+
+
+def init_async_qstash():
+    return AsyncQStash(**get_qstash_client_kwargs())
 
 
 qstash_client = init_qstash()
+
+# The async client holds an httpx.AsyncClient, which is bound to the event loop
+# it was first used on, so one client is kept per running loop.
+_async_qstash_clients: WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncQStash] = (
+    WeakKeyDictionary()
+)
+
+
+def get_async_qstash_client() -> AsyncQStash:
+    """
+    Get the async QStash client for the running event loop, creating it on first use.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_qstash_clients.get(loop)
+    if client is None:
+        client = _async_qstash_clients[loop] = init_async_qstash()
+    return client
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import base64
+import gzip
+from typing import Any
+
+from django.core.exceptions import ImproperlyConfigured
+
+from django_qstash.exceptions import PayloadError
+from django_qstash.serializers import Serializer
+from django_qstash.settings import DJANGO_QSTASH_COMPRESSION
+from django_qstash.settings import DJANGO_QSTASH_COMPRESSION_THRESHOLD
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+# Key marking a compressed message body; its value is the codec name
+COMPRESSION_KEY = "compression"
+
+
+def _gzip_compress(data: bytes) -> bytes:
+    # mtime=0 keeps the output stable for content-based deduplication
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+
+def _zstd_compress(data: bytes) -> bytes:
+    if zstandard is None:
+        raise ImproperlyConfigured(
+            "DJANGO_QSTASH_COMPRESSION = 'zstd' requires the zstandard package. "
+            "Install it with `pip install django-qstash[zstd]`."
+        )
+    return zstandard.ZstdCompressor().compress(data)
+
+
+def _zstd_decompress(data: bytes) -> bytes:
+    if zstandard is None:
+        raise PayloadError("Received a zstd payload but zstandard is not installed")
+    return zstandard.ZstdDecompressor().decompress(data)
+
+
+CODECS = {
+    "gzip": (_gzip_compress, gzip.decompress),
+    "zstd": (_zstd_compress, _zstd_decompress),
+}
+
+
+def compress_body(body: dict[str, Any], serializer: Serializer) -> dict[str, Any]:
+    """
+    Compress a message body with DJANGO_QSTASH_COMPRESSION if its serialized
+    size reaches DJANGO_QSTASH_COMPRESSION_THRESHOLD bytes.
+
+    The compressed body is a small envelope holding the codec name and the
+    base64-encoded, compressed serialized body, so it can still be sent with
+    any serializer. Bodies below the threshold are returned unchanged.
+    """
+    codec = DJANGO_QSTASH_COMPRESSION
+    if not codec:
+        return body
+    try:
+        compress, _ = CODECS[codec]
+    except KeyError:
+        raise ImproperlyConfigured(
+            f"Unknown DJANGO_QSTASH_COMPRESSION {codec!r}. "
+            f"Use one of: {', '.join(CODECS)}"
+        )
+    encoded = serializer.dumps(body).encode()
+    if len(encoded) < DJANGO_QSTASH_COMPRESSION_THRESHOLD:
+        return body
+    compressed = compress(encoded)
+    if len(compressed) >= len(encoded):
+        return body
+    return {
+        COMPRESSION_KEY: codec,
+        "data": base64.b64encode(compressed).decode("ascii"),
+    }
+
+
+def decompress_body(data: dict[str, Any], serializer: Serializer) -> Any:
+    """Reverse compress_body(), returning uncompressed bodies unchanged."""
+    codec = data.get(COMPRESSION_KEY)
+    if codec is None:
+        return data
+    try:
+        _, decompress = CODECS[codec]
+    except (KeyError, TypeError):
+        raise PayloadError(f"Unknown payload compression {codec!r}")
+    try:
+        raw = decompress(base64.b64decode(data["data"]))
+        return serializer.loads(raw.decode())
+    except PayloadError:
+        raise
+    except Exception as e:
+        raise PayloadError(f"Invalid {codec} compressed payload: {e}")
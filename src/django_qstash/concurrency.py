@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import random
+from typing import TYPE_CHECKING
+
+from django.core.cache import caches
+
+from django_qstash.exceptions import ConcurrencyLimitExceeded
+from django_qstash.settings import DJANGO_QSTASH_CONCURRENCY_CACHE
+from django_qstash.settings import DJANGO_QSTASH_CONCURRENCY_LEASE
+from django_qstash.settings import DJANGO_QSTASH_CONCURRENCY_RETRY_AFTER
+from django_qstash.settings import DJANGO_QSTASH_MAX_CONCURRENCY
+
+if TYPE_CHECKING:
+    from django_qstash.app.base import QStashTask
+
+
+class ConcurrencyLimit:
+    """
+    A counting semaphore shared by every webhook process through the cache.
+
+    The semaphore is `limit` slot keys. A delivery holds a slot by creating its
+    key with an atomic cache.add() and frees it by deleting the key. Slots
+    expire after DJANGO_QSTASH_CONCURRENCY_LEASE seconds so a crashed worker
+    cannot hold them forever.
+    """
+
+    key_prefix = "django_qstash:concurrency:"
+
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self.limit = limit
+        self.cache = caches[DJANGO_QSTASH_CONCURRENCY_CACHE]
+        self.keys = [f"{self.key_prefix}{name}:{i}" for i in range(limit)]
+
+    def _free_keys(self, taken: dict) -> list[str]:
+        free = [key for key in self.keys if key not in taken]
+        # Spread concurrent deliveries over the free slots
+        random.shuffle(free)
+        return free
+
+    def acquire(self) -> str | None:
+        """Hold a free slot and return its key, or None if all are taken."""
+        for key in self._free_keys(self.cache.get_many(self.keys)):
+            if self.cache.add(key, 1, timeout=DJANGO_QSTASH_CONCURRENCY_LEASE):
+                return key
+        return None
+
+    async def aacquire(self) -> str | None:
+        taken = await self.cache.aget_many(self.keys)
+        for key in self._free_keys(taken):
+            if await self.cache.aadd(key, 1, timeout=DJANGO_QSTASH_CONCURRENCY_LEASE):
+                return key
+        return None
+
+
+def get_limits(task: QStashTask | None) -> list[ConcurrencyLimit]:
+    """The global and per-task limits that apply to a task."""
+    limits = []
+    if DJANGO_QSTASH_MAX_CONCURRENCY:
+        limits.append(ConcurrencyLimit("global", DJANGO_QSTASH_MAX_CONCURRENCY))
+    if task is not None and task.concurrency:
+        limits.append(ConcurrencyLimit(f"task:{task.task_path}", task.concurrency))
+    return limits
+
+
+def limit_exceeded(limit: ConcurrencyLimit) -> ConcurrencyLimitExceeded:
+    return ConcurrencyLimitExceeded(
+        f"Concurrency limit of {limit.limit} reached for {limit.name}",
+        retry_after=DJANGO_QSTASH_CONCURRENCY_RETRY_AFTER,
+    )
+
+
+def acquire_slots(task: QStashTask | None) -> list[str]:
+    """
+    Hold a slot of every limit that applies to `task`.
+
+    Raises ConcurrencyLimitExceeded (after freeing any slots already held)
+    when a limit is reached.
+    """
+    slots = []
+    for limit in get_limits(task):
+        slot = limit.acquire()
+        if slot is None:
+            release_slots(slots)
+            raise limit_exceeded(limit)
+        slots.append(slot)
+    return slots
+
+
+async def aacquire_slots(task: QStashTask | None) -> list[str]:
+    """Async counterpart of acquire_slots()"""
+    slots = []
+    for limit in get_limits(task):
+        slot = await limit.aacquire()
+        if slot is None:
+            await arelease_slots(slots)
+            raise limit_exceeded(limit)
+        slots.append(slot)
+    return slots
+
+
+def release_slots(slots: list[str]) -> None:
+    if slots:
+        caches[DJANGO_QSTASH_CONCURRENCY_CACHE].delete_many(slots)
+
+
+async def arelease_slots(slots: list[str]) -> None:
+    if slots:
+        await caches[DJANGO_QSTASH_CONCURRENCY_CACHE].adelete_many(slots)
@@ -5,6 +5,8 @@ from django.db import models
 
 class TaskStatus(models.TextChoices):
     PENDING = "PENDING", "Pending"
+    # Failed, but QStash will deliver the message again
+    RETRY = "RETRY", "Retry"
     SUCCESS = "SUCCESS", "Success"
     CANCELED = "CANCELED", "Canceled"
     EXECUTION_ERROR = "EXECUTION_ERROR", "Execution Error"
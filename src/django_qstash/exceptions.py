@@ -22,4 +22,78 @@ class PayloadError(WebhookError):
 class TaskError(WebhookError):
     """Error in task execution."""
 
+    # Response status for the webhook; QStash retries any non-2xx response
+    status_code = 422
+
+
+class TimeLimitExceeded(TaskError):
+    """The task ran longer than its time_limit."""
+
+    status_code = 503
+
+
+class SoftTimeLimitExceeded(Exception):
+    """
+    Raised inside a task that ran longer than its soft_time_limit.
+
+    Catch it in the task to clean up before the hard time_limit.
+    """
+
+    pass
+
+
+class ConcurrencyLimitExceeded(WebhookError):
+    """Too many deliveries are running; QStash should retry after a while."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message, retry_after)
+        self.retry_after = retry_after
+
+    def __str__(self) -> str:
+        return self.args[0]
+
+
+class DuplicateDelivery(WebhookError):
+    """The message is already being processed by another delivery."""
+
+    pass
+
+
+class PublishError(Exception):
+    """Base exception for publishing task messages."""
+
+    pass
+
+
+class PublishQueueFull(PublishError):
+    """The background publish queue is full."""
+
+    pass
+
+
+class PublishDropped(PublishQueueFull):
+    """
+    The background publish queue was full and the message was dropped.
+
+    Raised when the AsyncResult of a dropped message is asked for its id.
+    """
+
+    pass
+
+
+class ResultTimeout(TimeoutError):
+    """The task result was not ready before AsyncResult.get() timed out."""
+
     pass
+
+
+class TaskFailed(Exception):
+    """Raised by AsyncResult.get() for a task that did not succeed."""
+
+    def __init__(self, message: str, status: str, traceback: str | None = None):
+        super().__init__(message, status, traceback)
+        self.status = status
+        self.traceback = traceback
+
+    def __str__(self) -> str:
+        return self.args[0]
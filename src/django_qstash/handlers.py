@@ -1,21 +1,58 @@
 from __future__ import annotations
 
-import json
+import asyncio
+import dataclasses
+import functools
+import inspect
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Any
+from typing import Awaitable
+from typing import Callable
 
+from asgiref.sync import async_to_sync
+from asgiref.sync import sync_to_async
+from django.apps import apps
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import close_old_connections
+from django.dispatch import receiver
 from django.http import HttpRequest
+from django.utils import timezone
 from qstash import Receiver
 
 from django_qstash.db.models import TaskStatus
 
 from . import utils
+from .app.base import QStashTask
+from .app.registry import task_registry
+from .canvas.services import on_task_success
+from .claimcheck.services import load_arguments
+from .claimcheck.services import release_arguments
+from .compression import decompress_body
+from .concurrency import aacquire_slots
+from .concurrency import acquire_slots
+from .concurrency import arelease_slots
+from .concurrency import release_slots
+from .exceptions import ConcurrencyLimitExceeded
+from .exceptions import DuplicateDelivery
 from .exceptions import PayloadError
 from .exceptions import SignatureError
 from .exceptions import TaskError
+from .exceptions import TimeLimitExceeded
+from .idempotency import DONE
+from .idempotency import RUNNING
+from .idempotency import DeliveryClaim
+from .results.services import astore_task_result
 from .results.services import store_task_result
+from .results.services import store_task_results
+from .results.stats import record_task_stats
+from .serializers import get_serializer_for_content_type
+from .settings import DJANGO_QSTASH_SYNC_TASK_WORKERS
+from .timelimits import arun_with_time_limits
+from .timelimits import run_with_time_limits
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +65,20 @@ class TaskPayload:
     kwargs: dict
     task_name: str
     function_path: str
+    claim_check: dict | None = None
+    chain: list | None = None
+    chord: dict | None = None
+    bundle: dict | None = None
+    options: dict | None = None
+
+    def result_fields(self) -> dict[str, Any]:
+        """The payload fields stored with the task result."""
+        return {
+            "task_name": self.task_name,
+            "args": self.args,
+            "kwargs": self.kwargs,
+            "function_path": self.function_path,
+        }
 
     @classmethod
     def from_dict(cls, data: dict) -> TaskPayload:
@@ -44,6 +95,11 @@ class TaskPayload:
             kwargs=data["kwargs"],
             task_name=data.get("task_name", function_path),
             function_path=function_path,
+            claim_check=data.get("claim_check"),
+            chain=data.get("chain"),
+            chord=data.get("chord"),
+            bundle=data.get("bundle"),
+            options=data.get("options"),
         )
 
 
@@ -68,101 +124,546 @@ class QStashWebhook:
         except Exception as e:
             raise SignatureError(f"Invalid signature: {e}")
 
-    def parse_payload(self, body: str) -> TaskPayload:
+    def parse_payload(self, body: str, content_type: str | None = None) -> TaskPayload:
         """Parse and validate webhook payload."""
+        serializer = get_serializer_for_content_type(content_type)
         try:
-            data = json.loads(body)
-            return TaskPayload.from_dict(data)
-        except json.JSONDecodeError as e:
-            raise PayloadError(f"Invalid JSON payload: {e}")
+            data = serializer.loads(body)
+        except Exception as e:
+            raise PayloadError(f"Invalid {serializer.label} payload: {e}")
+        if not isinstance(data, dict):
+            raise PayloadError(
+                f"Invalid {serializer.label} payload: expected an object"
+            )
+        data = decompress_body(data, serializer)
+        if not isinstance(data, dict):
+            raise PayloadError(
+                f"Invalid {serializer.label} payload: expected an object"
+            )
+        return TaskPayload.from_dict(data)
+
+    def load_claim_check(self, payload: TaskPayload) -> None:
+        """Replace the payload's arguments with the ones stored for its claim check."""
+        if not apps.is_installed("django_qstash.claimcheck"):
+            raise PayloadError(
+                "Payload has a claim check but django_qstash.claimcheck is not installed"
+            )
+        try:
+            payload.args, payload.kwargs = load_arguments(payload.claim_check)
+        except KeyError:
+            raise PayloadError(
+                f"Claim check {payload.claim_check.get('key')} was not found"
+            )
 
     def execute_task(self, payload: TaskPayload) -> Any:
-        """Import and execute the task function."""
+        """Look up the registered task and execute it."""
+        task = self.get_task(payload)
+        call = functools.partial(_call_task, task, payload.args, payload.kwargs)
         try:
-            task_func = utils.import_string(payload.function_path)
-        except ImportError as e:
-            raise TaskError(f"Could not import task function: {e}")
+            if task.time_limit is None and task.soft_time_limit is None:
+                return call()
+            return run_with_time_limits(
+                call, task.time_limit, task.soft_time_limit, name=task.name
+            )
+        except TaskError:
+            raise
+        except Exception as e:
+            raise TaskError(f"Task execution failed: {e}")
+
+    async def aexecute_task(self, payload: TaskPayload) -> Any:
+        """
+        Execute the task without blocking the event loop.
 
+        `async def` tasks are awaited on the loop; sync tasks run in the
+        bounded thread pool from get_sync_task_executor().
+        """
+        task = self.get_task(payload)
         try:
-            if callable(task_func) and hasattr(task_func, "actual_func"):
-                return task_func.actual_func(*payload.args, **payload.kwargs)
-            return task_func(*payload.args, **payload.kwargs)
+            if inspect.iscoroutinefunction(task.func):
+                coroutine = task(*payload.args, **payload.kwargs)
+                if task.time_limit is None and task.soft_time_limit is None:
+                    return await coroutine
+                return await arun_with_time_limits(
+                    coroutine, task.time_limit, task.soft_time_limit, name=task.name
+                )
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                get_sync_task_executor(),
+                functools.partial(_run_in_pool, self.execute_task, payload),
+            )
+        except TaskError:
+            raise
         except Exception as e:
             raise TaskError(f"Task execution failed: {e}")
 
+    def execute_bundle(self, payload: TaskPayload, task_id: str | None) -> dict:
+        """
+        Run every item of a bundle and store one TaskResult per item.
+
+        Item results are stored under `<message id>:<index>`, next to the
+        bundle's summary under the message id. A failing item does not fail
+        the delivery: the failed items are re-published as a new bundle, with
+        their task ids and the original countdown and options, while the
+        bundle has retries left, and only recorded as failed after that.
+        """
+        task = self.get_task(payload)
+        options = payload.options if payload.options is not None else task.options
+        attempt = payload.bundle.get("attempt", 0)
+        retrying = attempt < options.get("max_retries", 3)
+        task_ids = payload.bundle.get("task_ids") or [
+            f"{task_id}:{index}" if task_id else None
+            for index in range(len(payload.args))
+        ]
+        records = []
+        failed = []
+        for args, item_id in zip(payload.args, task_ids):
+            item = dataclasses.replace(payload, args=args, kwargs={}, bundle=None)
+            fields = {
+                "task_id": item_id,
+                "args": args,
+                "kwargs": {},
+                "started_at": timezone.now(),
+            }
+            try:
+                result = self.execute_task(item)
+            except TaskError as e:
+                logger.warning("Bundle item of %s failed: %s", task.name, str(e))
+                failed.append((args, item_id))
+                fields.update(status=TaskStatus.EXECUTION_ERROR, traceback=str(e))
+            else:
+                fields.update(status=TaskStatus.SUCCESS, result=result)
+            record_task_stats(payload.task_name, fields["status"], fields["started_at"])
+            if retrying and fields["status"] == TaskStatus.EXECUTION_ERROR:
+                # The item runs again in the re-published bundle
+                fields["status"] = TaskStatus.RETRY
+            records.append(
+                {
+                    "task_name": payload.task_name,
+                    "function_path": payload.function_path,
+                    "expires": task.result_expires,
+                    **fields,
+                }
+            )
+
+        retried = False
+        if failed and retrying:
+            failed_args, failed_ids = zip(*failed)
+            task._retry_bundle(
+                list(failed_args), list(failed_ids), payload.bundle, options
+            )
+            retried = True
+        summary = {
+            "total": len(payload.args),
+            "succeeded": len(payload.args) - len(failed),
+            "failed": len(failed),
+            "retried": retried,
+        }
+        records.append(
+            {
+                "task_id": task_id,
+                "task_name": payload.task_name,
+                "function_path": payload.function_path,
+                "expires": task.result_expires,
+                "status": TaskStatus.SUCCESS,
+                "result": summary,
+                "args": payload.args,
+                "kwargs": {},
+                "started_at": records[0]["started_at"] if records else None,
+            }
+        )
+        store_task_results(
+            [r for r in records if task.should_store_result(r["status"])]
+        )
+        return summary
+
+    def is_retried(self, payload: TaskPayload | None, request: HttpRequest) -> bool:
+        """Whether QStash delivers the message again if this delivery fails."""
+        retried = request.headers.get("Upstash-Retried")
+        if payload is None or retried is None:
+            return False
+        retries = (payload.options or {}).get("max_retries", 3)
+        try:
+            return int(retried) < retries
+        except ValueError:
+            return False
+
+    def get_task(self, payload: TaskPayload) -> QStashTask:
+        task = task_registry.get(payload.function_path)
+        if task is None:
+            raise TaskError(f"Unknown task {payload.function_path!r}")
+        return task
+
+    def verify_request(self, request: HttpRequest) -> TaskPayload:
+        """Verify the delivery's signature and parse its payload."""
+        body = request.body.decode()
+        self.verify_signature(
+            body=body,
+            signature=request.headers.get("Upstash-Signature"),
+            url=request.build_absolute_uri(),
+        )
+        return self.parse_payload(body, request.headers.get("Content-Type"))
+
+    def get_delivery_claim(
+        self, payload: TaskPayload, task_id: str | None
+    ) -> DeliveryClaim | None:
+        """Get the idempotency claim for deliveries of idempotent tasks."""
+        task = task_registry.get(payload.function_path)
+        if task is None or not task.idempotent or not task_id:
+            return None
+        return DeliveryClaim(task_id)
+
+    def complete_task(self, payload: TaskPayload, result: Any) -> None:
+        """Run the follow-up work for a task that succeeded."""
+        if payload.chain or payload.chord:
+            # Continue the django_qstash.canvas workflow
+            on_task_success(payload.chain, payload.chord, result)
+        if payload.claim_check:
+            # Failed deliveries are retried, so only release on success
+            release_arguments(payload.claim_check)
+
+    def store_result(
+        self,
+        payload: TaskPayload,
+        task_id: str | None,
+        status: str,
+        retrying: bool = False,
+        **fields: Any,
+    ) -> None:
+        """
+        Store the delivery's TaskResult unless the task opted out.
+
+        A failure that QStash will retry (`retrying`) is stored as RETRY, so
+        AsyncResult.get() keeps waiting for the next delivery.
+        """
+        record_task_stats(payload.task_name, status, fields.get("started_at"))
+        task = task_registry.get(payload.function_path)
+        if task is None or task.should_store_result(status):
+            store_task_result(
+                task_id=task_id,
+                status=TaskStatus.RETRY if retrying else status,
+                expires=task.result_expires if task else None,
+                **fields,
+                **payload.result_fields(),
+            )
+
+    async def astore_result(
+        self,
+        payload: TaskPayload,
+        task_id: str | None,
+        status: str,
+        retrying: bool = False,
+        **fields: Any,
+    ) -> None:
+        """Async counterpart of store_result()."""
+        record_task_stats(payload.task_name, status, fields.get("started_at"))
+        task = task_registry.get(payload.function_path)
+        if task is None or task.should_store_result(status):
+            await astore_task_result(
+                task_id=task_id,
+                status=TaskStatus.RETRY if retrying else status,
+                expires=task.result_expires if task else None,
+                **fields,
+                **payload.result_fields(),
+            )
+
     def handle_request(self, request: HttpRequest) -> tuple[dict, int]:
         """Process webhook request and return response data and status code."""
         payload = None
+        claim = None
+        slots = []
+        started_at = None
         task_id = request.headers.get("Upstash-Message-Id")
 
         try:
-            body = request.body.decode()
-            self.verify_signature(
-                body=body,
-                signature=request.headers.get("Upstash-Signature"),
-                url=request.build_absolute_uri(),
-            )
+            payload = self.verify_request(request)
+            claim = self.get_delivery_claim(payload, task_id)
+            if claim is not None:
+                state, stored_result = claim.claim()
+                if state == DONE:
+                    return success_response(payload, stored_result)
+                if state == RUNNING:
+                    claim = None
+                    raise DuplicateDelivery(f"Message {task_id} is already running")
+            slots = acquire_slots(task_registry.get(payload.function_path))
+            if payload.claim_check:
+                self.load_claim_check(payload)
+            started_at = timezone.now()
+            if payload.bundle is not None:
+                # Stores the item results and its summary itself
+                result = self.execute_bundle(payload, task_id)
+            else:
+                result = self.execute_task(payload)
+            self.complete_task(payload, result)
+            if claim is not None:
+                claim.complete(result)
+                # The task ran; keep its result even if storing it fails below
+                claim = None
+            if payload.bundle is None:
+                self.store_result(
+                    payload,
+                    task_id,
+                    status=TaskStatus.SUCCESS,
+                    result=result,
+                    started_at=started_at,
+                )
+            return success_response(payload, result)
 
-            payload = self.parse_payload(body)
-            result = self.execute_task(payload)
-            store_task_result(
-                task_id=task_id,
-                task_name=payload.task_name,
-                status=TaskStatus.SUCCESS,
-                result=result,
-                args=payload.args,
-                kwargs=payload.kwargs,
-                function_path=payload.function_path,
+        except DuplicateDelivery as e:
+            logger.info("Skipping duplicate delivery: %s", str(e))
+            return error_response(e, payload, 409)
+
+        except ConcurrencyLimitExceeded as e:
+            logger.info("Deferring delivery: %s", str(e))
+            if claim is not None:
+                claim.release()
+            return throttled_response(e, payload)
+
+        except (SignatureError, PayloadError) as e:
+            logger.exception("Authentication error: %s", str(e))
+            if claim is not None:
+                claim.release()
+            return error_response(e, payload, 400)
+
+        except TaskError as e:
+            logger.exception("Task execution error: %s", str(e))
+            if isinstance(e, TimeLimitExceeded):
+                # The abandoned task may still be running; keep its concurrency
+                # slots until their leases expire
+                slots = []
+            if claim is not None:
+                claim.release()
+            self.store_result(
+                payload,
+                task_id,
+                status=TaskStatus.EXECUTION_ERROR,
+                retrying=self.is_retried(payload, request),
+                traceback=str(e),
+                started_at=started_at,
             )
+            return error_response(e, payload, e.status_code)
 
-            return {
-                "status": "success",
-                "task_name": payload.task_name,
-                "result": result if result is not None else "null",
-            }, 200
+        except Exception as e:
+            logger.exception("Unexpected error in webhook handler: %s", str(e))
+            if claim is not None:
+                claim.release()
+            if payload:  # Store unexpected errors only if payload was parsed
+                self.store_result(
+                    payload,
+                    task_id,
+                    status=TaskStatus.INTERNAL_ERROR,
+                    retrying=self.is_retried(payload, request),
+                    traceback=str(e),
+                    started_at=started_at,
+                )
+            return internal_error_response(payload)
+
+        finally:
+            release_slots(slots)
+
+    async def ahandle_request(self, request: HttpRequest) -> tuple[dict, int]:
+        """Async counterpart of handle_request() for ASGI deployments."""
+        payload = None
+        claim = None
+        slots = []
+        started_at = None
+        task_id = request.headers.get("Upstash-Message-Id")
+
+        try:
+            payload = self.verify_request(request)
+            claim = self.get_delivery_claim(payload, task_id)
+            if claim is not None:
+                state, stored_result = await claim.aclaim()
+                if state == DONE:
+                    return success_response(payload, stored_result)
+                if state == RUNNING:
+                    claim = None
+                    raise DuplicateDelivery(f"Message {task_id} is already running")
+            slots = await aacquire_slots(task_registry.get(payload.function_path))
+            if payload.claim_check:
+                await sync_to_async(self.load_claim_check)(payload)
+            started_at = timezone.now()
+            if payload.bundle is not None:
+                # Stores the item results and its summary itself
+                result = await asyncio.get_running_loop().run_in_executor(
+                    get_sync_task_executor(),
+                    functools.partial(
+                        _run_in_pool, self.execute_bundle, payload, task_id
+                    ),
+                )
+            else:
+                result = await self.aexecute_task(payload)
+            if payload.chain or payload.chord or payload.claim_check:
+                await sync_to_async(self.complete_task)(payload, result)
+            if claim is not None:
+                await claim.acomplete(result)
+                # The task ran; keep its result even if storing it fails below
+                claim = None
+            if payload.bundle is None:
+                await self.astore_result(
+                    payload,
+                    task_id,
+                    status=TaskStatus.SUCCESS,
+                    result=result,
+                    started_at=started_at,
+                )
+            return success_response(payload, result)
+
+        except DuplicateDelivery as e:
+            logger.info("Skipping duplicate delivery: %s", str(e))
+            return error_response(e, payload, 409)
+
+        except ConcurrencyLimitExceeded as e:
+            logger.info("Deferring delivery: %s", str(e))
+            if claim is not None:
+                await claim.arelease()
+            return throttled_response(e, payload)
 
         except (SignatureError, PayloadError) as e:
             logger.exception("Authentication error: %s", str(e))
-            return {
-                "status": "error",
-                "error_type": e.__class__.__name__,
-                "error": str(e),
-                "task_name": getattr(payload, "task_name", None),
-            }, 400
+            if claim is not None:
+                await claim.arelease()
+            return error_response(e, payload, 400)
 
         except TaskError as e:
             logger.exception("Task execution error: %s", str(e))
-            store_task_result(
-                task_id=task_id,
-                task_name=payload.task_name,
+            if isinstance(e, TimeLimitExceeded):
+                # The abandoned task may still be running; keep its concurrency
+                # slots until their leases expire
+                slots = []
+            if claim is not None:
+                await claim.arelease()
+            await self.astore_result(
+                payload,
+                task_id,
                 status=TaskStatus.EXECUTION_ERROR,
+                retrying=self.is_retried(payload, request),
                 traceback=str(e),
-                args=payload.args,
-                kwargs=payload.kwargs,
-                function_path=payload.function_path,
+                started_at=started_at,
             )
-            return {
-                "status": "error",
-                "error_type": e.__class__.__name__,
-                "error": str(e),
-                "task_name": payload.task_name,
-            }, 422
+            return error_response(e, payload, e.status_code)
 
         except Exception as e:
             logger.exception("Unexpected error in webhook handler: %s", str(e))
+            if claim is not None:
+                await claim.arelease()
             if payload:  # Store unexpected errors only if payload was parsed
-                store_task_result(
-                    task_id=task_id,
-                    task_name=payload.task_name,
+                await self.astore_result(
+                    payload,
+                    task_id,
                     status=TaskStatus.INTERNAL_ERROR,
+                    retrying=self.is_retried(payload, request),
                     traceback=str(e),
-                    args=payload.args,
-                    kwargs=payload.kwargs,
-                    function_path=payload.function_path,
+                    started_at=started_at,
                 )
-            return {
-                "status": "error",
-                "error_type": "InternalServerError",
-                "error": "An unexpected error occurred",
-                "task_name": getattr(payload, "task_name", None),
-            }, 500
+            return internal_error_response(payload)
+
+        finally:
+            await arelease_slots(slots)
+
+
+def success_response(payload: TaskPayload, result: Any) -> tuple[dict, int]:
+    return {
+        "status": "success",
+        "task_name": payload.task_name,
+        "result": result if result is not None else "null",
+    }, 200
+
+
+def error_response(
+    error: Exception, payload: TaskPayload | None, status: int
+) -> tuple[dict, int]:
+    return {
+        "status": "error",
+        "error_type": error.__class__.__name__,
+        "error": str(error),
+        "task_name": getattr(payload, "task_name", None),
+    }, status
+
+
+def throttled_response(
+    error: ConcurrencyLimitExceeded, payload: TaskPayload | None
+) -> tuple[dict, int]:
+    """429 response; the view sends `retry_after` as the Retry-After header."""
+    response_data, status = error_response(error, payload, 429)
+    response_data["retry_after"] = error.retry_after
+    return response_data, status
+
+
+def internal_error_response(payload: TaskPayload | None) -> tuple[dict, int]:
+    return {
+        "status": "error",
+        "error_type": "InternalServerError",
+        "error": "An unexpected error occurred",
+        "task_name": getattr(payload, "task_name", None),
+    }, 500
+
+
+async def _await(awaitable: Awaitable) -> Any:
+    return await awaitable
+
+
+def _run_in_pool(func: Callable[..., Any], *args: Any) -> Any:
+    """Run func in a pool thread, managing its DB connection like a request"""
+    close_old_connections()
+    try:
+        return func(*args)
+    finally:
+        close_old_connections()
+
+
+def _call_task(task: QStashTask, args: list, kwargs: dict) -> Any:
+    result = task(*args, **kwargs)
+    if inspect.isawaitable(result):
+        # `async def` task called from the sync handler
+        result = async_to_sync(_await)(result)
+    return result
+
+
+_sync_task_executor: ThreadPoolExecutor | None = None
+_sync_task_executor_lock = threading.Lock()
+
+
+def get_sync_task_executor() -> ThreadPoolExecutor:
+    """
+    The thread pool running sync tasks for the async webhook.
+
+    Bounded by DJANGO_QSTASH_SYNC_TASK_WORKERS so a burst of deliveries
+    cannot start an unbounded number of threads or database connections.
+    """
+    global _sync_task_executor
+    if _sync_task_executor is None:
+        with _sync_task_executor_lock:
+            if _sync_task_executor is None:
+                _sync_task_executor = ThreadPoolExecutor(
+                    max_workers=DJANGO_QSTASH_SYNC_TASK_WORKERS,
+                    thread_name_prefix="django-qstash-task",
+                )
+    return _sync_task_executor
+
+
+# Settings read when a QStashWebhook is constructed
+WEBHOOK_SETTINGS = frozenset(
+    {
+        "QSTASH_CURRENT_SIGNING_KEY",
+        "QSTASH_NEXT_SIGNING_KEY",
+        "DJANGO_QSTASH_FORCE_HTTPS",
+    }
+)
+
+
+@functools.lru_cache(maxsize=None)
+def get_webhook() -> QStashWebhook:
+    """
+    Get the process-wide QStashWebhook.
+
+    The webhook holds no per-request state, so the signing keys and settings
+    are only read once instead of on every delivery.
+    """
+    return QStashWebhook()
+
+
+@receiver(setting_changed)
+def reset_webhook(*, setting: str, **kwargs) -> None:
+    """Rebuild the webhook when its settings change (e.g. override_settings)"""
+    if setting in WEBHOOK_SETTINGS:
+        get_webhook.cache_clear()
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.core.cache import caches
+
+from django_qstash.settings import DJANGO_QSTASH_IDEMPOTENCY_CACHE
+from django_qstash.settings import DJANGO_QSTASH_IDEMPOTENCY_CLAIM_TIMEOUT
+from django_qstash.settings import DJANGO_QSTASH_IDEMPOTENCY_TTL
+
+CLAIMED = "claimed"
+RUNNING = "running"
+DONE = "done"
+
+
+class DeliveryClaim:
+    """
+    Claims a QStash message id so a redelivered message runs its task once.
+
+    The claim is an atomic cache.add() of a "running" marker that expires after
+    DJANGO_QSTASH_IDEMPOTENCY_CLAIM_TIMEOUT seconds, so a claim left behind by
+    a crashed worker is released on its own. Once the task succeeds the marker
+    is replaced by the result for DJANGO_QSTASH_IDEMPOTENCY_TTL seconds and
+    later deliveries get that result without running the task.
+    """
+
+    key_prefix = "django_qstash:idempotency:"
+
+    def __init__(self, message_id: str):
+        self.message_id = message_id
+        self.key = f"{self.key_prefix}{message_id}"
+        self.cache = caches[DJANGO_QSTASH_IDEMPOTENCY_CACHE]
+
+    def claim(self) -> tuple[str, Any]:
+        """Return (CLAIMED, None), (RUNNING, None) or (DONE, stored result)."""
+        marker = {"state": RUNNING}
+        while True:
+            if self.cache.add(
+                self.key, marker, timeout=DJANGO_QSTASH_IDEMPOTENCY_CLAIM_TIMEOUT
+            ):
+                return CLAIMED, None
+            value = self.cache.get(self.key)
+            # Retry the claim if the marker expired between add() and get()
+            if value is not None:
+                return value["state"], value.get("result")
+
+    def complete(self, result: Any) -> None:
+        self.cache.set(
+            self.key,
+            {"state": DONE, "result": result},
+            timeout=DJANGO_QSTASH_IDEMPOTENCY_TTL,
+        )
+
+    def release(self) -> None:
+        """Give up the claim so QStash's retry can run the task again."""
+        self.cache.delete(self.key)
+
+    async def aclaim(self) -> tuple[str, Any]:
+        """Async counterpart of claim()"""
+        marker = {"state": RUNNING}
+        while True:
+            if await self.cache.aadd(
+                self.key, marker, timeout=DJANGO_QSTASH_IDEMPOTENCY_CLAIM_TIMEOUT
+            ):
+                return CLAIMED, None
+            value = await self.cache.aget(self.key)
+            if value is not None:
+                return value["state"], value.get("result")
+
+    async def acomplete(self, result: Any) -> None:
+        await self.cache.aset(
+            self.key,
+            {"state": DONE, "result": result},
+            timeout=DJANGO_QSTASH_IDEMPOTENCY_TTL,
+        )
+
+    async def arelease(self) -> None:
+        await self.cache.adelete(self.key)
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from django_qstash.claimcheck.services import delete_expired_arguments
+
+
+class Command(BaseCommand):
+    help = """Deletes claim-check task arguments older than\n
+    settings.DJANGO_QSTASH_CLAIM_CHECK_TTL seconds"""
+
+    def handle(self, *args, **options):
+        deleted = delete_expired_arguments()
+        self.stdout.write(f"Deleted {deleted} expired payloads.")
@@ -1,15 +1,13 @@
 from __future__ import annotations
 
-from django.conf import settings
 from django.core.management.base import BaseCommand
 
 from django_qstash.results.tasks import clear_stale_results_task
-
-DJANGO_QSTASH_RESULT_TTL = getattr(settings, "DJANGO_QSTASH_RESULT_TTL", 604800)
+from django_qstash.settings import DJANGO_QSTASH_RESULT_TTL
 
 
 class Command(BaseCommand):
-    help = f"""Clears stale task results older than\n
+    help = f"""Clears expired task results and results older than\n
     {DJANGO_QSTASH_RESULT_TTL} seconds (settings.DJANGO_QSTASH_RESULT_TTL)"""
 
     def add_arguments(self, parser):
@@ -26,17 +24,44 @@ class Command(BaseCommand):
         parser.add_argument(
             "--delay", action="store_true", help="Offload request using django_qstash"
         )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help="Delete in batches of this many results instead of all at once",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0,
+            help="Seconds to sleep between batches (with --batch-size)",
+        )
+        parser.add_argument(
+            "--max-runtime",
+            type=float,
+            help="Stop deleting batches after this many seconds (with --batch-size)",
+        )
 
     def handle(self, *args, **options):
         delay = options["delay"]
         no_input = options["no_input"]
         since = options.get("since") or DJANGO_QSTASH_RESULT_TTL
         user_confirm = not no_input
+        batch_options = {
+            "batch_size": options["batch_size"],
+            "sleep": options["sleep"],
+            "max_runtime": options["max_runtime"],
+        }
         if not delay:
             clear_stale_results_task(
-                since=since, user_confirm=user_confirm, stdout=self.stdout
+                since=since,
+                user_confirm=user_confirm,
+                stdout=self.stdout,
+                **batch_options,
             )
         else:
             clear_stale_results_task.delay(
-                since=since, user_confirm=user_confirm, stdout=self.stdout
+                since=since,
+                user_confirm=user_confirm,
+                stdout=self.stdout,
+                **batch_options,
             )
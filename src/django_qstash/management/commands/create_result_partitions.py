@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from django_qstash.results.partitions import ResultPartitions
+
+
+class Command(BaseCommand):
+    help = """Creates the upcoming TaskResult partitions on PostgreSQL\n
+    (settings.DJANGO_QSTASH_RESULT_PARTITIONING)"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--ahead",
+            type=int,
+            default=7,
+            help="Number of future periods to create partitions for",
+        )
+        parser.add_argument(
+            "--convert",
+            action="store_true",
+            help="Turn the existing TaskResult table into a partitioned table first",
+        )
+
+    def handle(self, *args, **options):
+        partitions = ResultPartitions()
+        if not partitions.is_supported():
+            raise CommandError("Partitioned task results require PostgreSQL")
+        if options["convert"] and not partitions.is_partitioned():
+            partitions.convert()
+            self.stdout.write("Converted the task result table to partitions.")
+        if not partitions.is_partitioned():
+            raise CommandError(
+                "The task result table is not partitioned. Run with --convert first."
+            )
+        created = partitions.create_partitions(ahead=options["ahead"])
+        self.stdout.write(
+            f"Task result partitions up to date ({len(created)} ensured)."
+        )
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from django_qstash.outbox.services import flush_outbox
+from django_qstash.settings import DJANGO_QSTASH_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = "Publish task messages waiting in the django_qstash outbox"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DJANGO_QSTASH_BATCH_SIZE,
+            help="The number of messages to publish per QStash batch request",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep flushing the outbox until interrupted",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait between flushes when the outbox is empty (--loop)",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        loop = options["loop"]
+        interval = options["interval"]
+        while True:
+            published = flush_outbox(batch_size=batch_size)
+            if published or not loop:
+                self.stdout.write(f"Published {published} outbox messages.")
+            if not loop:
+                return
+            if not published:
+                time.sleep(interval)
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from django.contrib import admin
+
+from .models import OutboxMessage
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    readonly_fields = [
+        "id",
+        "task_name",
+        "body",
+        "retries",
+        "content_based_deduplication",
+        "not_before",
+        "date_created",
+    ]
+    search_fields = ["task_name", "id"]
+    list_display = ["task_name", "not_before", "date_created"]
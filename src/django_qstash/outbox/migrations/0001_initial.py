@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:32
+
+from __future__ import annotations
+
+import uuid
+
+import django.utils.timezone
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="OutboxMessage",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                        unique=True,
+                    ),
+                ),
+                ("task_name", models.CharField(max_length=255)),
+                ("body", models.JSONField()),
+                ("retries", models.IntegerField(default=3)),
+                ("content_based_deduplication", models.BooleanField(default=False)),
+                ("not_before", models.DateTimeField(blank=True, null=True)),
+                (
+                    "date_created",
+                    models.DateTimeField(
+                        db_index=True, default=django.utils.timezone.now
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["date_created"],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:38
+
+from __future__ import annotations
+
+import django.core.serializers.json
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_qstash_outbox", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="outboxmessage",
+            name="body",
+            field=models.JSONField(
+                encoder=django.core.serializers.json.DjangoJSONEncoder
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:27
+
+from __future__ import annotations
+
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_qstash_outbox", "0002_alter_outboxmessage_body"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="outboxmessage",
+            name="claimed_until",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
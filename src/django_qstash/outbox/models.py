@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import uuid
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+
+class OutboxMessage(models.Model):
+    """
+    A task message written in the caller's transaction and published to QStash
+    by a flusher once the transaction has committed.
+    """
+
+    id = models.UUIDField(
+        primary_key=True, default=uuid.uuid4, editable=False, unique=True
+    )
+    task_name = models.CharField(max_length=255)
+    body = models.JSONField(encoder=DjangoJSONEncoder)
+    retries = models.IntegerField(default=3)
+    content_based_deduplication = models.BooleanField(default=False)
+    not_before = models.DateTimeField(null=True, blank=True)
+    date_created = models.DateTimeField(default=timezone.now, db_index=True)
+    # Set while a flusher publishes the message; other flushers skip it until then
+    claimed_until = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        app_label = "django_qstash_outbox"
+        ordering = ["date_created"]
+
+    def __str__(self):
+        return f"{self.task_name} ({self.id})"
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import logging
+from datetime import timedelta
+from typing import Any
+
+from django.apps import apps
+from django.core.exceptions import ImproperlyConfigured
+from django.db import models
+from django.db import router
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from django_qstash.callbacks import get_callback_url
+from django_qstash.client import qstash_client
+from django_qstash.compression import decompress_body
+from django_qstash.results.services import create_pending_results
+from django_qstash.serializers import batch_messages
+from django_qstash.serializers import get_serializer
+from django_qstash.settings import DJANGO_QSTASH_BATCH_SIZE
+from django_qstash.settings import DJANGO_QSTASH_OUTBOX_CLAIM_TIMEOUT
+from django_qstash.settings import DJANGO_QSTASH_OUTBOX_FLUSH_ON_COMMIT
+from django_qstash.settings import DJANGO_QSTASH_TRACK_PENDING
+
+logger = logging.getLogger(__name__)
+
+
+def get_outbox_model() -> type[models.Model]:
+    """Get the OutboxMessage model or fail loudly if the outbox app is missing."""
+    try:
+        return apps.get_model("django_qstash_outbox", "OutboxMessage")
+    except LookupError:
+        raise ImproperlyConfigured(
+            "Django QStash Outbox not installed. Add `django_qstash.outbox` to "
+            "INSTALLED_APPS and run migrations to use the outbox publish mode."
+        )
+
+
+def enqueue_messages(
+    task_name: str,
+    bodies: list[dict[str, Any]],
+    retries: int = 3,
+    content_based_deduplication: bool = False,
+    delay_seconds: int | None = None,
+) -> list[models.Model]:
+    """
+    Write task messages to the outbox in the current transaction.
+
+    The messages are published by `flush_outbox` once the transaction commits,
+    either from the `transaction.on_commit` hook or the `flush_outbox`
+    management command. The hook is registered once per transaction and
+    publishes a single batch, so a large transaction leaves the rest to the
+    management command instead of draining the outbox in the caller's request.
+    """
+    OutboxMessage = get_outbox_model()
+    not_before = None
+    if delay_seconds:
+        not_before = timezone.now() + timedelta(seconds=delay_seconds)
+    messages = OutboxMessage.objects.bulk_create(
+        [
+            OutboxMessage(
+                task_name=task_name,
+                body=body,
+                retries=retries,
+                content_based_deduplication=content_based_deduplication,
+                not_before=not_before,
+            )
+            for body in bodies
+        ]
+    )
+    using = router.db_for_write(OutboxMessage)
+    if DJANGO_QSTASH_OUTBOX_FLUSH_ON_COMMIT and not flush_is_registered(using):
+        transaction.on_commit(flush_outbox_on_commit, using=using)
+    return messages
+
+
+def flush_is_registered(using: str | None = None) -> bool:
+    """Whether the current transaction already flushes the outbox on commit"""
+    # Callbacks of rolled back savepoints are removed from this list, so it
+    # is a per-transaction flag that never outlives the transaction
+    connection = transaction.get_connection(using)
+    return any(
+        callback[1] is flush_outbox_on_commit for callback in connection.run_on_commit
+    )
+
+
+def format_outbox_message(message: models.Model, url: str) -> dict[str, Any]:
+    """
+    Format an outbox message as a QStash batch request.
+
+    The outbox message id doubles as the QStash deduplication id, so a batch that
+    was published but not removed from the outbox (e.g. the flusher died before
+    committing) is not delivered twice when it is flushed again.
+    """
+    data = {
+        "url": url,
+        "body": message.body,
+        "retries": message.retries,
+    }
+    if message.content_based_deduplication:
+        data["content_based_deduplication"] = True
+    else:
+        data["deduplication_id"] = str(message.id)
+    if message.not_before and message.not_before > timezone.now():
+        data["not_before"] = int(message.not_before.timestamp())
+    return data
+
+
+def outbox_pending_result(message: models.Model, message_id: str) -> dict[str, Any]:
+    """
+    The PENDING TaskResult fields for a published outbox message.
+
+    `date_created` is when the message was written to the outbox, so the time
+    spent waiting for the flusher counts as queued time.
+    """
+    # Imported here: django_qstash.app imports this module
+    from django_qstash.app.registry import task_registry
+
+    if not DJANGO_QSTASH_TRACK_PENDING:
+        return {}
+    body = decompress_body(message.body, get_serializer())
+    task = task_registry.get(f"{body.get('module')}.{body.get('function')}")
+    if task is None:
+        return {}
+    record = task._pending_result(message_id, body["args"], body["kwargs"])
+    if record:
+        record["date_created"] = message.date_created
+    return record
+
+
+def publish_outbox_batch(batch_size: int | None = None) -> int:
+    """
+    Publish a single batch of outbox messages and return how many were sent.
+
+    The batch is claimed in a short transaction with
+    `SELECT ... FOR UPDATE SKIP LOCKED` that sets `claimed_until`, so several
+    flushers can drain the outbox in parallel without publishing the same
+    message, and no row locks are held during the QStash request. A claim
+    left behind by a flusher that died expires after
+    DJANGO_QSTASH_OUTBOX_CLAIM_TIMEOUT seconds; the outbox message id is the
+    QStash deduplication id, so publishing it again is safe.
+    """
+    OutboxMessage = get_outbox_model()
+    batch_size = batch_size or DJANGO_QSTASH_BATCH_SIZE
+    url = get_callback_url()
+    now = timezone.now()
+    with transaction.atomic(using=router.db_for_write(OutboxMessage)):
+        messages = list(
+            OutboxMessage.objects.select_for_update(skip_locked=True)
+            .filter(Q(claimed_until__isnull=True) | Q(claimed_until__lt=now))
+            .order_by("date_created")[:batch_size]
+        )
+        if not messages:
+            return 0
+        batch = OutboxMessage.objects.filter(
+            pk__in=[message.pk for message in messages]
+        )
+        batch.update(
+            claimed_until=now + timedelta(seconds=DJANGO_QSTASH_OUTBOX_CLAIM_TIMEOUT)
+        )
+    try:
+        responses = batch_messages(
+            qstash_client.message,
+            [format_outbox_message(message, url) for message in messages],
+        )
+    except Exception:
+        # Let the next flush retry them right away
+        batch.update(claimed_until=None)
+        raise
+    batch.delete()
+    # After the delete, so the webhook and this insert see each other's rows
+    create_pending_results(
+        [
+            outbox_pending_result(message, response.message_id)
+            for message, response in zip(messages, responses)
+        ]
+    )
+    return len(messages)
+
+
+def flush_outbox(batch_size: int | None = None, max_batches: int | None = None) -> int:
+    """Publish outbox messages batch by batch until the outbox is empty."""
+    published = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        count = publish_outbox_batch(batch_size=batch_size)
+        if not count:
+            break
+        published += count
+        batches += 1
+    return published
+
+
+def flush_outbox_on_commit() -> None:
+    """Publish a batch after commit without failing the caller's request."""
+    try:
+        flush_outbox(max_batches=1)
+    except Exception:
+        logger.exception("Failed to flush the QStash outbox. Messages remain queued.")
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any
+
+from django_qstash.background import ProcessSingleton
+from django_qstash.client import qstash_client
+from django_qstash.exceptions import PublishDropped
+from django_qstash.exceptions import PublishError
+from django_qstash.exceptions import PublishQueueFull
+from django_qstash.serializers import batch_messages
+from django_qstash.settings import DJANGO_QSTASH_BACKGROUND_FULL_POLICY
+from django_qstash.settings import DJANGO_QSTASH_BACKGROUND_QUEUE_SIZE
+from django_qstash.settings import DJANGO_QSTASH_BACKGROUND_SHUTDOWN_TIMEOUT
+from django_qstash.settings import DJANGO_QSTASH_BACKGROUND_WORKERS
+from django_qstash.settings import DJANGO_QSTASH_BATCH_SIZE
+
+logger = logging.getLogger(__name__)
+
+FULL_POLICIES = ("block", "drop", "raise")
+
+_STOP = object()
+
+
+class BackgroundPublisher:
+    """
+    Publish QStash messages from a pool of daemon threads.
+
+    Messages are put on a bounded queue and each worker coalesces whatever is
+    waiting (up to `batch_size`) into a single batch request. Every submitted
+    message gets a Future that resolves to its QStash message id.
+    """
+
+    def __init__(
+        self,
+        max_queue_size: int = DJANGO_QSTASH_BACKGROUND_QUEUE_SIZE,
+        workers: int = DJANGO_QSTASH_BACKGROUND_WORKERS,
+        full_policy: str = DJANGO_QSTASH_BACKGROUND_FULL_POLICY,
+        batch_size: int = DJANGO_QSTASH_BATCH_SIZE,
+    ):
+        if full_policy not in FULL_POLICIES:
+            raise ValueError(
+                f"Invalid full policy {full_policy!r}. Use one of: {', '.join(FULL_POLICIES)}"
+            )
+        self.max_queue_size = max_queue_size
+        self.workers = workers
+        self.full_policy = full_policy
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._queue: queue.Queue = queue.Queue(maxsize=self.max_queue_size)
+        self._threads: list[threading.Thread] = []
+        self._closed = False
+
+    def _ensure_started(self) -> None:
+        if self._threads:
+            return
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(
+                    target=self._run,
+                    name=f"django-qstash-publisher-{i}",
+                    daemon=True,
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, message: dict[str, Any]) -> Future:
+        """Queue a batch_json message and return a Future for its message id."""
+        if self._closed:
+            raise PublishError("Background publisher is shut down")
+        self._ensure_started()
+        future: Future = Future()
+        item = (message, future)
+        if self.full_policy == "block":
+            self._queue.put(item)
+            return future
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            if self.full_policy == "raise":
+                raise PublishQueueFull(
+                    f"Background publish queue is full ({self.max_queue_size} messages)"
+                )
+            logger.warning("Background publish queue is full, dropping message")
+            future.set_exception(
+                PublishDropped(
+                    f"Background publish queue is full ({self.max_queue_size} "
+                    "messages), the message was dropped"
+                )
+            )
+        return future
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                return
+            batch = [item]
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            self._publish(batch)
+            for _ in range(len(batch) + stop):
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _publish(self, batch: list[tuple[dict[str, Any], Future]]) -> None:
+        try:
+            responses = batch_messages(
+                qstash_client.message, [message for message, _ in batch]
+            )
+        except Exception as e:
+            logger.exception("Failed to publish %s background messages", len(batch))
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for (_, future), response in zip(batch, responses):
+            future.set_result(response.message_id)
+
+    def flush(self) -> None:
+        """Block until every queued message has been published."""
+        if self._threads:
+            self._queue.join()
+
+    def shutdown(self, timeout: float | None = None) -> None:
+        """Stop accepting messages, publish what is queued and stop the workers."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            threads = self._threads
+        for _ in threads:
+            self._queue.put(_STOP)
+        for thread in threads:
+            thread.join(timeout)
+        if any(thread.is_alive() for thread in threads):
+            logger.warning(
+                "Background publisher did not finish within %s seconds", timeout
+            )
+
+
+_publisher = ProcessSingleton(
+    BackgroundPublisher, shutdown_timeout=DJANGO_QSTASH_BACKGROUND_SHUTDOWN_TIMEOUT
+)
+
+
+def get_background_publisher() -> BackgroundPublisher:
+    """Get the process-wide background publisher, creating it on first use."""
+    return _publisher.get()
+
+
+def shutdown_background_publisher() -> None:
+    """Flush and stop the background publisher (also run at exit)."""
+    _publisher.shutdown()
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
 from django.contrib import admin
+from django.contrib import messages
+from django.contrib.admin.views.main import SEARCH_VAR
+
+from django_qstash.results.services import get_task_result
 
 from .models import TaskResult
+from .models import TaskStats
 
 
 @admin.register(TaskResult)
@@ -10,6 +15,7 @@ class TaskResultAdmin(admin.ModelAdmin):
     readonly_fields = [
         "task_name",
         "status",
+        "started_at",
         "date_done",
         "result",
         "traceback",
@@ -22,3 +28,47 @@ class TaskResultAdmin(admin.ModelAdmin):
     search_fields = ["task_name", "task_id", "function_path"]
     list_display = ["task_name", "function_path", "status", "date_done"]
     list_filter = ["status", "date_done"]
+
+    def changelist_view(self, request, extra_context=None):
+        task_id = request.GET.get(SEARCH_VAR, "").strip()
+        if task_id:
+            self.show_backend_result(request, task_id)
+        return super().changelist_view(request, extra_context)
+
+    def show_backend_result(self, request, task_id: str) -> None:
+        """
+        Show a result the DJANGO_QSTASH_RESULT_BACKEND keeps outside the
+        database (e.g. in the cache) when searching for its task id.
+        """
+        task_result = get_task_result(task_id)
+        if task_result is None or not task_result._state.adding:
+            return
+        self.message_user(
+            request,
+            f"{task_result} is {task_result.status} in the result backend "
+            f"(finished {task_result.date_done}): {task_result.result}",
+            messages.INFO,
+        )
+
+
+@admin.register(TaskStats)
+class TaskStatsAdmin(admin.ModelAdmin):
+    list_display = [
+        "task_name",
+        "bucket",
+        "total_count",
+        "failure_count",
+        "avg_duration",
+        "p50_duration",
+        "p95_duration",
+        "max_duration",
+    ]
+    list_filter = ["task_name"]
+    date_hierarchy = "bucket"
+    search_fields = ["task_name"]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
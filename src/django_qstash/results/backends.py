@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.apps import apps
+from django.core.cache import caches
+from django.db.models import F
+from django.utils import timezone
+
+from django_qstash.db.models import TaskStatus
+from django_qstash.results.wakeup import anotify_results
+from django_qstash.results.wakeup import notify_results
+from django_qstash.results.writer import get_result_writer
+from django_qstash.settings import DJANGO_QSTASH_RESULT_CACHE
+from django_qstash.settings import DJANGO_QSTASH_RESULT_CACHE_TTL
+from django_qstash.settings import DJANGO_QSTASH_RESULT_WRITE_MODE
+from django_qstash.settings import DJANGO_QSTASH_TRACK_PENDING
+
+# Statuses of a task that finished; AsyncResult.get() waits for one of them
+READY_STATUSES = frozenset(TaskStatus.values) - {TaskStatus.PENDING, TaskStatus.RETRY}
+
+# Statuses the buffered writer may delay; errors are always written right away
+BUFFERED_STATUSES = frozenset({TaskStatus.SUCCESS})
+
+
+def get_model():
+    return apps.get_model("django_qstash_results", "TaskResult")
+
+
+def ready_task_ids(records: list[dict[str, Any]]) -> list[str]:
+    """The message ids of finished results, the ones worth a wake-up"""
+    # A RETRY wake-up would end the waiter's LISTEN before the real result
+    return [
+        fields["task_id"] for fields in records if fields["status"] in READY_STATUSES
+    ]
+
+
+class BaseResultBackend:
+    """
+    Stores task results and looks them up by QStash message id.
+
+    Every method receives or returns the TaskResult fields built by
+    django_qstash.results.services.task_result_fields(). Lookups return a
+    TaskResult instance, which is unsaved when the result does not live in
+    the database. Subclass this and point DJANGO_QSTASH_RESULT_BACKEND at it
+    to keep results somewhere else.
+    """
+
+    def store(self, fields: dict[str, Any]):
+        """Store a finished result; returns the TaskResult row if one was inserted."""
+        raise NotImplementedError
+
+    async def astore(self, fields: dict[str, Any]):
+        return await sync_to_async(self.store)(fields)
+
+    def store_many(self, records: list[dict[str, Any]]) -> list:
+        """Store several finished results; returns the inserted TaskResult rows."""
+        raise NotImplementedError
+
+    def create_pending(self, records: list[dict[str, Any]]) -> list:
+        """Store a PENDING result per published message."""
+        raise NotImplementedError
+
+    async def acreate_pending(self, records: list[dict[str, Any]]) -> list:
+        return await sync_to_async(self.create_pending)(records)
+
+    def get(self, task_id: str):
+        """The latest result for a message id, or None if none was stored yet."""
+        raise NotImplementedError
+
+
+class DatabaseBackend(BaseResultBackend):
+    """Stores results in the `TaskResult` model of `django_qstash.results`."""
+
+    def is_buffered(self, status: str) -> bool:
+        """Whether a result with this status goes through the buffered writer"""
+        return (
+            DJANGO_QSTASH_RESULT_WRITE_MODE == "buffered"
+            and status in BUFFERED_STATUSES
+        )
+
+    def pending_results(self, *task_ids: str):
+        """The PENDING rows inserted for messages when they were published"""
+        return get_model().objects.filter(
+            task_id__in=task_ids, status=TaskStatus.PENDING
+        )
+
+    def finished_task_ids(self, *task_ids: str) -> set[str]:
+        """The message ids among `task_ids` that already have a result"""
+        return set(
+            get_model()
+            .objects.filter(task_id__in=task_ids)
+            .exclude(status=TaskStatus.PENDING)
+            .values_list("task_id", flat=True)
+        )
+
+    def store(self, fields: dict[str, Any]):
+        """
+        With DJANGO_QSTASH_TRACK_PENDING, the PENDING row inserted at publish
+        time is updated instead. With DJANGO_QSTASH_RESULT_WRITE_MODE =
+        "buffered", successful results are queued for the result writer.
+        None is returned in both cases.
+        """
+        task_id = fields["task_id"]
+        if DJANGO_QSTASH_TRACK_PENDING and task_id:
+            if self.pending_results(task_id).update(**fields):
+                notify_results(ready_task_ids([fields]))
+                return None
+        if self.is_buffered(fields["status"]):
+            # The writer sends the wake-up once the row is written
+            get_result_writer().add(fields)
+            return None
+        task_result = get_model().objects.create(**fields)
+        if DJANGO_QSTASH_TRACK_PENDING and task_id:
+            # A PENDING row inserted by a publisher that was slower than us
+            self.pending_results(task_id).delete()
+        notify_results(ready_task_ids([fields]))
+        return task_result
+
+    async def astore(self, fields: dict[str, Any]):
+        task_id = fields["task_id"]
+        if DJANGO_QSTASH_TRACK_PENDING and task_id:
+            if await self.pending_results(task_id).aupdate(**fields):
+                await anotify_results(ready_task_ids([fields]))
+                return None
+        if self.is_buffered(fields["status"]):
+            get_result_writer().add(fields)
+            return None
+        task_result = await get_model().objects.acreate(**fields)
+        if DJANGO_QSTASH_TRACK_PENDING and task_id:
+            await self.pending_results(task_id).adelete()
+        await anotify_results(ready_task_ids([fields]))
+        return task_result
+
+    def store_many(self, records: list[dict[str, Any]]) -> list:
+        TaskResult = get_model()
+        rows = []
+        for fields in records:
+            if self.is_buffered(fields["status"]):
+                get_result_writer().add(fields)
+            else:
+                rows.append(TaskResult(**fields))
+        task_results = TaskResult.objects.bulk_create(rows)
+        if DJANGO_QSTASH_TRACK_PENDING:
+            # A bundle's summary row replaces the message's PENDING row
+            task_ids = {fields["task_id"] for fields in records if fields["task_id"]}
+            self.pending_results(*task_ids).delete()
+        notify_results(
+            task_result.task_id
+            for task_result in task_results
+            if task_result.status in READY_STATUSES
+        )
+        return task_results
+
+    def create_pending(self, records: list[dict[str, Any]]) -> list:
+        """
+        The webhook can finish before the publisher gets here, so PENDING
+        rows are never kept next to a result: rows whose message already has
+        one are deleted right after the insert, and store() deletes those
+        inserted after its own row.
+        """
+        TaskResult = get_model()
+        task_results = TaskResult.objects.bulk_create(
+            [TaskResult(status=TaskStatus.PENDING, **record) for record in records]
+        )
+        return self._drop_finished(task_results)
+
+    async def acreate_pending(self, records: list[dict[str, Any]]) -> list:
+        TaskResult = get_model()
+        task_results = await TaskResult.objects.abulk_create(
+            [TaskResult(status=TaskStatus.PENDING, **record) for record in records]
+        )
+        return await sync_to_async(self._drop_finished)(task_results)
+
+    def _drop_finished(self, task_results: list) -> list:
+        finished = self.finished_task_ids(*(row.task_id for row in task_results))
+        if not finished:
+            return task_results
+        self.pending_results(*finished).delete()
+        return [row for row in task_results if row.task_id not in finished]
+
+    def get(self, task_id: str):
+        return (
+            get_model()
+            .objects.filter(task_id=task_id)
+            .order_by(F("date_done").desc(nulls_last=True))
+            .first()
+        )
+
+
+class CacheBackend(BaseResultBackend):
+    """
+    Stores results in a Django cache (e.g. Redis) for
+    DJANGO_QSTASH_RESULT_CACHE_TTL seconds.
+
+    Nothing is written to the database and results expire on their own, so
+    the results table and clear_stale_results are not involved. Results are
+    only as durable as the cache.
+    """
+
+    key_prefix = "django_qstash:result"
+
+    def __init__(
+        self,
+        alias: str = DJANGO_QSTASH_RESULT_CACHE,
+        timeout: int = DJANGO_QSTASH_RESULT_CACHE_TTL,
+    ):
+        self.alias = alias
+        self.timeout = timeout
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def get_key(self, task_id: str) -> str:
+        return f"{self.key_prefix}:{task_id}"
+
+    def _finished(self, fields: dict[str, Any], pending: dict | None) -> dict:
+        # Keep the publish time of the PENDING entry, like the database update
+        date_created = (pending or {}).get("date_created") or fields["date_done"]
+        return {"date_created": date_created, **fields}
+
+    def store(self, fields: dict[str, Any]) -> None:
+        if not fields["task_id"]:
+            # Without a message id the result could never be looked up
+            return None
+        key = self.get_key(fields["task_id"])
+        pending = self.cache.get(key) if DJANGO_QSTASH_TRACK_PENDING else None
+        self.cache.set(key, self._finished(fields, pending), self.timeout)
+        notify_results(ready_task_ids([fields]))
+        return None
+
+    async def astore(self, fields: dict[str, Any]) -> None:
+        if not fields["task_id"]:
+            return None
+        key = self.get_key(fields["task_id"])
+        pending = await self.cache.aget(key) if DJANGO_QSTASH_TRACK_PENDING else None
+        await self.cache.aset(key, self._finished(fields, pending), self.timeout)
+        await anotify_results(ready_task_ids([fields]))
+        return None
+
+    def store_many(self, records: list[dict[str, Any]]) -> list:
+        self.cache.set_many(
+            {
+                self.get_key(fields["task_id"]): self._finished(fields, None)
+                for fields in records
+                if fields["task_id"]
+            },
+            self.timeout,
+        )
+        notify_results(ready_task_ids(records))
+        return []
+
+    def create_pending(self, records: list[dict[str, Any]]) -> list:
+        created = []
+        for record in records:
+            fields = {"status": TaskStatus.PENDING, **record}
+            fields.setdefault("date_created", timezone.now())
+            # add() never overwrites a result the webhook already stored
+            if self.cache.add(self.get_key(record["task_id"]), fields, self.timeout):
+                created.append(fields)
+        return created
+
+    def get(self, task_id: str):
+        fields = self.cache.get(self.get_key(task_id))
+        if fields is None:
+            return None
+        return get_model()(**fields)
+
+
+class CompositeBackend(BaseResultBackend):
+    """
+    Keeps successful and PENDING results in the cache, and every other
+    result (errors) in the database where they can be inspected later.
+
+    Lookups read the cache first and fall back to the database.
+    """
+
+    cache_statuses = frozenset({TaskStatus.SUCCESS, TaskStatus.PENDING})
+
+    def __init__(self):
+        self.cache_backend = CacheBackend()
+        self.database_backend = DatabaseBackend()
+
+    def get_backend(self, status: str) -> BaseResultBackend:
+        if status in self.cache_statuses:
+            return self.cache_backend
+        return self.database_backend
+
+    def store(self, fields: dict[str, Any]):
+        return self.get_backend(fields["status"]).store(fields)
+
+    async def astore(self, fields: dict[str, Any]):
+        return await self.get_backend(fields["status"]).astore(fields)
+
+    def store_many(self, records: list[dict[str, Any]]) -> list:
+        cached = [
+            fields for fields in records if fields["status"] in self.cache_statuses
+        ]
+        if cached:
+            self.cache_backend.store_many(cached)
+        return self.database_backend.store_many(
+            [
+                fields
+                for fields in records
+                if fields["status"] not in self.cache_statuses
+            ]
+        )
+
+    def create_pending(self, records: list[dict[str, Any]]) -> list:
+        return self.cache_backend.create_pending(records)
+
+    def get(self, task_id: str):
+        task_result = self.cache_backend.get(task_id)
+        if task_result is not None and task_result.status in READY_STATUSES:
+            return task_result
+        # A failed task leaves its PENDING cache entry behind
+        return self.database_backend.get(task_id) or task_result
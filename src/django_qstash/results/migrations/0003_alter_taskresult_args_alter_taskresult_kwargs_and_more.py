@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:38
+
+from __future__ import annotations
+
+import django.core.serializers.json
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        (
+            "django_qstash_results",
+            "0002_taskresult_function_path_alter_taskresult_status_and_more",
+        ),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="taskresult",
+            name="args",
+            field=models.JSONField(
+                encoder=django.core.serializers.json.DjangoJSONEncoder, null=True
+            ),
+        ),
+        migrations.AlterField(
+            model_name="taskresult",
+            name="kwargs",
+            field=models.JSONField(
+                encoder=django.core.serializers.json.DjangoJSONEncoder, null=True
+            ),
+        ),
+        migrations.AlterField(
+            model_name="taskresult",
+            name="result",
+            field=models.JSONField(
+                encoder=django.core.serializers.json.DjangoJSONEncoder, null=True
+            ),
+        ),
+        migrations.AlterField(
+            model_name="taskresult",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("PENDING", "Pending"),
+                    ("SUCCESS", "Success"),
+                    ("CANCELED", "Canceled"),
+                    ("EXECUTION_ERROR", "Execution Error"),
+                    ("INTERNAL_ERROR", "Internal Error"),
+                    ("OTHER_ERROR", "Other Error"),
+                    ("UNKNOWN", "Unknown"),
+                ],
+                default="PENDING",
+                max_length=50,
+            ),
+        ),
+    ]
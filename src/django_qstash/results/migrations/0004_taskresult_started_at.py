@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:57
+
+from __future__ import annotations
+
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        (
+            "django_qstash_results",
+            "0003_alter_taskresult_args_alter_taskresult_kwargs_and_more",
+        ),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="taskresult",
+            name="started_at",
+            field=models.DateTimeField(null=True),
+        ),
+    ]
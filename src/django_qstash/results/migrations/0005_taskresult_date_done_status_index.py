@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:02
+
+from __future__ import annotations
+
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_qstash_results", "0004_taskresult_started_at"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="taskresult",
+            index=models.Index(
+                fields=["date_done", "status"], name="django_qstash_done_status_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:09
+
+from __future__ import annotations
+
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_qstash_results", "0005_taskresult_date_done_status_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="taskresult",
+            name="expires_at",
+            field=models.DateTimeField(db_index=True, null=True),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:12
+
+from __future__ import annotations
+
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_qstash_results", "0006_taskresult_expires_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("task_name", models.CharField(max_length=255)),
+                ("bucket", models.DateTimeField()),
+                ("total_count", models.PositiveIntegerField(default=0)),
+                ("success_count", models.PositiveIntegerField(default=0)),
+                ("canceled_count", models.PositiveIntegerField(default=0)),
+                ("execution_error_count", models.PositiveIntegerField(default=0)),
+                ("internal_error_count", models.PositiveIntegerField(default=0)),
+                ("other_error_count", models.PositiveIntegerField(default=0)),
+                ("unknown_count", models.PositiveIntegerField(default=0)),
+                ("duration_count", models.PositiveIntegerField(default=0)),
+                ("total_duration", models.FloatField(default=0)),
+                ("min_duration", models.FloatField(null=True)),
+                ("max_duration", models.FloatField(null=True)),
+                ("duration_sketch", models.JSONField(default=dict)),
+            ],
+            options={
+                "verbose_name_plural": "task stats",
+                "ordering": ["-bucket"],
+                "indexes": [
+                    models.Index(
+                        fields=["bucket"], name="django_qstash_stats_bucket_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("task_name", "bucket"),
+                        name="django_qstash_stats_task_bucket",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:32
+
+from __future__ import annotations
+
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_qstash_results", "0007_taskstats"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="taskresult",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("PENDING", "Pending"),
+                    ("RETRY", "Retry"),
+                    ("SUCCESS", "Success"),
+                    ("CANCELED", "Canceled"),
+                    ("EXECUTION_ERROR", "Execution Error"),
+                    ("INTERNAL_ERROR", "Internal Error"),
+                    ("OTHER_ERROR", "Other Error"),
+                    ("UNKNOWN", "Unknown"),
+                ],
+                default="PENDING",
+                max_length=50,
+            ),
+        ),
+    ]
@@ -2,10 +2,12 @@ from __future__ import annotations
 
 import uuid
 
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.utils import timezone
 
 from django_qstash.db.models import TaskStatus
+from django_qstash.results.stats import DurationSketch
 
 
 class TaskResult(models.Model):
@@ -20,16 +22,88 @@ class TaskResult(models.Model):
         default=TaskStatus.PENDING,
     )
     date_created = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True)
     date_done = models.DateTimeField(null=True)
-    result = models.JSONField(null=True)
+    # Set for tasks with result_expires; cleanup deletes by it in index order
+    expires_at = models.DateTimeField(null=True, db_index=True)
+    result = models.JSONField(null=True, encoder=DjangoJSONEncoder)
     traceback = models.TextField(blank=True, null=True)
     function_path = models.TextField(blank=True, null=True)
-    args = models.JSONField(null=True)
-    kwargs = models.JSONField(null=True)
+    args = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+    kwargs = models.JSONField(null=True, encoder=DjangoJSONEncoder)
 
     class Meta:
         app_label = "django_qstash_results"
         ordering = ["-date_done"]
+        indexes = [
+            # Stale result cleanup filters on both
+            models.Index(
+                fields=["date_done", "status"], name="django_qstash_done_status_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.task_name} ({self.task_id})"
+
+
+class TaskStats(models.Model):
+    """
+    Execution metrics of a task for one minute, see django_qstash.results.stats
+
+    Rows are not deleted with task results, so they keep the history.
+    """
+
+    task_name = models.CharField(max_length=255)
+    bucket = models.DateTimeField()
+    total_count = models.PositiveIntegerField(default=0)
+    success_count = models.PositiveIntegerField(default=0)
+    canceled_count = models.PositiveIntegerField(default=0)
+    execution_error_count = models.PositiveIntegerField(default=0)
+    internal_error_count = models.PositiveIntegerField(default=0)
+    other_error_count = models.PositiveIntegerField(default=0)
+    unknown_count = models.PositiveIntegerField(default=0)
+    # Durations in seconds of the executions that have a started_at
+    duration_count = models.PositiveIntegerField(default=0)
+    total_duration = models.FloatField(default=0)
+    min_duration = models.FloatField(null=True)
+    max_duration = models.FloatField(null=True)
+    duration_sketch = models.JSONField(default=dict)
+
+    class Meta:
+        app_label = "django_qstash_results"
+        ordering = ["-bucket"]
+        verbose_name_plural = "task stats"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["task_name", "bucket"], name="django_qstash_stats_task_bucket"
+            ),
+        ]
+        indexes = [
+            # Dashboards read a time range across every task
+            models.Index(fields=["bucket"], name="django_qstash_stats_bucket_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.task_name} ({self.bucket:%Y-%m-%d %H:%M})"
+
+    @property
+    def failure_count(self) -> int:
+        return self.total_count - self.success_count
+
+    @property
+    def avg_duration(self) -> float | None:
+        if not self.duration_count:
+            return None
+        return self.total_duration / self.duration_count
+
+    def percentile(self, q: float) -> float | None:
+        """Approximate duration quantile (0 to 1) from the duration sketch"""
+        return DurationSketch.from_dict(self.duration_sketch).quantile(q)
+
+    @property
+    def p50_duration(self) -> float | None:
+        return self.percentile(0.5)
+
+    @property
+    def p95_duration(self) -> float | None:
+        return self.percentile(0.95)
@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone as dt_timezone
+
+from django.apps import apps
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+from django.db import router
+from django.db import transaction
+from django.utils import timezone
+
+from django_qstash.settings import DJANGO_QSTASH_RESULT_PARTITIONING
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {
+    "daily": timedelta(days=1),
+    "weekly": timedelta(weeks=1),
+}
+
+
+def period_start(value: datetime, period: str) -> datetime:
+    """The start (UTC midnight, Mondays for weekly) of the period containing value"""
+    value = value.astimezone(dt_timezone.utc)
+    start = value.replace(hour=0, minute=0, second=0, microsecond=0)
+    if period == "weekly":
+        start -= timedelta(days=start.weekday())
+    return start
+
+
+class ResultPartitions:
+    """
+    Range partitions of the TaskResult table by `date_done` on PostgreSQL.
+
+    Every partition is named after its bounds
+    (`<table>_p<YYYYMMDD>_<YYYYMMDD>`), so retention only has to read the
+    partition names to find the ones that are entirely stale, then drops them
+    in constant time instead of deleting rows. Rows without a `date_done`
+    (e.g. PENDING results) live in the `<table>_default` partition.
+
+    The partitioned table has no primary key constraint, since PostgreSQL
+    requires it to include the nullable `date_done`; `id` is a plain index.
+    """
+
+    def __init__(self, period: str | None = None, using: str | None = None):
+        self.period = period or DJANGO_QSTASH_RESULT_PARTITIONING
+        if self.period not in PERIODS:
+            raise ImproperlyConfigured(
+                f"Invalid DJANGO_QSTASH_RESULT_PARTITIONING {self.period!r}. "
+                f"Use one of: {', '.join(PERIODS)}"
+            )
+        TaskResult = apps.get_model("django_qstash_results", "TaskResult")
+        self.table = TaskResult._meta.db_table
+        self.connection = connections[using or router.db_for_write(TaskResult)]
+
+    @property
+    def default_partition(self) -> str:
+        return f"{self.table}_default"
+
+    def quote(self, name: str) -> str:
+        return self.connection.ops.quote_name(name)
+
+    def is_supported(self) -> bool:
+        return self.connection.vendor == "postgresql"
+
+    def is_partitioned(self) -> bool:
+        if not self.is_supported():
+            return False
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)",
+                [self.table],
+            )
+            return cursor.fetchone() is not None
+
+    def partition_name(self, start: datetime | None, end: datetime) -> str:
+        start_label = "min" if start is None else f"{start:%Y%m%d}"
+        return f"{self.table}_p{start_label}_{end:%Y%m%d}"
+
+    def partition_end(self, name: str) -> datetime | None:
+        """The upper bound encoded in a range partition's name"""
+        prefix = f"{self.table}_p"
+        if not name.startswith(prefix):
+            return None
+        try:
+            end = datetime.strptime(name.rsplit("_", 1)[1], "%Y%m%d")
+        except ValueError:
+            return None
+        return end.replace(tzinfo=dt_timezone.utc)
+
+    def get_partitions(self) -> list[tuple[str, datetime]]:
+        """The range partitions and their upper bounds, oldest first"""
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE pg_inherits.inhparent = to_regclass(%s)",
+                [self.table],
+            )
+            names = [row[0] for row in cursor.fetchall()]
+        partitions = [(name, self.partition_end(name)) for name in names]
+        return sorted(
+            [(name, end) for name, end in partitions if end is not None],
+            key=lambda partition: partition[1],
+        )
+
+    def create_partitions(
+        self, ahead: int = 7, now: datetime | None = None
+    ) -> list[str]:
+        """
+        Create the partitions for the current period and `ahead` future ones.
+
+        New partitions continue from the newest existing one, so ranges stay
+        contiguous. Returns the names of the partitions it ensured exist.
+        """
+        now = now or timezone.now()
+        step = PERIODS[self.period]
+        partitions = self.get_partitions()
+        start = period_start(now, self.period)
+        if partitions:
+            start = max(start, partitions[-1][1])
+        last = period_start(now, self.period) + step * (ahead + 1)
+        created = []
+        while start < last:
+            end = start + step
+            name = self.partition_name(start, end)
+            with transaction.atomic(using=self.connection.alias):
+                with self.connection.cursor() as cursor:
+                    self._create_partition(cursor, name, start, end)
+            created.append(name)
+            start = end
+        return created
+
+    def _create_partition(self, cursor, name: str, start: datetime, end: datetime):
+        table = self.quote(self.table)
+        default = self.quote(self.default_partition)
+        in_range = "date_done >= %s AND date_done < %s"
+        cursor.execute(
+            f"SELECT 1 FROM {default} WHERE {in_range} LIMIT 1", [start, end]
+        )
+        if cursor.fetchone() is None:
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.quote(name)} PARTITION OF {table} "
+                "FOR VALUES FROM (%s) TO (%s)",
+                [start, end],
+            )
+            return
+        # PostgreSQL refuses a partition for rows that already sit in the
+        # default one (e.g. when this ran late), so they are moved into it
+        # while the default partition is detached.
+        cursor.execute(f"ALTER TABLE {table} DETACH PARTITION {default}")
+        cursor.execute(
+            f"CREATE TABLE {self.quote(name)} PARTITION OF {table} "
+            "FOR VALUES FROM (%s) TO (%s)",
+            [start, end],
+        )
+        cursor.execute(
+            f"WITH moved AS (DELETE FROM {default} WHERE {in_range} RETURNING *) "
+            f"INSERT INTO {table} SELECT * FROM moved",
+            [start, end],
+        )
+        cursor.execute(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT")
+        logger.info("Moved task results from the default partition to %s", name)
+
+    def drop_partitions(
+        self,
+        cutoff: datetime,
+        keep_statuses: list[str] | None = None,
+        keep_until: datetime | None = None,
+    ) -> tuple[list[str], int]:
+        """
+        Detach and drop every partition whose rows are all older than cutoff.
+
+        A partition that still holds rows with one of `keep_statuses`, or an
+        `expires_at` after `keep_until`, is kept and only its other rows are
+        deleted; it is dropped by a later run once nothing in it is kept.
+        Returns the dropped partitions and the number of rows deleted.
+        """
+        conditions = []
+        params = []
+        if keep_statuses:
+            conditions.append("status = ANY(%s)")
+            params.append(list(keep_statuses))
+        if keep_until is not None:
+            conditions.append("(expires_at IS NOT NULL AND expires_at > %s)")
+            params.append(keep_until)
+        keep = " OR ".join(conditions)
+        dropped = []
+        deleted_count = 0
+        for name, end in self.get_partitions():
+            if end > cutoff:
+                break
+            partition = self.quote(name)
+            with transaction.atomic(using=self.connection.alias):
+                with self.connection.cursor() as cursor:
+                    if keep:
+                        cursor.execute(
+                            f"SELECT 1 FROM {partition} WHERE {keep} LIMIT 1", params
+                        )
+                        if cursor.fetchone() is not None:
+                            cursor.execute(
+                                f"DELETE FROM {partition} WHERE NOT ({keep})", params
+                            )
+                            deleted_count += cursor.rowcount
+                            continue
+                    cursor.execute(
+                        f"ALTER TABLE {self.quote(self.table)} "
+                        f"DETACH PARTITION {partition}"
+                    )
+                    cursor.execute(f"DROP TABLE {partition}")
+            logger.info("Dropped task result partition %s", name)
+            dropped.append(name)
+        return dropped, deleted_count
+
+    def delete_from_default(
+        self, cutoff: datetime, exclude_statuses: list[str] | None = None
+    ) -> int:
+        """
+        Delete the stale rows kept in the default partition.
+
+        Rows with an `expires_at` are left to the expires_at cleanup.
+        """
+        sql = (
+            f"DELETE FROM {self.quote(self.default_partition)} "
+            "WHERE date_done < %s AND expires_at IS NULL"
+        )
+        params = [cutoff]
+        if exclude_statuses:
+            sql += " AND NOT (status = ANY(%s))"
+            params.append(list(exclude_statuses))
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.rowcount
+
+    def convert(self, now: datetime | None = None) -> None:
+        """
+        Turn the existing TaskResult table into a partitioned one.
+
+        The existing table becomes the partition for every `date_done` before
+        the next period, so no rows are copied; it is dropped by retention
+        once all of its rows are stale. Its indexes are reused as partitions
+        of the new table's indexes, but attaching it still scans it once to
+        check its rows and builds a plain index on its `id`, so run this in a
+        maintenance window.
+        """
+        if not self.is_supported():
+            raise ImproperlyConfigured(
+                "Partitioned task results require a PostgreSQL database"
+            )
+        if self.is_partitioned():
+            return
+        now = now or timezone.now()
+        end = period_start(now, self.period) + PERIODS[self.period]
+        legacy = self.partition_name(None, end)
+        table = self.quote(self.table)
+        with transaction.atomic(using=self.connection.alias):
+            with self.connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT index.relname, pg_get_indexdef(index.oid) FROM pg_index "
+                    "JOIN pg_class index ON index.oid = pg_index.indexrelid "
+                    "WHERE pg_index.indrelid = to_regclass(%s) "
+                    "AND NOT pg_index.indisunique",
+                    [self.table],
+                )
+                indexes = cursor.fetchall()
+                cursor.execute(f"LOCK TABLE {table} IN ACCESS EXCLUSIVE MODE")
+                cursor.execute(f"ALTER TABLE {table} RENAME TO {self.quote(legacy)}")
+                for index, _ in indexes:
+                    cursor.execute(
+                        f"ALTER INDEX {self.quote(index)} "
+                        f"RENAME TO {self.quote(f'{index[:50]}_legacy')}"
+                    )
+                cursor.execute(
+                    f"CREATE TABLE {table} (LIKE {self.quote(legacy)} "
+                    "INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+                    "PARTITION BY RANGE (date_done)"
+                )
+                for _, definition in indexes:
+                    # Fetched before the rename, so it targets the new table
+                    cursor.execute(definition)
+                # Created on every partition as it is created or attached; the
+                # old table's primary key is unique, so it cannot be reused
+                cursor.execute(
+                    f"CREATE INDEX {self.quote(f'{self.table[:50]}_id_idx')} "
+                    f"ON {table} (id)"
+                )
+                cursor.execute(
+                    f"CREATE TABLE {self.quote(self.default_partition)} "
+                    f"PARTITION OF {table} DEFAULT"
+                )
+                # Rows without date_done cannot be in a range partition
+                cursor.execute(
+                    f"WITH moved AS (DELETE FROM {self.quote(legacy)} "
+                    "WHERE date_done IS NULL RETURNING *) "
+                    f"INSERT INTO {table} SELECT * FROM moved"
+                )
+                cursor.execute(
+                    f"ALTER TABLE {table} ATTACH PARTITION {self.quote(legacy)} "
+                    "FOR VALUES FROM (MINVALUE) TO (%s)",
+                    [end],
+                )
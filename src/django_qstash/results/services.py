@@ -1,17 +1,35 @@
 from __future__ import annotations
 
+import functools
 import json
 import logging
+import time
+from contextlib import nullcontext
+from datetime import timedelta
 from typing import Any
 
 from django.apps import apps
+from django.core.exceptions import ImproperlyConfigured
 from django.utils import timezone
+from django.utils.module_loading import import_string
 
 from django_qstash.db.models import TaskStatus
+from django_qstash.exceptions import ResultTimeout
+from django_qstash.results.backends import READY_STATUSES
+from django_qstash.results.backends import BaseResultBackend
+from django_qstash.results.wakeup import get_wakeup
+from django_qstash.serializers import get_serializer_for_content_type
+from django_qstash.settings import DJANGO_QSTASH_RESULT_BACKEND
+from django_qstash.settings import DJANGO_QSTASH_TRACK_PENDING
 
 logger = logging.getLogger(__name__)
 
 
+def json_loads(value: str) -> Any:
+    """Decode JSON with the configured JSON serializer (e.g. orjson)."""
+    return get_serializer_for_content_type("application/json").loads(value)
+
+
 def function_result_to_dict(result: Any) -> dict | None:
     """
     Convert a task result to a Python dict for the result JSONField.
@@ -29,7 +47,7 @@ def function_result_to_dict(result: Any) -> dict | None:
         return result
     elif isinstance(result, str):
         try:
-            parsed = json.loads(result)
+            parsed = json_loads(result)
             if isinstance(parsed, dict):
                 return parsed
             return {"result": parsed}
@@ -39,6 +57,54 @@ def function_result_to_dict(result: Any) -> dict | None:
     return {"result": result}
 
 
+def get_task_result_model():
+    """Get the TaskResult model, or None if the results app isn't installed."""
+    try:
+        return apps.get_model("django_qstash_results", "TaskResult")
+    except LookupError:
+        # Model isn't installed, skip storage
+        logger.debug(
+            "Django QStash Results not installed. Add `django_qstash.results` to INSTALLED_APPS and run migrations."
+        )
+        return None
+
+
+def task_result_fields(
+    task_id,
+    task_name,
+    status,
+    result=None,
+    traceback=None,
+    args=None,
+    kwargs=None,
+    function_path=None,
+    started_at=None,
+    expires=None,
+) -> dict[str, Any]:
+    if status not in TaskStatus.values:
+        status = TaskStatus.UNKNOWN
+    date_done = timezone.now()
+    return {
+        "task_id": task_id,
+        "task_name": task_name,
+        "status": status,
+        "started_at": started_at,
+        "date_done": date_done,
+        # Results without expires_at follow DJANGO_QSTASH_RESULT_TTL
+        "expires_at": date_done + timedelta(seconds=expires) if expires else None,
+        "result": function_result_to_dict(result),
+        "traceback": traceback,
+        "args": args,
+        "kwargs": kwargs,
+        "function_path": function_path,
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def get_result_backend() -> BaseResultBackend:
+    return import_string(DJANGO_QSTASH_RESULT_BACKEND)()
+
+
 def store_task_result(
     task_id,
     task_name,
@@ -49,28 +115,164 @@ def store_task_result(
     kwargs=None,
     error=None,
     function_path=None,
+    started_at=None,
+    expires=None,
 ):
-    """Helper function to store task results if the results app is installed"""
-    if status not in TaskStatus.values:
-        status = TaskStatus.UNKNOWN
+    """
+    Helper function to store task results if the results app is installed.
 
-    try:
-        TaskResult = apps.get_model("django_qstash_results", "TaskResult")
-        task_result = TaskResult.objects.create(
-            task_id=task_id,
-            task_name=task_name,
-            status=status,
-            date_done=timezone.now(),
-            result=function_result_to_dict(result),
-            traceback=traceback,
-            args=args,
-            kwargs=kwargs,
-            function_path=function_path,
-        )
-        return task_result
-    except LookupError:
-        # Model isn't installed, skip storage
-        logger.debug(
-            "Django QStash Results not installed. Add `django_qstash.results` to INSTALLED_APPS and run migrations."
-        )
+    Results go to the DJANGO_QSTASH_RESULT_BACKEND. With `expires` (the
+    task's result_expires in seconds), the result gets an `expires_at` that
+    clear_stale_results deletes it by. The created TaskResult is
+    returned, or None when no row was inserted (e.g. a PENDING row was
+    updated, the result was buffered or it was stored outside the database).
+    """
+    if get_task_result_model() is None:
         return None
+    fields = task_result_fields(
+        task_id,
+        task_name,
+        status,
+        result,
+        traceback,
+        args,
+        kwargs,
+        function_path,
+        started_at,
+        expires,
+    )
+    return get_result_backend().store(fields)
+
+
+async def astore_task_result(
+    task_id,
+    task_name,
+    status,
+    result=None,
+    traceback=None,
+    args=None,
+    kwargs=None,
+    error=None,
+    function_path=None,
+    started_at=None,
+    expires=None,
+):
+    """Async counterpart of store_task_result()"""
+    if get_task_result_model() is None:
+        return None
+    fields = task_result_fields(
+        task_id,
+        task_name,
+        status,
+        result,
+        traceback,
+        args,
+        kwargs,
+        function_path,
+        started_at,
+        expires,
+    )
+    return await get_result_backend().astore(fields)
+
+
+def store_task_results(records: list[dict[str, Any]]):
+    """
+    Store several task results at once (a single bulk_create in the database).
+
+    Each record holds the keyword arguments of task_result_fields(). Only the
+    inserted TaskResult rows are returned.
+    """
+    if get_task_result_model() is None or not records:
+        return []
+    return get_result_backend().store_many(
+        [task_result_fields(**record) for record in records]
+    )
+
+
+def create_pending_results(records: list[dict[str, Any]]):
+    """
+    Store a PENDING result per published message, with one bulk_create in the
+    database.
+
+    Does nothing unless DJANGO_QSTASH_TRACK_PENDING is set. Each record holds
+    the message id as `task_id` and any other TaskResult fields known at
+    publish time (e.g. `task_name`, `args`). The webhook later updates the
+    result to its final status, so `started_at - date_created` is the time
+    the message spent queued.
+    """
+    if not DJANGO_QSTASH_TRACK_PENDING:
+        return []
+    records = [record for record in records if record.get("task_id")]
+    if get_task_result_model() is None or not records:
+        return []
+    return get_result_backend().create_pending(records)
+
+
+async def acreate_pending_results(records: list[dict[str, Any]]):
+    """Async counterpart of create_pending_results()"""
+    if not DJANGO_QSTASH_TRACK_PENDING:
+        return []
+    records = [record for record in records if record.get("task_id")]
+    if get_task_result_model() is None or not records:
+        return []
+    return await get_result_backend().acreate_pending(records)
+
+
+def result_value(stored: dict | None) -> Any:
+    """The task's return value from the JSON stored by function_result_to_dict()"""
+    if isinstance(stored, dict) and stored.keys() == {"result"}:
+        return stored["result"]
+    return stored
+
+
+def get_task_result(task_id: str):
+    """
+    The latest TaskResult for a message id, or None if none was stored yet.
+
+    The TaskResult is looked up in the DJANGO_QSTASH_RESULT_BACKEND; it is
+    unsaved when the backend keeps results outside the database.
+    """
+    if get_task_result_model() is None:
+        raise ImproperlyConfigured(
+            "Django QStash Results not installed. Add `django_qstash.results` to "
+            "INSTALLED_APPS and run migrations to look up task results."
+        )
+    return get_result_backend().get(task_id)
+
+
+def wait_for_task_result(
+    task_id: str,
+    timeout: float | None = None,
+    interval: float = 0.1,
+    max_interval: float = 2.0,
+):
+    """
+    Wait until the message has a finished TaskResult and return it.
+
+    Polls the indexed task_id column, doubling the pause between queries up to
+    `max_interval` so many waiters do not hammer the database. With
+    DJANGO_QSTASH_RESULT_WAKEUP the pauses end early once the webhook stores
+    the result. Raises ResultTimeout after `timeout` seconds.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    wakeup = get_wakeup()
+    woken = False
+    with wakeup.listen(task_id) if wakeup is not None else nullcontext() as wait:
+        while True:
+            task_result = get_task_result(task_id)
+            if task_result is not None and task_result.status in READY_STATUSES:
+                return task_result
+            pause = interval
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise ResultTimeout(
+                        f"Result of task {task_id} was not ready after {timeout}s"
+                    )
+                pause = min(pause, remaining)
+            if wait is not None and not woken:
+                woken = wait(pause)
+            else:
+                # Only poll once a wake-up arrived without a finished result
+                time.sleep(pause)
+            interval = min(interval * 2, max_interval)
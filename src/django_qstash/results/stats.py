@@ -0,0 +1,338 @@
+from __future__ import annotations
+
+import logging
+import math
+import threading
+from datetime import datetime
+from typing import Any
+
+from django.apps import apps
+from django.db import close_old_connections
+from django.db import transaction
+from django.utils import timezone
+
+from django_qstash.background import ProcessSingleton
+from django_qstash.db.models import TaskStatus
+from django_qstash.settings import DJANGO_QSTASH_TASK_STATS
+from django_qstash.settings import DJANGO_QSTASH_TASK_STATS_FLUSH_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+# The TaskStats counter column of each finished status
+STATUS_COUNT_FIELDS = {
+    TaskStatus.SUCCESS: "success_count",
+    TaskStatus.CANCELED: "canceled_count",
+    TaskStatus.EXECUTION_ERROR: "execution_error_count",
+    TaskStatus.INTERNAL_ERROR: "internal_error_count",
+    TaskStatus.OTHER_ERROR: "other_error_count",
+    TaskStatus.UNKNOWN: "unknown_count",
+}
+
+
+class DurationSketch:
+    """
+    Mergeable quantile sketch of task durations (a DDSketch).
+
+    Durations are counted in logarithmic bins, so every quantile is within
+    `relative_accuracy` of the exact value. Two sketches merge by adding
+    their bin counts, which lets per-minute sketches roll up to any range.
+    """
+
+    relative_accuracy = 0.01
+    # Durations at or below this many seconds are counted as zero
+    min_value = 1e-6
+
+    def __init__(self, bins: dict[int, int] | None = None, zero_count: int = 0):
+        self.gamma = (1 + self.relative_accuracy) / (1 - self.relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.bins = dict(bins or {})
+        self.zero_count = zero_count
+
+    @property
+    def count(self) -> int:
+        return self.zero_count + sum(self.bins.values())
+
+    def add(self, value: float, count: int = 1) -> None:
+        if value <= self.min_value:
+            self.zero_count += count
+            return
+        key = math.ceil(math.log(value) / self.log_gamma)
+        self.bins[key] = self.bins.get(key, 0) + count
+
+    def merge(self, other: DurationSketch) -> None:
+        self.zero_count += other.zero_count
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+
+    def quantile(self, q: float) -> float | None:
+        """The duration below which a `q` fraction (0 to 1) of runs finished"""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                return 2 * self.gamma**key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.bins) / (self.gamma + 1)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "zero": self.zero_count,
+            "bins": {str(key): count for key, count in self.bins.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any] | None) -> DurationSketch:
+        data = data or {}
+        bins = {int(key): count for key, count in data.get("bins", {}).items()}
+        return cls(bins, data.get("zero", 0))
+
+
+class StatsRollup:
+    """
+    Execution counts and durations of a task, mergeable with TaskStats rows.
+
+    The accumulator collects one per task and minute; summarize_task_stats()
+    merges stored rows into one per task.
+    """
+
+    def __init__(self):
+        self.counts = dict.fromkeys(STATUS_COUNT_FIELDS.values(), 0)
+        self.total_count = 0
+        self.duration_count = 0
+        self.total_duration = 0.0
+        self.min_duration: float | None = None
+        self.max_duration: float | None = None
+        self.sketch = DurationSketch()
+
+    def add(self, status: str, duration: float | None = None) -> None:
+        field = STATUS_COUNT_FIELDS.get(status, "unknown_count")
+        self.counts[field] += 1
+        self.total_count += 1
+        if duration is not None:
+            self._add_durations(1, duration, duration, duration)
+            self.sketch.add(duration)
+
+    def _add_durations(self, count, total, minimum, maximum) -> None:
+        self.duration_count += count
+        self.total_duration += total
+        if minimum is not None and (
+            self.min_duration is None or minimum < self.min_duration
+        ):
+            self.min_duration = minimum
+        if maximum is not None and (
+            self.max_duration is None or maximum > self.max_duration
+        ):
+            self.max_duration = maximum
+
+    def merge_row(self, stats) -> None:
+        """Add the counts of a TaskStats row"""
+        for field in self.counts:
+            self.counts[field] += getattr(stats, field)
+        self.total_count += stats.total_count
+        self._add_durations(
+            stats.duration_count,
+            stats.total_duration,
+            stats.min_duration,
+            stats.max_duration,
+        )
+        self.sketch.merge(DurationSketch.from_dict(stats.duration_sketch))
+
+    def apply_to(self, stats) -> None:
+        """Add these counts to a TaskStats row"""
+        merged = StatsRollup()
+        merged.merge_row(stats)
+        merged.merge(self)
+        for field, count in merged.counts.items():
+            setattr(stats, field, count)
+        stats.total_count = merged.total_count
+        stats.duration_count = merged.duration_count
+        stats.total_duration = merged.total_duration
+        stats.min_duration = merged.min_duration
+        stats.max_duration = merged.max_duration
+        stats.duration_sketch = merged.sketch.to_dict()
+
+    def merge(self, other: StatsRollup) -> None:
+        for field, count in other.counts.items():
+            self.counts[field] += count
+        self.total_count += other.total_count
+        self._add_durations(
+            other.duration_count,
+            other.total_duration,
+            other.min_duration,
+            other.max_duration,
+        )
+        self.sketch.merge(other.sketch)
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            **self.counts,
+            "total_count": self.total_count,
+            "failure_count": self.total_count - self.counts["success_count"],
+            "avg_duration": (
+                self.total_duration / self.duration_count
+                if self.duration_count
+                else None
+            ),
+            "min_duration": self.min_duration,
+            "max_duration": self.max_duration,
+            "p50_duration": self.sketch.quantile(0.5),
+            "p95_duration": self.sketch.quantile(0.95),
+        }
+
+
+def get_bucket(value: datetime) -> datetime:
+    """The minute a TaskStats row covers"""
+    return value.replace(second=0, microsecond=0)
+
+
+class StatsAccumulator:
+    """
+    Aggregate task executions in-process and merge them into TaskStats.
+
+    A daemon thread writes the rollups every `flush_interval` seconds: one
+    INSERT ... ON CONFLICT DO NOTHING for the missing rows, then one locked
+    read-modify-write per task and minute, so the webhook never touches the
+    stats table. Rollups still held at exit are written by an
+    atexit hook; a process that is killed loses them.
+    """
+
+    def __init__(self, flush_interval: float = DJANGO_QSTASH_TASK_STATS_FLUSH_INTERVAL):
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._rollups: dict[tuple[str, datetime], StatsRollup] = {}
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="django-qstash-task-stats", daemon=True
+            )
+            self._thread.start()
+
+    def add(
+        self,
+        task_name: str,
+        status: str,
+        duration: float | None = None,
+        finished_at: datetime | None = None,
+    ) -> None:
+        """Count a finished execution of a task"""
+        bucket = get_bucket(finished_at or timezone.now())
+        if not self._closed:
+            self._ensure_started()
+        with self._lock:
+            rollup = self._rollups.setdefault((task_name, bucket), StatsRollup())
+            rollup.add(status, duration)
+        if self._closed:
+            self.flush()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.flush_interval):
+            close_old_connections()
+            self.flush()
+
+    def flush(self) -> int:
+        """Write every held rollup now and return how many rows were updated."""
+        with self._lock:
+            rollups, self._rollups = self._rollups, {}
+        if rollups:
+            self._write(rollups)
+        return len(rollups)
+
+    def _write(self, rollups: dict[tuple[str, datetime], StatsRollup]) -> None:
+        try:
+            TaskStats = apps.get_model("django_qstash_results", "TaskStats")
+        except LookupError:
+            logger.debug("Django QStash Results not installed, dropping task stats")
+            return
+        try:
+            # Insert the missing rows up front, so a row another process
+            # inserted first is merged into instead of failing with an
+            # IntegrityError on the unique (task_name, bucket)
+            TaskStats.objects.bulk_create(
+                [
+                    TaskStats(task_name=task_name, bucket=bucket)
+                    for task_name, bucket in rollups
+                ],
+                ignore_conflicts=True,
+            )
+        except Exception:
+            logger.exception("Failed to store task stats of %s tasks", len(rollups))
+            return
+        for (task_name, bucket), rollup in rollups.items():
+            try:
+                with transaction.atomic():
+                    stats = TaskStats.objects.select_for_update().get(
+                        task_name=task_name, bucket=bucket
+                    )
+                    rollup.apply_to(stats)
+                    stats.save()
+            except Exception:
+                logger.exception("Failed to store task stats of %s", task_name)
+
+    def shutdown(self, timeout: float | None = None) -> None:
+        """Stop the flush thread and write what is held."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        self._stopped.set()
+        if thread is not None:
+            thread.join(timeout)
+        self.flush()
+
+
+_accumulator = ProcessSingleton(
+    StatsAccumulator,
+    shutdown_timeout=DJANGO_QSTASH_TASK_STATS_FLUSH_INTERVAL * 2,
+)
+
+
+def get_stats_accumulator() -> StatsAccumulator:
+    """Get the process-wide stats accumulator, creating it on first use."""
+    return _accumulator.get()
+
+
+def shutdown_stats_accumulator() -> None:
+    """Write the held stats and stop the accumulator (also run at exit)."""
+    _accumulator.shutdown()
+
+
+def record_task_stats(
+    task_name: str, status: str, started_at: datetime | None = None
+) -> None:
+    """Count a webhook execution in TaskStats if DJANGO_QSTASH_TASK_STATS is set"""
+    if not DJANGO_QSTASH_TASK_STATS:
+        return
+    finished_at = timezone.now()
+    duration = None
+    if started_at is not None:
+        duration = (finished_at - started_at).total_seconds()
+    get_stats_accumulator().add(task_name, status, duration, finished_at)
+
+
+def summarize_task_stats(queryset) -> dict[str, dict[str, Any]]:
+    """
+    Merge TaskStats rows (e.g. the last hour's) into one summary per task.
+
+    Each summary holds the status counts, `failure_count`, and the average,
+    min, max, p50 and p95 duration in seconds.
+    """
+    rollups: dict[str, StatsRollup] = {}
+    for stats in queryset:
+        rollups.setdefault(stats.task_name, StatsRollup()).merge_row(stats)
+    return {task_name: rollup.summary() for task_name, rollup in rollups.items()}
@@ -1,24 +1,91 @@
 from __future__ import annotations
 
 import logging
+import time
 from datetime import timedelta
 
 from django.apps import apps
-from django.conf import settings
+from django.db.models import QuerySet
 from django.utils import timezone
 
 from django_qstash import stashed_task
 from django_qstash.db.models import TaskStatus
-
-DJANGO_QSTASH_RESULT_TTL = getattr(settings, "DJANGO_QSTASH_RESULT_TTL", 604800)
+from django_qstash.results.partitions import ResultPartitions
+from django_qstash.settings import DJANGO_QSTASH_RESULT_PARTITIONING
+from django_qstash.settings import DJANGO_QSTASH_RESULT_TTL
 
 logger = logging.getLogger(__name__)
 
+ERROR_STATUSES = [
+    TaskStatus.EXECUTION_ERROR,
+    TaskStatus.INTERNAL_ERROR,
+    TaskStatus.OTHER_ERROR,
+]
+
+
+def delete_in_batches(
+    querysets, batch_size, sleep=0, max_runtime=None, stdout=None
+) -> tuple[int, bool]:
+    """
+    Delete the rows of one or more querysets in primary-key batches of
+    `batch_size`.
+
+    Each batch reads the oldest primary keys in index order (the queryset's
+    ordering, `date_done` when it has none) and deletes them by primary key,
+    so no statement holds locks for long. Django deletes a batch with a
+    single DELETE unless delete signal receivers are connected, in which case
+    only that batch is collected for them.
+
+    Sleeps `sleep` seconds between batches and stops once `max_runtime`
+    seconds have passed. Returns the number of deleted rows and whether every
+    queryset was emptied.
+    """
+    if isinstance(querysets, QuerySet):
+        querysets = [querysets]
+    deadline = None if max_runtime is None else time.monotonic() + max_runtime
+    deleted = 0
+    for queryset in querysets:
+        if not queryset.query.order_by:
+            queryset = queryset.order_by("date_done")
+        while True:
+            pks = list(queryset.values_list("pk", flat=True)[:batch_size])
+            if not pks:
+                break
+            count, _ = queryset.model._base_manager.filter(pk__in=pks).delete()
+            deleted += count
+            msg = f"Deleted {deleted} stale results so far"
+            if stdout is not None:
+                stdout.write(msg)
+            else:
+                logger.info(msg)
+            if deadline is not None and time.monotonic() >= deadline:
+                return deleted, False
+            if sleep:
+                time.sleep(sleep)
+    return deleted, True
+
 
 @stashed_task(name="Cleanup Task Results")
 def clear_stale_results_task(
-    since=None, stdout=None, user_confirm=False, exclude_errors=True, *args, **options
+    since=None,
+    stdout=None,
+    user_confirm=False,
+    exclude_errors=True,
+    batch_size=None,
+    sleep=0,
+    max_runtime=None,
+    *args,
+    **options,
 ):
+    """
+    Delete task results past their `expires_at` (set by the task's
+    result_expires), and results without one that are older than `since`
+    seconds (DJANGO_QSTASH_RESULT_TTL).
+
+    With `batch_size`, rows are deleted in batches (see delete_in_batches)
+    instead of with one large DELETE. A partitioned table (see
+    django_qstash.results.partitions) drops whole stale partitions instead.
+    """
     delta_seconds = since or DJANGO_QSTASH_RESULT_TTL
     cutoff_date = timezone.now() - timedelta(seconds=delta_seconds)
     TaskResult = None
@@ -30,15 +97,14 @@ def clear_stale_results_task(
             stdout.write(msg)
         logger.exception(msg)
         raise e
-    qs_to_delete = TaskResult.objects.filter(date_done__lt=cutoff_date)
+    # Both read an index range: expires_at, and (date_done, status)
+    expired = TaskResult.objects.filter(expires_at__lt=timezone.now())
+    stale = TaskResult.objects.filter(
+        expires_at__isnull=True, date_done__lt=cutoff_date
+    )
     if exclude_errors:
-        qs_to_delete = qs_to_delete.exclude(
-            status__in=[
-                TaskStatus.EXECUTION_ERROR,
-                TaskStatus.INTERNAL_ERROR,
-                TaskStatus.OTHER_ERROR,
-            ]
-        )
+        expired = expired.exclude(status__in=ERROR_STATUSES)
+        stale = stale.exclude(status__in=ERROR_STATUSES)
 
     if user_confirm:
         user_input = input("Are you sure? (Y/n): ")
@@ -49,20 +115,63 @@ def clear_stale_results_task(
             logger.info(msg)
             return
 
-    if not qs_to_delete.exists():
+    if DJANGO_QSTASH_RESULT_PARTITIONING:
+        partitions = ResultPartitions()
+        if partitions.is_partitioned():
+            kept = ERROR_STATUSES if exclude_errors else None
+            dropped, deleted_count = partitions.drop_partitions(
+                cutoff_date, keep_statuses=kept, keep_until=timezone.now()
+            )
+            deleted_count += partitions.delete_from_default(
+                cutoff_date, exclude_statuses=kept
+            )
+            deleted_count += expired.delete()[0]
+            msg = f"Dropped {len(dropped)} stale result partitions and deleted {deleted_count} stale results."
+            if stdout is not None:
+                stdout.write(msg)
+            else:
+                logger.info(msg)
+            return
+
+    if batch_size:
+        try:
+            deleted_count, finished = delete_in_batches(
+                [expired.order_by("expires_at"), stale],
+                batch_size,
+                sleep,
+                max_runtime,
+                stdout,
+            )
+        except Exception as e:
+            msg = f"Error deleting stale results: {e}"
+            if stdout is not None:
+                stdout.write(msg)
+            logger.exception(msg)
+            raise e
+        if finished:
+            msg = f"Successfully deleted {deleted_count} stale results."
+        else:
+            msg = f"Deleted {deleted_count} stale results before reaching the maximum runtime of {max_runtime} seconds."
+        if stdout is not None:
+            stdout.write(msg)
+        else:
+            logger.info(msg)
+        return
+
+    if not expired.exists() and not stale.exists():
         msg = "No stale Django QStash task results found"
         if stdout is not None:
             stdout.write(msg)
         else:
             logger.info(msg)
         return
-    delete_msg = f"Deleting {qs_to_delete.count()} task results older than {cutoff_date} ({DJANGO_QSTASH_RESULT_TTL} seconds)"
+    delete_msg = f"Deleting {expired.count() + stale.count()} expired task results and results older than {cutoff_date} ({delta_seconds} seconds)"
     if stdout is not None:
         stdout.write(delete_msg)
     else:
         logger.info(delete_msg)
     try:
-        deleted_count, _ = qs_to_delete.delete()
+        deleted_count = expired.delete()[0] + stale.delete()[0]
         msg = f"Successfully deleted {deleted_count} stale results."
         if stdout is not None:
             stdout.write(msg)
@@ -78,8 +187,21 @@ def clear_stale_results_task(
 
 @stashed_task(name="Clear Task Error Results")
 def clear_task_errors_task(
-    since=None, stdout=None, user_confirm=False, *args, **options
+    since=None,
+    stdout=None,
+    user_confirm=False,
+    batch_size=None,
+    sleep=0,
+    max_runtime=None,
+    *args,
+    **options,
 ):
     clear_stale_results_task(
-        since=since, stdout=stdout, user_confirm=user_confirm, exclude_errors=False
+        since=since,
+        stdout=stdout,
+        user_confirm=user_confirm,
+        exclude_errors=False,
+        batch_size=batch_size,
+        sleep=sleep,
+        max_runtime=max_runtime,
     )
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import inspect
+import logging
+import os
+import select
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+
+from asgiref.sync import sync_to_async
+from django.apps import apps
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+from django.db import router
+
+from django_qstash.settings import DJANGO_QSTASH_RESULT_WAKEUP
+from django_qstash.settings import DJANGO_QSTASH_RESULT_WAKEUP_CACHE
+
+logger = logging.getLogger(__name__)
+
+# A wait(timeout) callable that returns True once the task result was stored
+Waiter = Callable[[float], bool]
+
+
+class BaseWakeup:
+    """
+    Wakes AsyncResult.get() callers up when the webhook stores their result.
+
+    Waiters still poll the database with exponential backoff, so a missed
+    wake-up only delays a result instead of losing it.
+    """
+
+    def notify(self, task_ids: Iterable[str]) -> None:
+        raise NotImplementedError
+
+    @contextmanager
+    def listen(self, task_id: str) -> Iterator[Waiter]:
+        raise NotImplementedError
+        yield
+
+
+class CacheWakeup(BaseWakeup):
+    """
+    Wake-ups through a marker key per task in a shared cache.
+
+    Waiters check the cache key instead of the database between their
+    backed-off database polls. The checks back off too, from `poll_interval`
+    up to `max_poll_interval` seconds, so a long wait costs about one cache
+    read per second. Use a cache shared by every process (e.g. Redis); with
+    a per-process cache this only falls back to polling.
+    """
+
+    key_prefix = "django_qstash:result-ready"
+    poll_interval = 0.05
+    max_poll_interval = 1.0
+    timeout = 3600
+
+    def __init__(self, alias: str = DJANGO_QSTASH_RESULT_WAKEUP_CACHE):
+        self.alias = alias
+
+    def get_key(self, task_id: str) -> str:
+        return f"{self.key_prefix}:{task_id}"
+
+    def notify(self, task_ids: Iterable[str]) -> None:
+        keys = {self.get_key(task_id): 1 for task_id in task_ids}
+        if keys:
+            caches[self.alias].set_many(keys, self.timeout)
+
+    @contextmanager
+    def listen(self, task_id: str) -> Iterator[Waiter]:
+        cache = caches[self.alias]
+        key = self.get_key(task_id)
+        pause = self.poll_interval
+
+        def wait(timeout: float) -> bool:
+            nonlocal pause
+            deadline = time.monotonic() + timeout
+            while True:
+                if cache.get(key) is not None:
+                    return True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                time.sleep(min(pause, remaining))
+                pause = min(pause * 2, self.max_poll_interval)
+
+        yield wait
+
+
+class PostgresWakeup(BaseWakeup):
+    """
+    Wake-ups with PostgreSQL LISTEN/NOTIFY.
+
+    Each thread keeps one connection that LISTENs on the channel and reuses
+    it for every wait, so waiters block in the database driver instead of
+    polling, without opening a connection per AsyncResult.get(). Requires
+    psycopg 3.2 or later, or psycopg2.
+    """
+
+    channel = "django_qstash_results"
+    # Listening connections by (alias, pid); a forked child opens its own
+    _local = threading.local()
+
+    def get_alias(self) -> str:
+        TaskResult = apps.get_model("django_qstash_results", "TaskResult")
+        return router.db_for_write(TaskResult)
+
+    def notify(self, task_ids: Iterable[str]) -> None:
+        task_ids = list(task_ids)
+        if not task_ids:
+            return
+        with connections[self.get_alias()].cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_notify(%s, task_id) FROM unnest(%s::text[]) AS task_id",
+                [self.channel, task_ids],
+            )
+
+    def get_connection(self):
+        """This thread's connection listening on the channel"""
+        alias = self.get_alias()
+        listeners = self._local.__dict__.setdefault("listeners", {})
+        key = (alias, os.getpid())
+        connection = listeners.get(key)
+        if connection is not None:
+            return connection
+        connection = connections.create_connection(alias)
+        if connection.vendor != "postgresql":
+            raise ImproperlyConfigured(
+                'DJANGO_QSTASH_RESULT_WAKEUP = "postgres" requires a PostgreSQL database'
+            )
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {self.channel}")
+            _check_driver(connection.connection)
+        except Exception:
+            connection.close()
+            raise
+        listeners[key] = connection
+        return connection
+
+    def close_connection(self) -> None:
+        """Close this thread's listening connection, e.g. after it broke"""
+        listeners = self._local.__dict__.get("listeners", {})
+        connection = listeners.pop((self.get_alias(), os.getpid()), None)
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+    @contextmanager
+    def listen(self, task_id: str) -> Iterator[Waiter]:
+        raw = self.get_connection().connection
+        lost = False
+
+        def wait(timeout: float) -> bool:
+            nonlocal lost
+            deadline = time.monotonic() + timeout
+            if not lost:
+                try:
+                    while (remaining := deadline - time.monotonic()) > 0:
+                        if task_id in _read_notifies(raw, remaining):
+                            return True
+                    return False
+                except Exception:
+                    # Waiters fall back to polling; the next get() reconnects
+                    logger.exception("Lost the task result wake-up connection")
+                    self.close_connection()
+                    lost = True
+            time.sleep(max(deadline - time.monotonic(), 0))
+            return False
+
+        yield wait
+
+
+def _check_driver(raw) -> None:
+    """Fail loudly on drivers whose notifies() cannot time out"""
+    notifies = getattr(raw, "notifies", None)
+    if callable(notifies) and "timeout" not in inspect.signature(notifies).parameters:
+        raise ImproperlyConfigured(
+            'DJANGO_QSTASH_RESULT_WAKEUP = "postgres" requires psycopg 3.2 or '
+            "later, or psycopg2"
+        )
+
+
+def _read_notifies(raw, timeout: float) -> list[str]:
+    """Block up to `timeout` seconds and return the received payloads"""
+    if hasattr(raw, "notifies") and callable(raw.notifies):
+        # psycopg 3
+        return [
+            notify.payload for notify in raw.notifies(timeout=timeout, stop_after=1)
+        ]
+    # psycopg2
+    if select.select([raw], [], [], timeout) != ([], [], []):
+        raw.poll()
+    payloads = [notify.payload for notify in raw.notifies]
+    raw.notifies.clear()
+    return payloads
+
+
+WAKEUPS = {
+    "cache": CacheWakeup,
+    "postgres": PostgresWakeup,
+}
+
+
+def get_wakeup() -> BaseWakeup | None:
+    """The configured DJANGO_QSTASH_RESULT_WAKEUP, or None to only poll"""
+    if DJANGO_QSTASH_RESULT_WAKEUP is None:
+        return None
+    try:
+        return WAKEUPS[DJANGO_QSTASH_RESULT_WAKEUP]()
+    except KeyError:
+        raise ImproperlyConfigured(
+            f"Invalid DJANGO_QSTASH_RESULT_WAKEUP {DJANGO_QSTASH_RESULT_WAKEUP!r}. "
+            f"Use one of: {', '.join(WAKEUPS)}"
+        )
+
+
+def notify_results(task_ids: Iterable[str | None]) -> None:
+    """Wake up the callers waiting on these task results, if configured"""
+    wakeup = get_wakeup()
+    if wakeup is None:
+        return
+    try:
+        wakeup.notify({task_id for task_id in task_ids if task_id})
+    except Exception:
+        # Waiters fall back to polling
+        logger.exception("Failed to send task result wake-ups")
+
+
+async def anotify_results(task_ids: Iterable[str | None]) -> None:
+    """Async counterpart of notify_results()"""
+    if get_wakeup() is not None:
+        await sync_to_async(notify_results)(list(task_ids))
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Any
+
+from django.apps import apps
+from django.db import close_old_connections
+
+from django_qstash.background import ProcessSingleton
+from django_qstash.db.models import TaskStatus
+from django_qstash.results.wakeup import notify_results
+from django_qstash.settings import DJANGO_QSTASH_RESULT_BUFFER_SIZE
+from django_qstash.settings import DJANGO_QSTASH_RESULT_FLUSH_INTERVAL
+from django_qstash.settings import DJANGO_QSTASH_TRACK_PENDING
+
+logger = logging.getLogger(__name__)
+
+
+class ResultWriter:
+    """
+    Buffer TaskResult rows in-process and write them with bulk_create.
+
+    A daemon thread writes the buffer every `flush_interval` seconds, or as
+    soon as it holds `buffer_size` rows, so the webhook never waits on the
+    INSERT. Rows still buffered at exit are written by an atexit hook; a
+    process that is killed loses them.
+    """
+
+    def __init__(
+        self,
+        buffer_size: int = DJANGO_QSTASH_RESULT_BUFFER_SIZE,
+        flush_interval: float = DJANGO_QSTASH_RESULT_FLUSH_INTERVAL,
+    ):
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._buffer: list[dict[str, Any]] = []
+        self._wakeup = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="django-qstash-result-writer", daemon=True
+            )
+            self._thread.start()
+
+    def add(self, fields: dict[str, Any]) -> None:
+        """Queue the TaskResult fields from task_result_fields()."""
+        if self._closed:
+            self._write([fields])
+            return
+        self._ensure_started()
+        with self._lock:
+            self._buffer.append(fields)
+            full = len(self._buffer) >= self.buffer_size
+        if full:
+            self._wakeup.set()
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            close_old_connections()
+            self.flush()
+
+    def flush(self) -> int:
+        """Write every buffered row now and return how many were written."""
+        with self._lock:
+            records, self._buffer = self._buffer, []
+        if records:
+            self._write(records)
+        return len(records)
+
+    def _write(self, records: list[dict[str, Any]]) -> None:
+        TaskResult = apps.get_model("django_qstash_results", "TaskResult")
+        try:
+            TaskResult.objects.bulk_create(
+                [TaskResult(**fields) for fields in records],
+                batch_size=self.buffer_size,
+            )
+        except Exception:
+            logger.exception("Failed to store %s buffered task results", len(records))
+            return
+        if DJANGO_QSTASH_TRACK_PENDING:
+            # PENDING rows a slow publisher inserted after the results were buffered
+            TaskResult.objects.filter(
+                task_id__in={fields["task_id"] for fields in records},
+                status=TaskStatus.PENDING,
+            ).delete()
+        notify_results(fields["task_id"] for fields in records)
+
+    def shutdown(self, timeout: float | None = None) -> None:
+        """Stop the writer thread and write what is buffered."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        self._wakeup.set()
+        if thread is not None:
+            thread.join(timeout)
+        self.flush()
+
+
+_writer = ProcessSingleton(
+    ResultWriter, shutdown_timeout=DJANGO_QSTASH_RESULT_FLUSH_INTERVAL * 2
+)
+
+
+def get_result_writer() -> ResultWriter:
+    """Get the process-wide result writer, creating it on first use."""
+    return _writer.get()
+
+
+def shutdown_result_writer() -> None:
+    """Write the buffered results and stop the writer (also run at exit)."""
+    _writer.shutdown()
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-import json
 from typing import Any
 
 from django_qstash.callbacks import get_callback_url
+from django_qstash.compression import compress_body
 from django_qstash.schedules.models import TaskSchedule
+from django_qstash.serializers import get_serializer
 
 
 def prepare_qstash_payload(instance: TaskSchedule) -> dict[str, Any]:
@@ -23,11 +24,13 @@ def prepare_qstash_payload(instance: TaskSchedule) -> dict[str, Any]:
 
 
 def format_task_schedule_for_qstash(instance: TaskSchedule) -> dict[str, Any]:
-    payload = prepare_qstash_payload(instance)
+    # Schedules are always published as JSON
+    serializer = get_serializer("json")
+    payload = compress_body(prepare_qstash_payload(instance), serializer)
     callback_url = get_callback_url()
     data = {
         "destination": callback_url,
-        "body": json.dumps(payload),
+        "body": serializer.dumps(payload),
         "cron": instance.cron,
         "retries": instance.retries,
         "timeout": instance.timeout,
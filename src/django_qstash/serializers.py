@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import base64
+import datetime
+import decimal
+import json
+import uuid
+from typing import Any
+
+from django.core.exceptions import ImproperlyConfigured
+
+from django_qstash.settings import DJANGO_QSTASH_SERIALIZER
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+
+class Serializer:
+    """
+    Encodes task envelopes for QStash and decodes them in the webhook.
+
+    `content_type` is sent with every message so the webhook can pick the
+    matching serializer for each delivery.
+    """
+
+    name: str
+    label: str
+    content_type: str
+    # Bodies are passed to the SDK's publish_json/batch_json as-is
+    sdk_json: bool = False
+
+    def dumps(self, data: Any) -> str:
+        raise NotImplementedError
+
+    def loads(self, data: str | bytes) -> Any:
+        raise NotImplementedError
+
+    def encode_message(self, message: dict[str, Any]) -> dict[str, Any]:
+        """Convert publish_json/batch_json arguments to publish/batch arguments"""
+        return {
+            **message,
+            "body": self.dumps(message["body"]),
+            "content_type": self.content_type,
+        }
+
+
+class JSONSerializer(Serializer):
+    name = "json"
+    label = "JSON"
+    content_type = "application/json"
+    sdk_json = True
+
+    def dumps(self, data: Any) -> str:
+        return json.dumps(data)
+
+    def loads(self, data: str | bytes) -> Any:
+        return json.loads(data)
+
+
+def _orjson_default(value: Any) -> Any:
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class OrjsonSerializer(Serializer):
+    """
+    JSON encoded with orjson. Datetimes and UUIDs are encoded natively and
+    Decimals as strings; they arrive in the task as strings.
+    """
+
+    name = "orjson"
+    label = "JSON"
+    content_type = "application/json"
+
+    def __init__(self):
+        if orjson is None:
+            raise ImproperlyConfigured(
+                "The orjson serializer requires orjson. Install it with `pip install orjson`."
+            )
+
+    def dumps(self, data: Any) -> str:
+        return orjson.dumps(data, default=_orjson_default).decode()
+
+    def loads(self, data: str | bytes) -> Any:
+        return orjson.loads(data)
+
+
+MSGPACK_EXT_DATETIME = 1
+MSGPACK_EXT_DATE = 2
+MSGPACK_EXT_TIME = 3
+MSGPACK_EXT_UUID = 4
+MSGPACK_EXT_DECIMAL = 5
+
+
+def _msgpack_default(value: Any) -> Any:
+    if isinstance(value, datetime.datetime):
+        return msgpack.ExtType(MSGPACK_EXT_DATETIME, value.isoformat().encode())
+    if isinstance(value, datetime.date):
+        return msgpack.ExtType(MSGPACK_EXT_DATE, value.isoformat().encode())
+    if isinstance(value, datetime.time):
+        return msgpack.ExtType(MSGPACK_EXT_TIME, value.isoformat().encode())
+    if isinstance(value, uuid.UUID):
+        return msgpack.ExtType(MSGPACK_EXT_UUID, value.bytes)
+    if isinstance(value, decimal.Decimal):
+        return msgpack.ExtType(MSGPACK_EXT_DECIMAL, str(value).encode())
+    raise TypeError(f"Type is not msgpack serializable: {type(value).__name__}")
+
+
+def _msgpack_ext_hook(code: int, data: bytes) -> Any:
+    if code == MSGPACK_EXT_DATETIME:
+        return datetime.datetime.fromisoformat(data.decode())
+    if code == MSGPACK_EXT_DATE:
+        return datetime.date.fromisoformat(data.decode())
+    if code == MSGPACK_EXT_TIME:
+        return datetime.time.fromisoformat(data.decode())
+    if code == MSGPACK_EXT_UUID:
+        return uuid.UUID(bytes=data)
+    if code == MSGPACK_EXT_DECIMAL:
+        return decimal.Decimal(data.decode())
+    return msgpack.ExtType(code, data)
+
+
+class MsgpackSerializer(Serializer):
+    """
+    msgpack wrapped in base64 (QStash message bodies are text). Datetimes,
+    dates, times, UUIDs and Decimals round-trip to the same Python types.
+    """
+
+    name = "msgpack"
+    label = "msgpack"
+    content_type = "application/x-msgpack+base64"
+
+    def __init__(self):
+        if msgpack is None:
+            raise ImproperlyConfigured(
+                "The msgpack serializer requires msgpack. Install it with `pip install msgpack`."
+            )
+
+    def dumps(self, data: Any) -> str:
+        packed = msgpack.packb(data, default=_msgpack_default)
+        return base64.b64encode(packed).decode("ascii")
+
+    def loads(self, data: str | bytes) -> Any:
+        return msgpack.unpackb(base64.b64decode(data), ext_hook=_msgpack_ext_hook)
+
+
+SERIALIZERS: dict[str, type[Serializer]] = {
+    "json": JSONSerializer,
+    "orjson": OrjsonSerializer,
+    "msgpack": MsgpackSerializer,
+}
+
+_instances: dict[str, Serializer] = {}
+
+
+def get_serializer(name: str | None = None) -> Serializer:
+    """Get a serializer by name, defaulting to DJANGO_QSTASH_SERIALIZER."""
+    name = name or DJANGO_QSTASH_SERIALIZER
+    serializer = _instances.get(name)
+    if serializer is None:
+        try:
+            serializer_class = SERIALIZERS[name]
+        except KeyError:
+            raise ImproperlyConfigured(
+                f"Unknown DJANGO_QSTASH_SERIALIZER {name!r}. "
+                f"Use one of: {', '.join(SERIALIZERS)}"
+            )
+        serializer = _instances[name] = serializer_class()
+    return serializer
+
+
+def get_serializer_for_content_type(content_type: str | None) -> Serializer:
+    """
+    Get the serializer for a webhook delivery's Content-Type header.
+
+    JSON deliveries are decoded with the configured serializer when it produces
+    JSON (e.g. orjson), otherwise with the standard library.
+    """
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    # Messages published without a content type (e.g. schedules) are JSON
+    content_type = content_type or JSONSerializer.content_type
+    configured = get_serializer()
+    if content_type == configured.content_type:
+        return configured
+    for name, serializer_class in SERIALIZERS.items():
+        if serializer_class.content_type == content_type:
+            return get_serializer(name)
+    return get_serializer("json")
+
+
+def publish_message(message_api: Any, message: dict[str, Any]) -> Any:
+    """Publish publish_json-style arguments with the configured serializer."""
+    serializer = get_serializer()
+    if serializer.sdk_json:
+        return message_api.publish_json(**message)
+    return message_api.publish(**serializer.encode_message(message))
+
+
+def batch_messages(message_api: Any, messages: list[dict[str, Any]]) -> list[Any]:
+    """Publish batch_json-style messages with the configured serializer."""
+    serializer = get_serializer()
+    if serializer.sdk_json:
+        return message_api.batch_json(messages)
+    return message_api.batch([serializer.encode_message(m) for m in messages])
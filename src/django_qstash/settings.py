@@ -9,6 +9,122 @@ DJANGO_QSTASH_DOMAIN = getattr(settings, "DJANGO_QSTASH_DOMAIN", None)
 DJANGO_QSTASH_WEBHOOK_PATH = getattr(
     settings, "DJANGO_QSTASH_WEBHOOK_PATH", "/qstash/webhook/"
 )
+# Maximum number of messages sent in a single QStash batch request
+DJANGO_QSTASH_BATCH_SIZE = getattr(settings, "DJANGO_QSTASH_BATCH_SIZE", 100)
+# "immediate" publishes on delay(), "outbox" writes to django_qstash.outbox first,
+# "background" hands messages to an in-process publisher thread pool
+DJANGO_QSTASH_PUBLISH_MODE = getattr(
+    settings, "DJANGO_QSTASH_PUBLISH_MODE", "immediate"
+)
+DJANGO_QSTASH_OUTBOX_FLUSH_ON_COMMIT = getattr(
+    settings, "DJANGO_QSTASH_OUTBOX_FLUSH_ON_COMMIT", True
+)
+# Seconds an outbox flusher keeps its claim on a batch while publishing it
+DJANGO_QSTASH_OUTBOX_CLAIM_TIMEOUT = getattr(
+    settings, "DJANGO_QSTASH_OUTBOX_CLAIM_TIMEOUT", 60
+)
+DJANGO_QSTASH_BACKGROUND_QUEUE_SIZE = getattr(
+    settings, "DJANGO_QSTASH_BACKGROUND_QUEUE_SIZE", 10000
+)
+DJANGO_QSTASH_BACKGROUND_WORKERS = getattr(
+    settings, "DJANGO_QSTASH_BACKGROUND_WORKERS", 2
+)
+# What to do when the background queue is full: "block", "drop" or "raise"
+DJANGO_QSTASH_BACKGROUND_FULL_POLICY = getattr(
+    settings, "DJANGO_QSTASH_BACKGROUND_FULL_POLICY", "block"
+)
+DJANGO_QSTASH_BACKGROUND_SHUTDOWN_TIMEOUT = getattr(
+    settings, "DJANGO_QSTASH_BACKGROUND_SHUTDOWN_TIMEOUT", 10
+)
+# Encoding for task messages: "json", "orjson" or "msgpack"
+DJANGO_QSTASH_SERIALIZER = getattr(settings, "DJANGO_QSTASH_SERIALIZER", "json")
+# Threads running sync tasks for the async (ASGI) webhook view
+DJANGO_QSTASH_SYNC_TASK_WORKERS = getattr(
+    settings, "DJANGO_QSTASH_SYNC_TASK_WORKERS", 10
+)
+# Cache alias, result TTL and stale-claim timeout for idempotent tasks
+DJANGO_QSTASH_IDEMPOTENCY_CACHE = getattr(
+    settings, "DJANGO_QSTASH_IDEMPOTENCY_CACHE", "default"
+)
+DJANGO_QSTASH_IDEMPOTENCY_TTL = getattr(
+    settings, "DJANGO_QSTASH_IDEMPOTENCY_TTL", 86400
+)
+DJANGO_QSTASH_IDEMPOTENCY_CLAIM_TIMEOUT = getattr(
+    settings, "DJANGO_QSTASH_IDEMPOTENCY_CLAIM_TIMEOUT", 900
+)
+# Webhook concurrency limits shared through the cache; None disables the
+# global limit. Rejected deliveries get a 429 with this Retry-After.
+DJANGO_QSTASH_MAX_CONCURRENCY = getattr(settings, "DJANGO_QSTASH_MAX_CONCURRENCY", None)
+DJANGO_QSTASH_CONCURRENCY_CACHE = getattr(
+    settings, "DJANGO_QSTASH_CONCURRENCY_CACHE", "default"
+)
+DJANGO_QSTASH_CONCURRENCY_LEASE = getattr(
+    settings, "DJANGO_QSTASH_CONCURRENCY_LEASE", 900
+)
+DJANGO_QSTASH_CONCURRENCY_RETRY_AFTER = getattr(
+    settings, "DJANGO_QSTASH_CONCURRENCY_RETRY_AFTER", 10
+)
+# Compress message bodies of at least DJANGO_QSTASH_COMPRESSION_THRESHOLD bytes
+# with "gzip" or "zstd"; None disables compression
+DJANGO_QSTASH_COMPRESSION = getattr(settings, "DJANGO_QSTASH_COMPRESSION", None)
+DJANGO_QSTASH_COMPRESSION_THRESHOLD = getattr(
+    settings, "DJANGO_QSTASH_COMPRESSION_THRESHOLD", 8 * 1024
+)
+# Task arguments larger than this many bytes are stored by django_qstash.claimcheck
+# (None, the default, never offloads and never measures the arguments)
+DJANGO_QSTASH_CLAIM_CHECK_THRESHOLD = getattr(
+    settings, "DJANGO_QSTASH_CLAIM_CHECK_THRESHOLD", None
+)
+DJANGO_QSTASH_CLAIM_CHECK_TTL = getattr(
+    settings, "DJANGO_QSTASH_CLAIM_CHECK_TTL", 604800
+)
+DJANGO_QSTASH_CLAIM_CHECK_BACKEND = getattr(
+    settings,
+    "DJANGO_QSTASH_CLAIM_CHECK_BACKEND",
+    "django_qstash.claimcheck.backends.DatabaseBackend",
+)
+# Seconds after which task results without a per-task result_expires are stale
+DJANGO_QSTASH_RESULT_TTL = getattr(settings, "DJANGO_QSTASH_RESULT_TTL", 604800)
+# "immediate" stores each task result as the webhook finishes; "buffered" queues
+# successful results in-process and writes them with bulk_create
+DJANGO_QSTASH_RESULT_WRITE_MODE = getattr(
+    settings, "DJANGO_QSTASH_RESULT_WRITE_MODE", "immediate"
+)
+DJANGO_QSTASH_RESULT_BUFFER_SIZE = getattr(
+    settings, "DJANGO_QSTASH_RESULT_BUFFER_SIZE", 500
+)
+DJANGO_QSTASH_RESULT_FLUSH_INTERVAL = getattr(
+    settings, "DJANGO_QSTASH_RESULT_FLUSH_INTERVAL", 1.0
+)
+# Insert PENDING task results when messages are published
+DJANGO_QSTASH_TRACK_PENDING = getattr(settings, "DJANGO_QSTASH_TRACK_PENDING", False)
+# How the webhook wakes up AsyncResult.get() callers: None (polling only),
+# "cache" or "postgres" (LISTEN/NOTIFY)
+DJANGO_QSTASH_RESULT_WAKEUP = getattr(settings, "DJANGO_QSTASH_RESULT_WAKEUP", None)
+DJANGO_QSTASH_RESULT_WAKEUP_CACHE = getattr(
+    settings, "DJANGO_QSTASH_RESULT_WAKEUP_CACHE", "default"
+)
+# Where task results are stored: a dotted path to a result backend class
+DJANGO_QSTASH_RESULT_BACKEND = getattr(
+    settings,
+    "DJANGO_QSTASH_RESULT_BACKEND",
+    "django_qstash.results.backends.DatabaseBackend",
+)
+# Cache alias and timeout for the cache result backends
+DJANGO_QSTASH_RESULT_CACHE = getattr(settings, "DJANGO_QSTASH_RESULT_CACHE", "default")
+DJANGO_QSTASH_RESULT_CACHE_TTL = getattr(
+    settings, "DJANGO_QSTASH_RESULT_CACHE_TTL", 86400
+)
+# Roll webhook executions up into per-minute TaskStats rows, written every
+# DJANGO_QSTASH_TASK_STATS_FLUSH_INTERVAL seconds
+DJANGO_QSTASH_TASK_STATS = getattr(settings, "DJANGO_QSTASH_TASK_STATS", False)
+DJANGO_QSTASH_TASK_STATS_FLUSH_INTERVAL = getattr(
+    settings, "DJANGO_QSTASH_TASK_STATS_FLUSH_INTERVAL", 10.0
+)
+# Range-partition TaskResult by date_done on PostgreSQL: "daily" or "weekly"
+DJANGO_QSTASH_RESULT_PARTITIONING = getattr(
+    settings, "DJANGO_QSTASH_RESULT_PARTITIONING", None
+)
 if not QSTASH_TOKEN or not DJANGO_QSTASH_DOMAIN:
     warnings.warn(
         "DJANGO_SETTINGS_MODULE (settings.py required) requires QSTASH_TOKEN and DJANGO_QSTASH_DOMAIN should be set for QStash functionality",
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import asyncio
+import ctypes
+import logging
+import threading
+import time
+from typing import Any
+from typing import Callable
+from typing import Coroutine
+
+from django.db import connections
+
+from django_qstash.exceptions import SoftTimeLimitExceeded
+from django_qstash.exceptions import TimeLimitExceeded
+
+logger = logging.getLogger(__name__)
+
+
+def raise_in_thread(thread: threading.Thread, exc_type: type[BaseException]) -> bool:
+    """
+    Raise `exc_type` asynchronously in `thread`.
+
+    The exception is raised the next time the thread runs Python bytecode, so a
+    thread blocked in a C call (e.g. a socket read) only sees it once the call
+    returns.
+    """
+    if thread.ident is None or not thread.is_alive():
+        return False
+    modified = ctypes.pythonapi.PyThreadState_SetAsyncExc(
+        ctypes.c_ulong(thread.ident), ctypes.py_object(exc_type)
+    )
+    if modified > 1:  # pragma: no cover
+        # Should never happen; undo it rather than hit other threads
+        ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(thread.ident), None)
+        return False
+    return modified == 1
+
+
+def effective_soft_time_limit(
+    time_limit: float | None, soft_time_limit: float | None
+) -> float | None:
+    """The soft time limit, or None if the hard one is reached first"""
+    if soft_time_limit is None:
+        return None
+    if time_limit is not None and soft_time_limit >= time_limit:
+        return None
+    return soft_time_limit
+
+
+def run_with_time_limits(
+    func: Callable[..., Any],
+    time_limit: float | None = None,
+    soft_time_limit: float | None = None,
+    name: str = "task",
+) -> Any:
+    """
+    Run `func()` in a separate thread and enforce Celery-style time limits.
+
+    At `soft_time_limit` seconds SoftTimeLimitExceeded is raised inside the
+    task so it can clean up. At `time_limit` seconds TimeLimitExceeded is
+    raised inside the task as a last attempt to stop it and the caller stops
+    waiting: TimeLimitExceeded is raised here and a thread that still doesn't
+    stop is abandoned (it is a daemon thread and holds no webhook resources).
+    """
+    outcome: dict[str, Any] = {}
+    done = threading.Event()
+
+    def target():
+        try:
+            outcome["result"] = func()
+        except BaseException as e:  # noqa: B036 - re-raised in the caller
+            outcome["error"] = e
+        finally:
+            # The thread is not reused, so close its database connections
+            connections.close_all()
+            done.set()
+
+    thread = threading.Thread(target=target, name=f"django-qstash-{name}", daemon=True)
+    start = time.monotonic()
+    thread.start()
+
+    soft_time_limit = effective_soft_time_limit(time_limit, soft_time_limit)
+    if soft_time_limit is not None and not done.wait(soft_time_limit):
+        logger.warning("Task %s exceeded its soft time limit", name)
+        raise_in_thread(thread, SoftTimeLimitExceeded)
+
+    if time_limit is not None:
+        remaining = time_limit - (time.monotonic() - start)
+        if not done.wait(max(remaining, 0)):
+            logger.error("Task %s exceeded its time limit, abandoning it", name)
+            raise_in_thread(thread, TimeLimitExceeded)
+            raise TimeLimitExceeded(f"Task exceeded its time limit of {time_limit}s")
+    else:
+        done.wait()
+
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
+
+
+class _SoftLimitAwaitable:
+    """
+    Awaits `coroutine` and throws SoftTimeLimitExceeded into it in place of
+    the CancelledError of a cancel() made by arun_with_time_limits().
+    """
+
+    def __init__(self, coroutine: Coroutine[Any, Any, Any]):
+        self.coroutine = coroutine
+        self.soft_limit_reached = False
+
+    def __await__(self):
+        value: Any = None
+        error: BaseException | None = None
+        while True:
+            try:
+                if error is not None:
+                    yielded = self.coroutine.throw(error)
+                else:
+                    yielded = self.coroutine.send(value)
+            except StopIteration as stop:
+                return stop.value
+            value, error = None, None
+            try:
+                value = yield yielded
+            except asyncio.CancelledError as e:
+                error = e
+                if self.soft_limit_reached:
+                    self.soft_limit_reached = False
+                    task = asyncio.current_task()
+                    if hasattr(task, "uncancel"):
+                        task.uncancel()
+                    error = SoftTimeLimitExceeded()
+            except BaseException as e:  # noqa: B036 - thrown into the coroutine
+                error = e
+
+
+async def arun_with_time_limits(
+    coroutine: Coroutine[Any, Any, Any],
+    time_limit: float | None = None,
+    soft_time_limit: float | None = None,
+    name: str = "task",
+) -> Any:
+    """
+    Await `coroutine` and enforce Celery-style time limits, like
+    run_with_time_limits() does for sync functions.
+
+    At `soft_time_limit` seconds SoftTimeLimitExceeded is raised inside the
+    coroutine where it is suspended, so it can clean up. At `time_limit`
+    seconds it is cancelled and TimeLimitExceeded is raised here.
+    """
+    awaitable = _SoftLimitAwaitable(coroutine)
+
+    async def run():
+        return await awaitable
+
+    task = asyncio.ensure_future(run())
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    try:
+        soft_time_limit = effective_soft_time_limit(time_limit, soft_time_limit)
+        if soft_time_limit is not None:
+            done, _ = await asyncio.wait({task}, timeout=soft_time_limit)
+            if not done:
+                logger.warning("Task %s exceeded its soft time limit", name)
+                awaitable.soft_limit_reached = True
+                task.cancel()
+        if time_limit is not None:
+            remaining = time_limit - (loop.time() - start)
+            done, _ = await asyncio.wait({task}, timeout=max(remaining, 0))
+            if not done:
+                logger.error("Task %s exceeded its time limit, cancelling it", name)
+                task.cancel()
+                raise TimeLimitExceeded(
+                    f"Task exceeded its time limit of {time_limit}s"
+                )
+        return await task
+    except asyncio.CancelledError:
+        # The webhook itself was cancelled (e.g. the client disconnected)
+        task.cancel()
+        raise
@@ -2,20 +2,48 @@ from __future__ import annotations
 
 import json
 
+from django.core.serializers.json import DjangoJSONEncoder
 from django.http import HttpRequest
 from django.http import HttpResponse
+from django.http import HttpResponseNotAllowed
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 
-from .handlers import QStashWebhook
+from .handlers import get_webhook
 
 
 @csrf_exempt
 @require_http_methods(["POST"])
 def qstash_webhook_view(request: HttpRequest) -> HttpResponse:
     """Handle QStash webhook requests."""
-    webhook = QStashWebhook()
-    response_data, status_code = webhook.handle_request(request)
-    return HttpResponse(
-        json.dumps(response_data), status=status_code, content_type="application/json"
+    response_data, status_code = get_webhook().handle_request(request)
+    return webhook_response(response_data, status_code)
+
+
+async def async_qstash_webhook_view(request: HttpRequest) -> HttpResponse:
+    """
+    Handle QStash webhook requests on the event loop (ASGI).
+
+    `async def` tasks are awaited directly; sync tasks run in a bounded pool.
+    """
+    if request.method != "POST":
+        return HttpResponseNotAllowed(["POST"])
+    response_data, status_code = await get_webhook().ahandle_request(request)
+    return webhook_response(response_data, status_code)
+
+
+# Before Django 5.0, csrf_exempt and require_http_methods wrap views in a sync
+# function, so the view is marked and checks its method itself.
+async_qstash_webhook_view.csrf_exempt = True  # type: ignore[attr-defined]
+
+
+def webhook_response(response_data: dict, status_code: int) -> HttpResponse:
+    response = HttpResponse(
+        json.dumps(response_data, cls=DjangoJSONEncoder),
+        status=status_code,
+        content_type="application/json",
     )
+    if "retry_after" in response_data:
+        # Tells QStash when to retry a delivery rejected by a concurrency limit
+        response["Retry-After"] = str(response_data["retry_after"])
+    return response
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock
+from unittest.mock import Mock
+from unittest.mock import patch
+
+import pytest
+from asgiref.sync import async_to_sync
+
+from django_qstash.app import stashed_task
+from django_qstash.app.base import AsyncResult
+from django_qstash.client import get_async_qstash_client
+from django_qstash.db.models import TaskStatus
+from django_qstash.results.models import TaskResult
+
+
+@stashed_task
+def async_sample_task(x, y):
+    return x + y
+
+
+@pytest.fixture
+def mock_async_client():
+    mock_client = Mock()
+    mock_client.message.publish_json = AsyncMock(
+        return_value=Mock(message_id="async-id-123")
+    )
+    mock_client.message.cancel = AsyncMock()
+    with patch(
+        "django_qstash.app.base.get_async_qstash_client", return_value=mock_client
+    ):
+        yield mock_client
+
+
+@pytest.mark.django_db
+class TestAsyncQStashTasks:
+    def test_adelay(self, mock_async_client):
+        result = async_to_sync(async_sample_task.adelay)(2, 3)
+
+        assert result.task_id == "async-id-123"
+        call_kwargs = mock_async_client.message.publish_json.call_args[1]
+        assert call_kwargs["body"]["args"] == (2, 3)
+        assert call_kwargs["url"] == "https://example.com/qstash/webhook/"
+
+    def test_aapply_async_does_not_change_task_options(self, mock_async_client):
+        async_to_sync(async_sample_task.aapply_async)(
+            args=(2, 3), countdown=60, max_retries=1
+        )
+
+        call_kwargs = mock_async_client.message.publish_json.call_args[1]
+        assert call_kwargs["delay"] == "60s"
+        assert call_kwargs["retries"] == 1
+        assert async_sample_task.delay_seconds is None
+        assert "max_retries" not in async_sample_task.options
+
+    def test_concurrent_adelay_overlaps(self, mock_async_client):
+        in_flight = 0
+        max_in_flight = 0
+
+        async def publish_json(**kwargs):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return Mock(message_id="async-id")
+
+        mock_async_client.message.publish_json = publish_json
+
+        async def publish_many():
+            return await asyncio.gather(
+                *(async_sample_task.adelay(i, i) for i in range(5))
+            )
+
+        results = async_to_sync(publish_many)()
+
+        assert len(results) == 5
+        assert max_in_flight == 5
+
+    def test_arevoke(self, mock_async_client):
+        task_result = TaskResult.objects.create(task_id="async-revoke", task_name="t")
+
+        success = async_to_sync(AsyncResult("async-revoke").arevoke)()
+
+        assert success is True
+        mock_async_client.message.cancel.assert_awaited_once_with("async-revoke")
+        task_result.refresh_from_db()
+        assert task_result.status == TaskStatus.CANCELED
+
+
+def test_async_client_is_shared_per_event_loop():
+    async def get_clients():
+        return get_async_qstash_client(), get_async_qstash_client()
+
+    first, second = asyncio.run(get_clients())
+    other_loop_client, _ = asyncio.run(get_clients())
+
+    assert first is second
+    assert first is not other_loop_client
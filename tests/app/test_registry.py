@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from django_qstash.app import QStashTask
+from django_qstash.app import stashed_task
+from django_qstash.app.registry import TaskRegistry
+from django_qstash.app.registry import task_registry
+
+
+@stashed_task(name="registry_custom_name")
+def named_task():
+    return "named"
+
+
+def plain_function():
+    return "plain"
+
+
+def test_decorated_tasks_are_registered():
+    path = f"{__name__}.named_task"
+    assert path in task_registry
+    assert task_registry.get(path) is named_task
+    assert task_registry.get_by_name("registry_custom_name") is named_task
+
+
+def test_unknown_path_returns_none():
+    assert task_registry.get(f"{__name__}.plain_function") is None
+    assert task_registry.get("os.system") is None
+
+
+def test_autodiscover_runs_once_on_miss():
+    registry = TaskRegistry()
+    with patch("django_qstash.discovery.utils.discover_tasks") as mock_discover:
+        assert registry.get("missing.task") is None
+        assert registry.get("other.missing") is None
+    mock_discover.assert_called_once()
+
+
+def test_autodiscover_registers_app_tasks():
+    # tests.discovery.tasks is imported by discovery, registering its tasks
+    task_registry.autodiscover()
+    assert any(
+        path.startswith("tests.discovery.tasks.") for path in task_registry._by_path
+    )
+
+
+def test_register_duplicate_name_keeps_first(caplog):
+    registry = TaskRegistry()
+    with patch("django_qstash.app.base.task_registry", registry):
+        first = QStashTask(named_task.func, name="dup")
+        second = QStashTask(plain_function, name="dup")
+
+    assert registry.get_by_name("dup") is first
+    assert registry.get(second.task_path) is second
+    assert "used by both" in caplog.text
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import threading
 from unittest.mock import Mock
 from unittest.mock import patch
 
@@ -32,6 +33,12 @@ def mock_qstash_client():
         mock_response.message_id = "test-id-123"
         mock_message.publish_json = Mock(return_value=mock_response)
         mock_message.cancel = Mock()  # Mock cancel method
+        mock_message.batch_json = Mock(
+            side_effect=lambda messages: [
+                Mock(message_id=f"batch-id-{message['body']['args'][0]}")
+                for message in messages
+            ]
+        )
 
         # Attach the mock message object to the client
         mock_client.message = mock_message
@@ -65,6 +72,99 @@ class TestQStashTasks:
         call_kwargs = mock_qstash_client.message.publish_json.call_args[1]
         assert call_kwargs["delay"] == "60s"
 
+    def test_apply_async_does_not_change_task(self, mock_qstash_client):
+        """Test that countdown and options only apply to a single call"""
+        sample_task.apply_async(args=(2, 3), countdown=60, max_retries=1)
+        sample_task.delay(2, 3)
+
+        first_call, second_call = mock_qstash_client.message.publish_json.call_args_list
+        assert first_call[1]["delay"] == "60s"
+        assert first_call[1]["retries"] == 1
+        assert "delay" not in second_call[1]
+        assert second_call[1]["retries"] == 3
+        assert sample_task.delay_seconds is None
+        assert sample_task.options == {}
+
+    def test_concurrent_dispatch_is_isolated(self, mock_qstash_client):
+        """Test that concurrent direct calls and publishes do not interfere"""
+        barrier = threading.Barrier(8)
+        direct_results = []
+
+        def publish(countdown):
+            barrier.wait()
+            sample_task.apply_async(args=(countdown, 0), countdown=countdown)
+
+        def call_directly():
+            barrier.wait()
+            direct_results.append(sample_task(2, 3))
+
+        threads = [threading.Thread(target=publish, args=(i,)) for i in range(1, 5)]
+        threads += [threading.Thread(target=call_directly) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert direct_results == [5, 5, 5, 5]
+        calls = mock_qstash_client.message.publish_json.call_args_list
+        assert len(calls) == 4
+        for call in calls:
+            assert call[1]["delay"] == f"{call[1]['body']['args'][0]}s"
+
+    def test_publish_template_built_once(self, mock_qstash_client):
+        """Test that the callback URL and envelope are only built on first use"""
+        task = stashed_task(name="template_task", max_retries=5)(lambda x: x)
+
+        with patch(
+            "django_qstash.app.base.get_callback_url",
+            return_value="https://example.com/qstash/webhook/",
+        ) as mock_get_callback_url:
+            task.delay(1)
+            task.delay(2)
+            task.apply_async(args=(3,), countdown=10)
+
+        mock_get_callback_url.assert_called_once()
+        calls = mock_qstash_client.message.publish_json.call_args_list
+        assert [call[1]["body"]["args"] for call in calls] == [(1,), (2,), (3,)]
+        assert calls[0][1]["body"]["task_name"] == "template_task"
+        assert calls[0][1]["retries"] == 5
+        assert calls[2][1]["delay"] == "10s"
+        assert "delay" not in calls[1][1]
+
+    def test_task_starmap(self, mock_qstash_client):
+        """Test that starmap() publishes argument tuples in batches"""
+        with patch("django_qstash.app.base.DJANGO_QSTASH_BATCH_SIZE", 2):
+            results = sample_task.starmap([(1, 2), (3, 4), (5, 6)])
+
+        assert [result.task_id for result in results] == [
+            "batch-id-1",
+            "batch-id-3",
+            "batch-id-5",
+        ]
+        assert mock_qstash_client.message.batch_json.call_count == 2
+        mock_qstash_client.message.publish_json.assert_not_called()
+        first_batch = mock_qstash_client.message.batch_json.call_args_list[0][0][0]
+        assert len(first_batch) == 2
+        assert first_batch[0]["body"]["args"] == (1, 2)
+        assert first_batch[0]["body"]["function"] == "sample_task"
+        assert first_batch[0]["url"] == "https://example.com/qstash/webhook/"
+        assert "delay" not in first_batch[0]
+
+    def test_task_map_with_countdown(self, mock_qstash_client):
+        """Test that map() publishes one single-argument message per item"""
+        results = sample_task_with_options.map([7, 8], countdown=30)
+
+        assert [result.task_id for result in results] == ["batch-id-7", "batch-id-8"]
+        messages = mock_qstash_client.message.batch_json.call_args[0][0]
+        assert [message["body"]["args"] for message in messages] == [(7,), (8,)]
+        assert all(message["delay"] == "30s" for message in messages)
+        assert all(message["content_based_deduplication"] for message in messages)
+
+    def test_task_starmap_empty(self, mock_qstash_client):
+        """Test that starmap() with no items does not call QStash"""
+        assert sample_task.starmap([]) == []
+        mock_qstash_client.message.batch_json.assert_not_called()
+
     def test_task_revoke_function(self, mock_qstash_client):
         """Test that revoke() function calls QStash cancel and updates DB status"""
         task_id = "test-revoke-id"
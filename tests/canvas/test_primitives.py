@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import pytest
+
+from django_qstash.app import stashed_task
+from django_qstash.canvas import chain
+from django_qstash.canvas import chord
+from django_qstash.canvas import group
+from django_qstash.canvas.models import ChordCounter
+from django_qstash.canvas.services import complete_chord_part
+from django_qstash.canvas.services import on_task_success
+
+pytestmark = pytest.mark.django_db
+
+
+@stashed_task
+def add(x, y):
+    return x + y
+
+
+@stashed_task
+def total(values):
+    return sum(values)
+
+
+def published_bodies(mock_client):
+    bodies = [
+        call.kwargs["body"] for call in mock_client.message.publish_json.call_args_list
+    ]
+    for call in mock_client.message.batch_json.call_args_list:
+        bodies.extend(message["body"] for message in call.args[0])
+    return bodies
+
+
+def test_group_uses_one_batch_request(mock_qstash_client):
+    result = group(add.s(1, 2), total.s([1, 2]), add.s(3, 4)).apply_async()
+
+    assert [r.id for r in result] == ["batch-id-0", "batch-id-1", "batch-id-2"]
+    mock_qstash_client.message.batch_json.assert_called_once()
+    bodies = published_bodies(mock_qstash_client)
+    assert [body["function"] for body in bodies] == ["add", "total", "add"]
+    assert bodies[1]["args"] == ([1, 2],)
+
+
+def test_group_accepts_iterable(mock_qstash_client):
+    result = group(add.s(i, i) for i in range(3)).delay()
+    assert len(result) == 3
+
+
+def test_group_publishes_chain_members(mock_qstash_client):
+    result = group(chain(add.s(1, 2), add.s(10)), add.s(3, 4)).apply_async()
+
+    assert len(result) == 2
+    first, second = published_bodies(mock_qstash_client)
+    assert first["args"] == (1, 2)
+    assert [step["task"] for step in first["chain"]] == [f"{__name__}.add"]
+    assert second["args"] == (3, 4)
+    assert "chain" not in second
+
+
+def test_chain_publishes_first_step_with_remaining_steps(mock_qstash_client):
+    result = chain(add.s(1, 2), add.s(10), add.si(0, 0)).apply_async()
+
+    assert result.id == "msg-id"
+    (body,) = published_bodies(mock_qstash_client)
+    assert body["args"] == (1, 2)
+    assert [step["task"] for step in body["chain"]] == [
+        f"{__name__}.add",
+        f"{__name__}.add",
+    ]
+    assert body["chain"][1]["immutable"] is True
+
+
+def test_chain_step_publishes_next_with_result(mock_qstash_client):
+    steps = [add.s(10).to_dict(), add.si(0, 0).to_dict()]
+
+    on_task_success(steps, None, 3)
+
+    (body,) = published_bodies(mock_qstash_client)
+    assert body["args"] == (3, 10)
+    assert body["chain"] == [steps[1]]
+
+
+def test_immutable_chain_step_ignores_result(mock_qstash_client):
+    on_task_success([add.si(0, 0).to_dict()], None, 3)
+
+    (body,) = published_bodies(mock_qstash_client)
+    assert body["args"] == (0, 0)
+    assert "chain" not in body
+
+
+def test_chord_publishes_body_after_header(mock_qstash_client):
+    result = chord([add.s(1, 1), add.s(2, 2), add.s(3, 3)])(total.s())
+
+    assert len(result) == 3
+    counter = ChordCounter.objects.get()
+    assert counter.remaining == 3
+    refs = [body["chord"] for body in published_bodies(mock_qstash_client)]
+    assert refs == [{"id": str(counter.id), "index": i} for i in range(3)]
+
+    mock_qstash_client.reset_mock()
+    assert complete_chord_part(str(counter.id), 2, 6) is False
+    # Redelivered header tasks are only counted once
+    assert complete_chord_part(str(counter.id), 2, 6) is False
+    assert complete_chord_part(str(counter.id), 0, 2) is False
+    assert complete_chord_part(str(counter.id), 1, 4) is True
+
+    (body,) = published_bodies(mock_qstash_client)
+    assert body["function"] == "total"
+    assert body["args"] == ([2, 4, 6],)
+    assert not ChordCounter.objects.exists()
+    # Late redeliveries after completion are ignored
+    assert complete_chord_part(str(counter.id), 1, 4) is False
+
+
+def test_chord_header_chain_reports_from_last_step(mock_qstash_client):
+    chord([chain(add.s(1, 1), add.s(5))], total.s()).apply_async()
+    counter = ChordCounter.objects.get()
+    (first,) = published_bodies(mock_qstash_client)
+    assert "chord" in first and len(first["chain"]) == 1
+
+    mock_qstash_client.reset_mock()
+    on_task_success(first["chain"], first["chord"], 2)
+    (second,) = published_bodies(mock_qstash_client)
+    assert second["args"] == (2, 5)
+    assert second["chord"] == {"id": str(counter.id), "index": 0}
+
+    mock_qstash_client.reset_mock()
+    on_task_success(None, second["chord"], 7)
+    (body,) = published_bodies(mock_qstash_client)
+    assert body["args"] == ([7],)
+
+
+def test_chord_with_empty_header(mock_qstash_client):
+    chord([], total.s()).apply_async()
+
+    (body,) = published_bodies(mock_qstash_client)
+    assert body["args"] == ([],)
+    assert not ChordCounter.objects.exists()
+
+
+def test_webhook_continues_chain(mock_qstash_client, webhook, build_request):
+    request = build_request(
+        "add", [1, 2], chain=[add.s(10).to_dict()], message_id="123"
+    )
+
+    response, status = webhook.handle_request(request)
+
+    assert status == 200
+    (body,) = published_bodies(mock_qstash_client)
+    assert body["args"] == (3, 10)
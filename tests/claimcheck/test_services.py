@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from unittest.mock import Mock
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from django_qstash.app import stashed_task
+from django_qstash.claimcheck.models import PayloadBlob
+from django_qstash.claimcheck.services import load_arguments
+from django_qstash.claimcheck.services import offload_arguments
+from django_qstash.exceptions import PayloadError
+
+pytestmark = pytest.mark.django_db
+
+
+@stashed_task
+def join_task(*parts, sep=""):
+    return sep.join(parts)
+
+
+@pytest.fixture
+def small_threshold():
+    with patch(
+        "django_qstash.claimcheck.services.DJANGO_QSTASH_CLAIM_CHECK_THRESHOLD", 100
+    ):
+        yield
+
+
+def test_offload_arguments_below_threshold(small_threshold):
+    assert offload_arguments(("small",), {}) is None
+    assert not PayloadBlob.objects.exists()
+
+
+def test_offload_and_load_arguments(small_threshold):
+    args, kwargs = ("x" * 500,), {"sep": "-"}
+    claim_check = offload_arguments(args, kwargs)
+
+    blob = PayloadBlob.objects.get(id=claim_check["key"])
+    assert claim_check["serializer"] == "json"
+    assert blob.size > 500
+    assert len(blob.data) < blob.size
+    assert blob.expires_at > timezone.now()
+    assert load_arguments(claim_check) == (["x" * 500], {"sep": "-"})
+
+
+def test_delay_sends_claim_check_for_large_arguments(
+    small_threshold, mock_qstash_client
+):
+    join_task.delay("x" * 500, sep="-")
+
+    body = mock_qstash_client.message.publish_json.call_args.kwargs["body"]
+    assert body["args"] == ()
+    assert body["kwargs"] == {}
+    assert PayloadBlob.objects.filter(id=body["claim_check"]["key"]).exists()
+
+
+def test_delay_inlines_small_arguments(small_threshold, mock_qstash_client):
+    join_task.delay("a", "b")
+
+    body = mock_qstash_client.message.publish_json.call_args.kwargs["body"]
+    assert body["args"] == ("a", "b")
+    assert "claim_check" not in body
+
+
+def test_offloading_is_opt_in(mock_qstash_client):
+    with patch("django_qstash.claimcheck.services.offload_arguments") as mock_offload:
+        join_task.delay("x" * 500)
+
+    mock_offload.assert_not_called()
+    body = mock_qstash_client.message.publish_json.call_args.kwargs["body"]
+    assert body["args"] == ("x" * 500,)
+
+
+def test_webhook_loads_and_releases_claim_check(
+    small_threshold, webhook, build_request
+):
+    claim_check = offload_arguments(("x" * 500, "y"), {"sep": "-"})
+    request = build_request("join_task", claim_check=claim_check, message_id="123")
+
+    response, status = webhook.handle_request(request)
+
+    assert status == 200
+    assert response["result"] == "x" * 500 + "-y"
+    assert not PayloadBlob.objects.exists()
+
+
+def test_webhook_missing_claim_check(webhook):
+    payload = Mock(
+        claim_check={
+            "key": "00000000-0000-0000-0000-000000000000",
+            "serializer": "json",
+        }
+    )
+
+    with pytest.raises(PayloadError, match="was not found"):
+        webhook.load_claim_check(payload)
+
+
+def test_clear_expired_payloads_command(small_threshold):
+    expired = offload_arguments(("x" * 500,), {})
+    current = offload_arguments(("y" * 500,), {})
+    PayloadBlob.objects.filter(id=expired["key"]).update(
+        expires_at=timezone.now() - timedelta(seconds=1)
+    )
+
+    call_command("clear_expired_payloads")
+
+    assert list(PayloadBlob.objects.values_list("id", flat=True)) == [
+        PayloadBlob.objects.get(id=current["key"]).id
+    ]
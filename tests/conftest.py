@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import json
+from unittest.mock import Mock
+from unittest.mock import patch
+
 import pytest
 from django.db.models.signals import post_save
 from django.db.models.signals import pre_delete
+from django.http import HttpRequest
 
+from django_qstash.handlers import QStashWebhook
 from django_qstash.schedules.models import TaskSchedule
 from django_qstash.schedules.signals import delete_schedule_from_qstash_receiver
 from django_qstash.schedules.signals import sync_schedule_to_qstash_receiver
@@ -34,3 +40,66 @@ def disable_qstash_signals():
 
     post_save.connect(sync_schedule_to_qstash_receiver, sender=TaskSchedule)
     pre_delete.connect(delete_schedule_from_qstash_receiver, sender=TaskSchedule)
+
+
+@pytest.fixture
+def mock_qstash_client():
+    """
+    Patch the QStash client used for publishing.
+
+    `publish_json` returns the message id "msg-id" and `batch_json` returns
+    "batch-id-<index>" for each message in the batch.
+    """
+    with patch("django_qstash.app.base.qstash_client") as mock_client:
+        mock_client.message.publish_json.return_value = Mock(message_id="msg-id")
+        mock_client.message.batch_json.side_effect = lambda messages: [
+            Mock(message_id=f"batch-id-{i}") for i, _ in enumerate(messages)
+        ]
+        yield mock_client
+
+
+@pytest.fixture
+def webhook():
+    """A QStashWebhook that accepts any signature"""
+    webhook = QStashWebhook()
+    with patch.object(webhook, "verify_signature"):
+        yield webhook
+
+
+@pytest.fixture
+def build_request(request):
+    """
+    Factory for webhook deliveries of a task defined in the test's module.
+
+    Extra keyword arguments (e.g. `bundle`, `options`, `claim_check`) are
+    added to the message body, and `headers` to the request headers.
+    """
+    module = request.module.__name__
+
+    def build(
+        function: str,
+        args: list | tuple = (),
+        kwargs: dict | None = None,
+        message_id: str = "msg-1",
+        headers: dict | None = None,
+        **body,
+    ) -> Mock:
+        delivery = Mock(spec=HttpRequest)
+        delivery.body = json.dumps(
+            {
+                "function": function,
+                "module": module,
+                "args": list(args),
+                "kwargs": kwargs or {},
+                **body,
+            }
+        ).encode()
+        delivery.headers = {
+            "Upstash-Signature": "valid",
+            "Upstash-Message-Id": message_id,
+            **(headers or {}),
+        }
+        delivery.build_absolute_uri.return_value = "https://example.com"
+        return delivery
+
+    return build
@@ -90,3 +90,17 @@ class TestClearStaleResults:
         remaining_tasks = TaskResult.objects.all()
         assert len(remaining_tasks) == 1
         assert remaining_tasks[0].task_id == recent_task.task_id
+
+    def test_clear_stale_results_in_batches(self):
+        stale_date = timezone.now() - timedelta(days=8)
+        for i in range(3):
+            TaskResult.objects.create(
+                task_id=f"stale-task-{i}",
+                task_name="test.stale",
+                status="SUCCESS",
+                date_done=stale_date,
+            )
+
+        call_command("clear_stale_results", "--no-input", "--batch-size=2")
+
+        assert not TaskResult.objects.exists()
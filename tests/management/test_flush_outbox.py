@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from io import StringIO
+from unittest.mock import Mock
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+
+from django_qstash.outbox.models import OutboxMessage
+
+
+@pytest.mark.django_db
+class TestFlushOutbox:
+    def test_flush_outbox_command(self):
+        OutboxMessage.objects.bulk_create(
+            [OutboxMessage(task_name="test.task", body={"args": [i]}) for i in range(3)]
+        )
+        stdout = StringIO()
+
+        with patch("django_qstash.outbox.services.qstash_client") as mock_client:
+            mock_client.message.batch_json = Mock(return_value=[])
+            call_command("flush_outbox", "--batch-size", "2", stdout=stdout)
+
+        assert mock_client.message.batch_json.call_count == 2
+        assert OutboxMessage.objects.count() == 0
+        assert "Published 3 outbox messages." in stdout.getvalue()
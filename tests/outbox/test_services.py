@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from unittest.mock import Mock
+from unittest.mock import patch
+
+import pytest
+from django.db import transaction
+from django.utils import timezone
+
+from django_qstash.app import stashed_task
+from django_qstash.outbox.models import OutboxMessage
+from django_qstash.outbox.services import enqueue_messages
+from django_qstash.outbox.services import flush_outbox
+from django_qstash.outbox.services import flush_outbox_on_commit
+from django_qstash.outbox.services import format_outbox_message
+from django_qstash.outbox.services import publish_outbox_batch
+
+
+@stashed_task
+def outbox_task(x, y):
+    return x + y
+
+
+@pytest.fixture
+def mock_qstash_client():
+    with patch("django_qstash.outbox.services.qstash_client") as mock_client:
+        mock_client.message.batch_json = Mock(
+            side_effect=lambda messages: [
+                Mock(message_id=f"id-{i}") for i, _ in enumerate(messages)
+            ]
+        )
+        yield mock_client
+
+
+@pytest.fixture
+def outbox_mode():
+    with (
+        patch("django_qstash.app.base.DJANGO_QSTASH_PUBLISH_MODE", "outbox"),
+        patch("django_qstash.app.base.qstash_client") as mock_base_client,
+    ):
+        yield mock_base_client
+
+
+@pytest.mark.django_db
+class TestOutbox:
+    def test_delay_writes_outbox_row(self, outbox_mode):
+        with patch("django_qstash.outbox.services.transaction.on_commit"):
+            result = outbox_task.delay(2, 3)
+
+        assert result.id is None
+        outbox_mode.message.publish_json.assert_not_called()
+        message = OutboxMessage.objects.get()
+        assert message.task_name == "outbox_task"
+        assert message.body["args"] == [2, 3]
+        assert message.body["function"] == "outbox_task"
+
+    def test_starmap_writes_outbox_rows(self, outbox_mode):
+        with patch("django_qstash.outbox.services.transaction.on_commit"):
+            results = outbox_task.starmap([(1, 2), (3, 4)])
+
+        assert len(results) == 2
+        outbox_mode.message.batch_json.assert_not_called()
+        assert OutboxMessage.objects.count() == 2
+
+    def test_rollback_discards_message(self, outbox_mode, mock_qstash_client):
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                outbox_task.delay(2, 3)
+                raise RuntimeError("rollback")
+
+        assert OutboxMessage.objects.count() == 0
+        mock_qstash_client.message.batch_json.assert_not_called()
+
+    def test_on_commit_flushes_outbox(
+        self, outbox_mode, mock_qstash_client, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            outbox_task.delay(2, 3)
+
+        mock_qstash_client.message.batch_json.assert_called_once()
+        assert OutboxMessage.objects.count() == 0
+
+    def test_flush_outbox_in_batches(self, mock_qstash_client):
+        with patch("django_qstash.outbox.services.transaction.on_commit"):
+            enqueue_messages("outbox_task", [{"args": [i]} for i in range(5)])
+
+        assert flush_outbox(batch_size=2) == 5
+        assert mock_qstash_client.message.batch_json.call_count == 3
+        assert OutboxMessage.objects.count() == 0
+
+    def test_flush_outbox_keeps_messages_on_error(self, mock_qstash_client):
+        mock_qstash_client.message.batch_json.side_effect = Exception("QStash down")
+        with patch("django_qstash.outbox.services.transaction.on_commit"):
+            enqueue_messages("outbox_task", [{"args": [1]}])
+
+        with pytest.raises(Exception, match="QStash down"):
+            flush_outbox()
+        assert OutboxMessage.objects.count() == 1
+
+    def test_format_outbox_message(self):
+        message = OutboxMessage(
+            task_name="outbox_task",
+            body={"args": [1]},
+            retries=5,
+            not_before=timezone.now() + timedelta(minutes=5),
+        )
+
+        data = format_outbox_message(message, "https://example.com/qstash/webhook/")
+
+        assert data["url"] == "https://example.com/qstash/webhook/"
+        assert data["retries"] == 5
+        assert data["deduplication_id"] == str(message.id)
+        assert data["not_before"] == int(message.not_before.timestamp())
+        assert "content_based_deduplication" not in data
+
+    def test_one_flush_hook_per_transaction(
+        self, outbox_mode, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks() as callbacks:
+            for i in range(3):
+                outbox_task.delay(i, i)
+
+        assert callbacks == [flush_outbox_on_commit]
+
+    def test_on_commit_publishes_one_batch(
+        self, outbox_mode, mock_qstash_client, django_capture_on_commit_callbacks
+    ):
+        with (
+            patch("django_qstash.outbox.services.DJANGO_QSTASH_BATCH_SIZE", 2),
+            django_capture_on_commit_callbacks(execute=True),
+        ):
+            outbox_task.starmap([(i, i) for i in range(5)])
+
+        mock_qstash_client.message.batch_json.assert_called_once()
+        # Left to the flush_outbox management command
+        assert OutboxMessage.objects.count() == 3
+
+    def test_batch_is_claimed_while_publishing(self, mock_qstash_client):
+        with patch("django_qstash.outbox.services.transaction.on_commit"):
+            enqueue_messages("outbox_task", [{"args": [1]}])
+
+        def publish(messages):
+            # Another flusher skips the claimed rows instead of waiting on them
+            assert publish_outbox_batch() == 0
+            assert OutboxMessage.objects.get().claimed_until > timezone.now()
+            return [Mock(message_id="id-0")]
+
+        mock_qstash_client.message.batch_json.side_effect = publish
+
+        assert flush_outbox() == 1
+        assert OutboxMessage.objects.count() == 0
+
+    def test_failed_publish_releases_claim(self, mock_qstash_client):
+        mock_qstash_client.message.batch_json.side_effect = Exception("QStash down")
+        with patch("django_qstash.outbox.services.transaction.on_commit"):
+            enqueue_messages("outbox_task", [{"args": [1]}])
+
+        with pytest.raises(Exception, match="QStash down"):
+            flush_outbox()
+        assert OutboxMessage.objects.get().claimed_until is None
+
+    def test_expired_claim_is_published_again(self, mock_qstash_client):
+        with patch("django_qstash.outbox.services.transaction.on_commit"):
+            enqueue_messages("outbox_task", [{"args": [1]}, {"args": [2]}])
+        claimed = OutboxMessage.objects.order_by("date_created")
+        OutboxMessage.objects.filter(pk=claimed[0].pk).update(
+            claimed_until=timezone.now() - timedelta(seconds=1)
+        )
+        OutboxMessage.objects.filter(pk=claimed[1].pk).update(
+            claimed_until=timezone.now() + timedelta(minutes=1)
+        )
+
+        assert flush_outbox() == 1
+        assert OutboxMessage.objects.get().body == {"args": [2]}
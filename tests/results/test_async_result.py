@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import pickle
+from unittest.mock import patch
+
+import pytest
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+
+from django_qstash.app import stashed_task
+from django_qstash.app.base import AsyncResult
+from django_qstash.db.models import TaskStatus
+from django_qstash.exceptions import ResultTimeout
+from django_qstash.exceptions import TaskFailed
+from django_qstash.results.models import TaskResult
+from django_qstash.results.services import result_value
+from django_qstash.results.services import store_task_result
+from django_qstash.results.wakeup import CacheWakeup
+from django_qstash.results.wakeup import PostgresWakeup
+from django_qstash.results.wakeup import _check_driver
+from django_qstash.results.wakeup import get_wakeup
+
+pytestmark = pytest.mark.django_db
+
+
+@stashed_task(max_retries=2)
+def flaky_task():
+    raise ValueError("flaky")
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+@pytest.fixture
+def cache_wakeup():
+    with patch("django_qstash.results.wakeup.DJANGO_QSTASH_RESULT_WAKEUP", "cache"):
+        yield
+
+
+class TestAsyncResult:
+    def test_get_returns_result(self):
+        store_task_result("msg-1", "task", TaskStatus.SUCCESS, result=[1, 2])
+
+        assert AsyncResult("msg-1").get(timeout=1) == [1, 2]
+
+    def test_get_returns_dict_result(self):
+        store_task_result("msg-1", "task", TaskStatus.SUCCESS, result={"a": 1})
+
+        assert AsyncResult("msg-1").get(timeout=1) == {"a": 1}
+
+    def test_get_raises_for_failed_task(self):
+        store_task_result("msg-1", "task", TaskStatus.EXECUTION_ERROR, traceback="boom")
+
+        with pytest.raises(TaskFailed) as exc_info:
+            AsyncResult("msg-1").get(timeout=1)
+        assert exc_info.value.status == TaskStatus.EXECUTION_ERROR
+        assert exc_info.value.traceback == "boom"
+
+        error = AsyncResult("msg-1").get(timeout=1, propagate=False)
+        assert isinstance(error, TaskFailed)
+
+    def test_task_failed_survives_pickling(self):
+        error = TaskFailed("Task failed", TaskStatus.EXECUTION_ERROR, "boom")
+
+        copied = pickle.loads(pickle.dumps(error))
+
+        assert str(copied) == "Task failed"
+        assert copied.status == TaskStatus.EXECUTION_ERROR
+        assert copied.traceback == "boom"
+
+    def test_get_times_out(self):
+        TaskResult.objects.create(task_id="msg-1", task_name="task")
+
+        with pytest.raises(ResultTimeout):
+            AsyncResult("msg-1").get(timeout=0.05, interval=0.01)
+
+    def test_get_backs_off(self):
+        task_result = TaskResult(status=TaskStatus.SUCCESS, result={"result": 3})
+        with (
+            patch(
+                "django_qstash.results.services.get_task_result",
+                side_effect=[None, None, None, None, task_result],
+            ),
+            patch("django_qstash.results.services.time.sleep") as mock_sleep,
+        ):
+            assert AsyncResult("msg-1").get(interval=0.1, max_interval=0.3) == 3
+
+        pauses = [call.args[0] for call in mock_sleep.call_args_list]
+        assert pauses == [0.1, 0.2, 0.3, 0.3]
+
+    def test_get_without_task_id(self):
+        with pytest.raises(ValueError):
+            AsyncResult(None).get()
+
+    def test_status(self):
+        result = AsyncResult("msg-1")
+        assert result.status == TaskStatus.PENDING
+        assert result.state == TaskStatus.PENDING
+        assert not result.ready()
+
+        store_task_result("msg-1", "task", TaskStatus.SUCCESS)
+
+        assert result.status == TaskStatus.SUCCESS
+        assert result.ready()
+        assert result.successful()
+        assert not result.failed()
+
+    def test_failed(self):
+        store_task_result("msg-1", "task", TaskStatus.INTERNAL_ERROR)
+
+        result = AsyncResult("msg-1")
+        assert result.ready()
+        assert result.failed()
+        assert not result.successful()
+
+    def test_get_waits_through_retries(self):
+        store_task_result("msg-1", "task", TaskStatus.RETRY, traceback="boom")
+
+        result = AsyncResult("msg-1")
+        with pytest.raises(ResultTimeout):
+            result.get(timeout=0.05, interval=0.01)
+        assert result.status == TaskStatus.RETRY
+        assert not result.ready()
+        assert not result.failed()
+
+    def test_result_value(self):
+        assert result_value(None) is None
+        assert result_value({"result": 1}) == 1
+        assert result_value({"result": 1, "other": 2}) == {"result": 1, "other": 2}
+
+
+class TestRetriedFailures:
+    @pytest.fixture
+    def handle(self, webhook, build_request):
+        def handle(retried: str | None) -> TaskResult:
+            headers = {} if retried is None else {"Upstash-Retried": retried}
+            webhook.handle_request(
+                build_request("flaky_task", options={"max_retries": 2}, headers=headers)
+            )
+            return TaskResult.objects.latest("date_done")
+
+        return handle
+
+    def test_failure_with_retries_left_is_not_final(self, handle):
+        assert handle("1").status == TaskStatus.RETRY
+        assert not AsyncResult("msg-1").ready()
+
+    def test_last_attempt_is_final(self, handle):
+        handle("0")
+        assert handle("2").status == TaskStatus.EXECUTION_ERROR
+
+        with pytest.raises(TaskFailed):
+            AsyncResult("msg-1").get(timeout=1)
+
+    def test_failure_without_retry_header_is_final(self, handle):
+        assert handle(None).status == TaskStatus.EXECUTION_ERROR
+
+
+class TestCacheWakeup:
+    def test_storing_a_result_wakes_waiters(self, cache_wakeup):
+        with CacheWakeup().listen("msg-1") as wait:
+            assert wait(0.01) is False
+            store_task_result("msg-1", "task", TaskStatus.SUCCESS)
+            assert wait(0.01) is True
+
+    def test_retry_does_not_wake_waiters(self, cache_wakeup):
+        with CacheWakeup().listen("msg-1") as wait:
+            store_task_result("msg-1", "task", TaskStatus.RETRY)
+            assert wait(0.01) is False
+
+    def test_cache_checks_back_off(self):
+        with (
+            CacheWakeup().listen("msg-1") as wait,
+            patch("django_qstash.results.wakeup.time.sleep") as mock_sleep,
+            patch(
+                "django_qstash.results.wakeup.time.monotonic",
+                side_effect=[0, 0, 0.05, 0.15, 0.35, 0.75, 1.55, 2.55, 3.55, 4],
+            ),
+        ):
+            assert wait(4) is False
+
+        pauses = [call.args[0] for call in mock_sleep.call_args_list]
+        assert pauses == pytest.approx([0.05, 0.1, 0.2, 0.4, 0.8, 1.0, 1.0, 0.45])
+
+    def test_get_is_woken_up(self, cache_wakeup):
+        task_result = TaskResult(status=TaskStatus.SUCCESS, result={"result": 3})
+        CacheWakeup().notify(["msg-1"])
+        with (
+            patch(
+                "django_qstash.results.services.get_task_result",
+                side_effect=[None, task_result],
+            ),
+            patch("django_qstash.results.services.time.sleep") as mock_sleep,
+        ):
+            assert AsyncResult("msg-1").get(interval=10) == 3
+        mock_sleep.assert_not_called()
+
+    def test_invalid_wakeup(self):
+        with patch("django_qstash.results.wakeup.DJANGO_QSTASH_RESULT_WAKEUP", "nope"):
+            with pytest.raises(ImproperlyConfigured):
+                get_wakeup()
+
+
+def test_postgres_wakeup_rejects_old_psycopg():
+    class OldConnection:
+        def notifies(self):
+            pass
+
+    with pytest.raises(ImproperlyConfigured, match="psycopg 3.2"):
+        _check_driver(OldConnection())
+
+
+@pytest.mark.skipif(
+    "postgres" not in settings.DATABASES, reason="needs a PostgreSQL server"
+)
+@pytest.mark.django_db(databases=["default", "postgres"], transaction=True)
+class TestPostgresWakeup:
+    # NOTIFY is only delivered once the transaction commits
+    @pytest.fixture
+    def wakeup(self):
+        wakeup = PostgresWakeup()
+        with patch.object(wakeup, "get_alias", return_value="postgres"):
+            yield wakeup
+            wakeup.close_connection()
+
+    def test_notify_wakes_waiter(self, wakeup):
+        with wakeup.listen("msg-1") as wait:
+            assert wait(0.01) is False
+            wakeup.notify(["msg-2", "msg-1"])
+            assert wait(1) is True
+
+    def test_connection_is_reused(self, wakeup):
+        with wakeup.listen("msg-1"):
+            first = wakeup.get_connection()
+        with wakeup.listen("msg-2"):
+            assert wakeup.get_connection() is first
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+
+from django_qstash.app.base import AsyncResult
+from django_qstash.db.models import TaskStatus
+from django_qstash.results.backends import CacheBackend
+from django_qstash.results.backends import CompositeBackend
+from django_qstash.results.backends import DatabaseBackend
+from django_qstash.results.models import TaskResult
+from django_qstash.results.services import astore_task_result
+from django_qstash.results.services import create_pending_results
+from django_qstash.results.services import get_result_backend
+from django_qstash.results.services import get_task_result
+from django_qstash.results.services import store_task_result
+from django_qstash.results.services import store_task_results
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+@pytest.fixture
+def use_backend():
+    def use(backend):
+        patcher = patch(
+            "django_qstash.results.services.get_result_backend", return_value=backend
+        )
+        patcher.start()
+        return backend
+
+    yield use
+    patch.stopall()
+
+
+def test_default_backend():
+    assert isinstance(get_result_backend(), DatabaseBackend)
+
+
+class TestCacheBackend:
+    def test_store_and_get(self, use_backend):
+        use_backend(CacheBackend())
+
+        assert store_task_result("msg-1", "task", TaskStatus.SUCCESS, result=3) is None
+
+        assert not TaskResult.objects.exists()
+        task_result = get_task_result("msg-1")
+        assert task_result.status == TaskStatus.SUCCESS
+        assert task_result.result == {"result": 3}
+        assert task_result._state.adding
+        assert AsyncResult("msg-1").get(timeout=1) == 3
+
+    def test_astore(self, use_backend):
+        use_backend(CacheBackend())
+
+        async_to_sync(astore_task_result)("msg-1", "task", TaskStatus.SUCCESS)
+
+        assert get_task_result("msg-1").status == TaskStatus.SUCCESS
+
+    def test_store_many(self, use_backend):
+        use_backend(CacheBackend())
+
+        store_task_results(
+            [
+                {"task_id": "msg-1", "task_name": "task", "status": TaskStatus.SUCCESS},
+                {"task_id": "msg-2", "task_name": "task", "status": TaskStatus.SUCCESS},
+            ]
+        )
+
+        assert get_task_result("msg-2").status == TaskStatus.SUCCESS
+
+    def test_uses_ttl(self):
+        backend = CacheBackend(timeout=60)
+        with patch.object(cache, "set") as mock_set:
+            backend.store(
+                {"task_id": "msg-1", "status": TaskStatus.SUCCESS, "date_done": None}
+            )
+        assert mock_set.call_args.args[2] == 60
+
+    def test_pending_does_not_overwrite_result(self, use_backend):
+        backend = use_backend(CacheBackend())
+        with (
+            patch("django_qstash.results.services.DJANGO_QSTASH_TRACK_PENDING", True),
+            patch("django_qstash.results.backends.DJANGO_QSTASH_TRACK_PENDING", True),
+        ):
+            create_pending_results([{"task_id": "msg-1", "task_name": "task"}])
+            pending = get_task_result("msg-1")
+            assert pending.status == TaskStatus.PENDING
+
+            store_task_result("msg-1", "task", TaskStatus.SUCCESS)
+            assert backend.create_pending([{"task_id": "msg-1"}]) == []
+
+        task_result = get_task_result("msg-1")
+        assert task_result.status == TaskStatus.SUCCESS
+        assert task_result.date_created == pending.date_created
+
+
+class TestCompositeBackend:
+    def test_successes_go_to_the_cache(self, use_backend):
+        use_backend(CompositeBackend())
+
+        store_task_result("msg-1", "task", TaskStatus.SUCCESS, result=1)
+
+        assert not TaskResult.objects.exists()
+        assert get_task_result("msg-1").result == {"result": 1}
+
+    def test_errors_go_to_the_database(self, use_backend):
+        use_backend(CompositeBackend())
+
+        store_task_result("msg-1", "task", TaskStatus.EXECUTION_ERROR, traceback="x")
+
+        assert TaskResult.objects.get().task_id == "msg-1"
+        assert cache.get(CacheBackend().get_key("msg-1")) is None
+        assert get_task_result("msg-1").status == TaskStatus.EXECUTION_ERROR
+
+    def test_error_replaces_pending_cache_entry(self, use_backend):
+        backend = use_backend(CompositeBackend())
+        backend.create_pending([{"task_id": "msg-1", "task_name": "task"}])
+
+        store_task_result("msg-1", "task", TaskStatus.INTERNAL_ERROR)
+
+        assert get_task_result("msg-1").status == TaskStatus.INTERNAL_ERROR
+
+    def test_store_many_splits_by_status(self, use_backend):
+        use_backend(CompositeBackend())
+
+        stored = store_task_results(
+            [
+                {"task_id": "msg-1", "task_name": "task", "status": TaskStatus.SUCCESS},
+                {
+                    "task_id": "msg-2",
+                    "task_name": "task",
+                    "status": TaskStatus.EXECUTION_ERROR,
+                },
+            ]
+        )
+
+        assert [task_result.task_id for task_result in stored] == ["msg-2"]
+        assert get_task_result("msg-1").status == TaskStatus.SUCCESS
+        assert get_task_result("msg-2").status == TaskStatus.EXECUTION_ERROR
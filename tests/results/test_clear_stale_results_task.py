@@ -2,8 +2,10 @@ from __future__ import annotations
 
 from datetime import timedelta
 from io import StringIO
+from unittest.mock import patch
 
 import pytest
+from django.db.models.signals import post_delete
 from django.utils import timezone
 
 from django_qstash.db.models import TaskStatus
@@ -221,3 +223,105 @@ class TestClearStaleResults:
         clear_stale_results_task(stdout=stdout)
 
         assert "No stale Django QStash task results found" in stdout.getvalue()
+
+
+@pytest.mark.django_db
+class TestClearStaleResultsInBatches:
+    def test_deletes_in_batches(self, create_task_result, stdout):
+        for i in range(5):
+            create_task_result(f"stale-{i}", age=timedelta(days=8))
+        create_task_result("recent-task")
+
+        with patch("django_qstash.results.tasks.time.sleep") as mock_sleep:
+            clear_stale_results_task(stdout=stdout, batch_size=2, sleep=0.5)
+
+        output = stdout.getvalue()
+        assert "Deleted 2 stale results so far" in output
+        assert "Deleted 5 stale results so far" in output
+        assert "Successfully deleted 5 stale results" in output
+        assert TaskResult.objects.get().task_id == "recent-task"
+        assert mock_sleep.call_count == 3
+        mock_sleep.assert_called_with(0.5)
+
+    def test_keeps_errors(self, create_task_result, stdout):
+        create_task_result("stale", age=timedelta(days=8))
+        create_task_result(
+            "stale-error", age=timedelta(days=8), status=TaskStatus.EXECUTION_ERROR
+        )
+
+        clear_stale_results_task(stdout=stdout, batch_size=10)
+
+        assert TaskResult.objects.get().task_id == "stale-error"
+
+    def test_stops_at_max_runtime(self, create_task_result, stdout):
+        for i in range(3):
+            create_task_result(f"stale-{i}", age=timedelta(days=8))
+
+        clear_stale_results_task(stdout=stdout, batch_size=1, max_runtime=0)
+
+        assert TaskResult.objects.count() == 2
+        assert "before reaching the maximum runtime of 0 seconds" in stdout.getvalue()
+
+    def test_delete_receivers_get_their_batch(self, create_task_result, stdout):
+        for i in range(3):
+            create_task_result(f"stale-{i}", age=timedelta(days=8))
+        deleted = []
+
+        def receiver(sender, instance, **kwargs):
+            deleted.append(instance.task_id)
+
+        post_delete.connect(receiver, sender=TaskResult)
+        try:
+            clear_stale_results_task(stdout=stdout, batch_size=2)
+        finally:
+            post_delete.disconnect(receiver, sender=TaskResult)
+
+        assert sorted(deleted) == ["stale-0", "stale-1", "stale-2"]
+
+
+@pytest.mark.django_db
+class TestClearExpiredResults:
+    @pytest.fixture
+    def create_expiring_result(self, create_task_result):
+        def _create(task_id, expires_in, age=None):
+            task_result = create_task_result(task_id, age=age)
+            task_result.expires_at = timezone.now() + expires_in
+            task_result.save()
+            return task_result
+
+        return _create
+
+    def test_deletes_by_expires_at(self, create_expiring_result, stdout):
+        create_expiring_result("expired", expires_in=timedelta(minutes=-1))
+        create_expiring_result(
+            "audit", expires_in=timedelta(days=80), age=timedelta(days=10)
+        )
+
+        clear_stale_results_task(stdout=stdout)
+
+        assert TaskResult.objects.get().task_id == "audit"
+        assert "Successfully deleted 1 stale results" in stdout.getvalue()
+
+    def test_since_only_applies_without_expires_at(
+        self, create_task_result, create_expiring_result, stdout
+    ):
+        create_task_result("stale", age=timedelta(hours=2))
+        create_expiring_result(
+            "audit", expires_in=timedelta(days=80), age=timedelta(hours=2)
+        )
+
+        clear_stale_results_task(since=3600, stdout=stdout)
+
+        assert TaskResult.objects.get().task_id == "audit"
+
+    def test_deletes_in_batches(
+        self, create_task_result, create_expiring_result, stdout
+    ):
+        for i in range(3):
+            create_expiring_result(f"expired-{i}", expires_in=timedelta(minutes=-i))
+        create_task_result("stale", age=timedelta(days=8))
+
+        clear_stale_results_task(stdout=stdout, batch_size=2)
+
+        assert not TaskResult.objects.exists()
+        assert "Deleted 4 stale results so far" in stdout.getvalue()
@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from io import StringIO
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import pytest
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connections
+
+from django_qstash.db.models import TaskStatus
+from django_qstash.results.models import TaskResult
+from django_qstash.results.partitions import ResultPartitions
+from django_qstash.results.partitions import period_start
+from django_qstash.results.tasks import ERROR_STATUSES
+from django_qstash.results.tasks import clear_stale_results_task
+
+TABLE = "django_qstash_results_taskresult"
+
+
+def utc(*args) -> datetime:
+    return datetime(*args, tzinfo=dt_timezone.utc)
+
+
+@pytest.fixture
+def cursor():
+    return MagicMock()
+
+
+@pytest.fixture
+def partitions(cursor):
+    partitions = ResultPartitions("daily")
+    connection = MagicMock(alias="default", vendor="postgresql")
+    connection.ops.quote_name.side_effect = lambda name: f'"{name}"'
+    connection.cursor.return_value.__enter__.return_value = cursor
+    partitions.connection = connection
+    return partitions
+
+
+def executed(cursor) -> list[str]:
+    return [call.args[0] for call in cursor.execute.call_args_list]
+
+
+class TestPeriods:
+    def test_daily(self):
+        assert period_start(utc(2026, 10, 18, 15, 30), "daily") == utc(2026, 10, 18)
+
+    def test_weekly_starts_on_monday(self):
+        # 2026-10-18 is a Sunday
+        assert period_start(utc(2026, 10, 18, 15, 30), "weekly") == utc(2026, 10, 12)
+
+    def test_invalid_period(self):
+        with pytest.raises(ImproperlyConfigured):
+            ResultPartitions("monthly")
+
+
+class TestResultPartitions:
+    def test_partition_names(self, partitions):
+        name = partitions.partition_name(utc(2026, 10, 18), utc(2026, 10, 19))
+        assert name == f"{TABLE}_p20261018_20261019"
+        assert partitions.partition_end(name) == utc(2026, 10, 19)
+
+        legacy = partitions.partition_name(None, utc(2026, 10, 19))
+        assert legacy == f"{TABLE}_pmin_20261019"
+        assert partitions.partition_end(legacy) == utc(2026, 10, 19)
+
+        assert partitions.partition_end(partitions.default_partition) is None
+
+    def test_get_partitions(self, partitions, cursor):
+        cursor.fetchall.return_value = [
+            (f"{TABLE}_p20261019_20261020",),
+            (f"{TABLE}_default",),
+            (f"{TABLE}_pmin_20261019",),
+        ]
+
+        assert partitions.get_partitions() == [
+            (f"{TABLE}_pmin_20261019", utc(2026, 10, 19)),
+            (f"{TABLE}_p20261019_20261020", utc(2026, 10, 20)),
+        ]
+
+    @pytest.mark.django_db
+    def test_create_partitions_continues_from_newest(self, partitions, cursor):
+        cursor.fetchone.return_value = None
+        with patch.object(
+            partitions,
+            "get_partitions",
+            return_value=[(f"{TABLE}_pmin_20261019", utc(2026, 10, 19))],
+        ):
+            created = partitions.create_partitions(ahead=2, now=utc(2026, 10, 18, 12))
+
+        assert created == [
+            f"{TABLE}_p20261019_20261020",
+            f"{TABLE}_p20261020_20261021",
+        ]
+        statements = executed(cursor)
+        assert statements[0].startswith(f'SELECT 1 FROM "{TABLE}_default"')
+        assert "PARTITION OF" in statements[1]
+        assert cursor.execute.call_args_list[1].args[1] == [
+            utc(2026, 10, 19),
+            utc(2026, 10, 20),
+        ]
+        assert len(statements) == 4
+
+    @pytest.mark.django_db
+    def test_create_partition_moves_rows_from_default(self, partitions, cursor):
+        cursor.fetchone.return_value = (1,)
+        with patch.object(partitions, "get_partitions", return_value=[]):
+            partitions.create_partitions(ahead=0, now=utc(2026, 10, 18, 12))
+
+        statements = executed(cursor)
+        assert statements[1] == (
+            f'ALTER TABLE "{TABLE}" DETACH PARTITION "{TABLE}_default"'
+        )
+        assert "PARTITION OF" in statements[2]
+        assert statements[3].startswith(f'WITH moved AS (DELETE FROM "{TABLE}_default"')
+        assert statements[4] == (
+            f'ALTER TABLE "{TABLE}" ATTACH PARTITION "{TABLE}_default" DEFAULT'
+        )
+
+    @pytest.mark.django_db
+    def test_drop_partitions(self, partitions, cursor):
+        # The second partition still holds a failed result
+        cursor.fetchone.side_effect = [None, (1,)]
+        cursor.rowcount = 5
+        with patch.object(
+            partitions,
+            "get_partitions",
+            return_value=[
+                (f"{TABLE}_p20261001_20261002", utc(2026, 10, 2)),
+                (f"{TABLE}_p20261002_20261003", utc(2026, 10, 3)),
+                (f"{TABLE}_p20261003_20261004", utc(2026, 10, 4)),
+            ],
+        ):
+            dropped, deleted_count = partitions.drop_partitions(
+                utc(2026, 10, 3, 12),
+                keep_statuses=ERROR_STATUSES,
+                keep_until=utc(2026, 10, 18),
+            )
+
+        assert dropped == [f"{TABLE}_p20261001_20261002"]
+        assert deleted_count == 5
+        statements = executed(cursor)
+        assert statements[0].startswith(f'SELECT 1 FROM "{TABLE}_p20261001_20261002"')
+        assert statements[1] == (
+            f'ALTER TABLE "{TABLE}" DETACH PARTITION "{TABLE}_p20261001_20261002"'
+        )
+        assert statements[2] == f'DROP TABLE "{TABLE}_p20261001_20261002"'
+        assert statements[4] == (
+            f'DELETE FROM "{TABLE}_p20261002_20261003" WHERE NOT '
+            "(status = ANY(%s) OR (expires_at IS NOT NULL AND expires_at > %s))"
+        )
+        assert len(statements) == 5
+
+    def test_not_supported_on_sqlite(self):
+        partitions = ResultPartitions("daily")
+        assert not partitions.is_supported()
+        assert not partitions.is_partitioned()
+        with pytest.raises(ImproperlyConfigured):
+            partitions.convert()
+
+
+@pytest.mark.django_db
+class TestPartitionedCleanup:
+    def test_drops_partitions_instead_of_rows(self):
+        partitions = MagicMock()
+        partitions.is_partitioned.return_value = True
+        partitions.drop_partitions.return_value = (["a", "b"], 1)
+        partitions.delete_from_default.return_value = 2
+        stdout = StringIO()
+        with (
+            patch(
+                "django_qstash.results.tasks.DJANGO_QSTASH_RESULT_PARTITIONING", "daily"
+            ),
+            patch(
+                "django_qstash.results.tasks.ResultPartitions", return_value=partitions
+            ),
+        ):
+            clear_stale_results_task(stdout=stdout)
+
+        assert partitions.drop_partitions.call_args.kwargs["keep_statuses"] == (
+            ERROR_STATUSES
+        )
+        assert "Dropped 2 stale result partitions and deleted 3" in stdout.getvalue()
+
+    def test_command_requires_postgres(self):
+        with patch(
+            "django_qstash.results.partitions.DJANGO_QSTASH_RESULT_PARTITIONING",
+            "daily",
+        ):
+            with pytest.raises(CommandError):
+                call_command("create_result_partitions")
+
+
+@pytest.mark.skipif(
+    "postgres" not in settings.DATABASES,
+    reason="Set DJANGO_QSTASH_TEST_POSTGRES_HOST to run against PostgreSQL",
+)
+@pytest.mark.django_db(databases=["postgres"])
+class TestOnPostgreSQL:
+    """Runs the partition DDL; the test transaction rolls it back"""
+
+    now = utc(2026, 10, 18, 12)
+
+    @pytest.fixture
+    def partitions(self):
+        return ResultPartitions("daily", using="postgres")
+
+    def insert(self, date_done, status=TaskStatus.SUCCESS, expires_at=None):
+        return TaskResult.objects.using("postgres").create(
+            task_id="msg",
+            task_name="task",
+            status=status,
+            date_done=date_done,
+            expires_at=expires_at,
+        )
+
+    def count(self, table: str) -> int:
+        with connections["postgres"].cursor() as cursor:
+            cursor.execute(f'SELECT count(*) FROM "{table}"')
+            return cursor.fetchone()[0]
+
+    def test_convert(self, partitions):
+        self.insert(utc(2026, 10, 10))
+        self.insert(None, status=TaskStatus.PENDING)
+
+        partitions.convert(now=self.now)
+        self.insert(utc(2026, 10, 18))
+
+        assert partitions.is_partitioned()
+        assert partitions.get_partitions() == [
+            (f"{TABLE}_pmin_20261019", utc(2026, 10, 19))
+        ]
+        assert self.count(f"{TABLE}_pmin_20261019") == 2
+        assert self.count(f"{TABLE}_default") == 1
+        with connections["postgres"].cursor() as cursor:
+            cursor.execute(
+                "SELECT count(*) FROM pg_index WHERE NOT indisvalid AND indrelid IN "
+                "(SELECT to_regclass(%s) UNION SELECT inhrelid FROM pg_inherits "
+                "WHERE inhparent = to_regclass(%s))",
+                [TABLE, TABLE],
+            )
+            assert cursor.fetchone()[0] == 0
+
+    def test_create_partitions_moves_rows_from_default(self, partitions):
+        partitions.convert(now=self.now)
+        # Finished after the last partition, e.g. the cron job did not run
+        self.insert(utc(2026, 10, 20, 8))
+        assert self.count(f"{TABLE}_default") == 1
+
+        created = partitions.create_partitions(ahead=2, now=self.now)
+
+        assert created[-1] == f"{TABLE}_p20261020_20261021"
+        assert self.count(f"{TABLE}_p20261020_20261021") == 1
+        assert self.count(f"{TABLE}_default") == 0
+        assert partitions.create_partitions(ahead=2, now=self.now) == []
+
+    def test_drop_partitions_keeps_partitions_with_kept_rows(self, partitions):
+        partitions.convert(now=self.now)
+        partitions.create_partitions(ahead=2, now=self.now)
+        self.insert(utc(2026, 10, 19, 8))
+        self.insert(utc(2026, 10, 20, 8))
+        failed = self.insert(utc(2026, 10, 20, 9), status=TaskStatus.EXECUTION_ERROR)
+        expiring = self.insert(utc(2026, 10, 20, 10), expires_at=utc(2026, 12, 1))
+
+        dropped, deleted_count = partitions.drop_partitions(
+            utc(2026, 10, 21),
+            keep_statuses=ERROR_STATUSES,
+            keep_until=utc(2026, 10, 22),
+        )
+
+        assert dropped == [f"{TABLE}_pmin_20261019", f"{TABLE}_p20261019_20261020"]
+        assert deleted_count == 1
+        assert self.count(f"{TABLE}_p20261020_20261021") == 2
+        assert self.count(f"{TABLE}_default") == 0
+        assert set(
+            TaskResult.objects.using("postgres").values_list("pk", flat=True)
+        ) == {failed.pk, expiring.pk}
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from unittest.mock import Mock
+from unittest.mock import patch
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.utils import timezone
+
+from django_qstash.app import stashed_task
+from django_qstash.db.models import TaskStatus
+from django_qstash.outbox.models import OutboxMessage
+from django_qstash.outbox.services import flush_outbox
+from django_qstash.results.models import TaskResult
+from django_qstash.results.services import acreate_pending_results
+from django_qstash.results.services import create_pending_results
+from django_qstash.results.writer import ResultWriter
+
+pytestmark = pytest.mark.django_db
+
+
+@stashed_task
+def tracked_task(x):
+    return x * 2
+
+
+@stashed_task(store_result=False)
+def untracked_task(x):
+    return x
+
+
+@pytest.fixture(autouse=True)
+def track_pending():
+    with (
+        patch("django_qstash.results.services.DJANGO_QSTASH_TRACK_PENDING", True),
+        patch("django_qstash.results.backends.DJANGO_QSTASH_TRACK_PENDING", True),
+        patch("django_qstash.outbox.services.DJANGO_QSTASH_TRACK_PENDING", True),
+    ):
+        yield
+
+
+class TestPendingResults:
+    def test_delay_creates_pending_result(self, mock_qstash_client):
+        tracked_task.delay(2)
+
+        result = TaskResult.objects.get()
+        assert result.task_id == "msg-id"
+        assert result.status == TaskStatus.PENDING
+        assert result.task_name == "tracked_task"
+        assert result.function_path == f"{__name__}.tracked_task"
+        assert result.args == [2]
+        assert result.date_done is None
+
+    def test_starmap_creates_pending_results(self, mock_qstash_client):
+        tracked_task.starmap([(1,), (2,)])
+
+        assert list(
+            TaskResult.objects.order_by("task_id").values_list("task_id", "status")
+        ) == [
+            ("batch-id-0", TaskStatus.PENDING),
+            ("batch-id-1", TaskStatus.PENDING),
+        ]
+
+    def test_adelay_creates_pending_result(self):
+        with patch("django_qstash.app.base.publish_message") as mock_publish:
+
+            async def publish(client, message):
+                return Mock(message_id="msg-1")
+
+            mock_publish.side_effect = publish
+            async_to_sync(tracked_task.adelay)(2)
+
+        assert TaskResult.objects.get().status == TaskStatus.PENDING
+
+    def test_untracked_tasks_are_skipped(self, mock_qstash_client):
+        untracked_task.delay(2)
+        assert not TaskResult.objects.exists()
+
+    def test_disabled_by_default(self, mock_qstash_client):
+        with patch("django_qstash.results.services.DJANGO_QSTASH_TRACK_PENDING", False):
+            tracked_task.delay(2)
+        assert not TaskResult.objects.exists()
+
+    def test_webhook_completes_pending_result(
+        self, mock_qstash_client, webhook, build_request
+    ):
+        tracked_task.delay(2)
+        response, status = webhook.handle_request(
+            build_request("tracked_task", [2], message_id="msg-id")
+        )
+
+        assert status == 200
+        result = TaskResult.objects.get()
+        assert result.status == TaskStatus.SUCCESS
+        assert result.result == {"result": 4}
+        assert result.date_created <= result.started_at <= result.date_done
+
+    def test_async_webhook_completes_pending_result(
+        self, mock_qstash_client, webhook, build_request
+    ):
+        tracked_task.delay(2)
+        async_to_sync(webhook.ahandle_request)(
+            build_request("tracked_task", [2], message_id="msg-id")
+        )
+
+        assert TaskResult.objects.get().status == TaskStatus.SUCCESS
+
+    def test_webhook_without_pending_result_inserts(self, webhook, build_request):
+        webhook.handle_request(build_request("tracked_task", [2], message_id="unknown"))
+
+        result = TaskResult.objects.get()
+        assert result.task_id == "unknown"
+        assert result.status == TaskStatus.SUCCESS
+        assert result.started_at is not None
+
+    def test_outbox_flush_creates_pending_results(self):
+        enqueued_at = timezone.now() - timedelta(minutes=5)
+        with (
+            patch("django_qstash.app.base.DJANGO_QSTASH_PUBLISH_MODE", "outbox"),
+            patch("django_qstash.outbox.services.transaction.on_commit"),
+        ):
+            tracked_task.delay(2)
+        OutboxMessage.objects.update(date_created=enqueued_at)
+
+        with patch("django_qstash.outbox.services.qstash_client") as mock_client:
+            mock_client.message.batch_json.return_value = [Mock(message_id="msg-1")]
+            assert flush_outbox() == 1
+
+        result = TaskResult.objects.get()
+        assert result.task_id == "msg-1"
+        assert result.status == TaskStatus.PENDING
+        assert result.args == [2]
+        assert result.date_created == enqueued_at
+
+
+class TestPublisherSlowerThanWebhook:
+    """The webhook can store a result before the publisher inserts PENDING"""
+
+    def test_pending_after_result_is_dropped(self, webhook, build_request):
+        webhook.handle_request(build_request("tracked_task", [2]))
+
+        assert create_pending_results([{"task_id": "msg-1", "task_name": "t"}]) == []
+
+        result = TaskResult.objects.get()
+        assert result.status == TaskStatus.SUCCESS
+
+    def test_async_pending_after_result_is_dropped(self, webhook, build_request):
+        webhook.handle_request(build_request("tracked_task", [2]))
+
+        async_to_sync(acreate_pending_results)([{"task_id": "msg-1"}])
+
+        assert TaskResult.objects.get().status == TaskStatus.SUCCESS
+
+    def test_result_deletes_pending_inserted_meanwhile(self, webhook, build_request):
+        # The publisher inserts PENDING after the webhook found no row to update
+        create = TaskResult.objects.create
+
+        def create_late(**fields):
+            task_result = create(**fields)
+            create(task_id="msg-1", status=TaskStatus.PENDING)
+            return task_result
+
+        with patch.object(TaskResult.objects, "create", side_effect=create_late):
+            webhook.handle_request(build_request("tracked_task", [2]))
+
+        assert TaskResult.objects.get().status == TaskStatus.SUCCESS
+
+    def test_buffered_result_deletes_pending(self, webhook, build_request):
+        writer = ResultWriter()
+        with (
+            patch(
+                "django_qstash.results.backends.DJANGO_QSTASH_RESULT_WRITE_MODE",
+                "buffered",
+            ),
+            patch(
+                "django_qstash.results.backends.get_result_writer", return_value=writer
+            ),
+            patch("django_qstash.results.writer.DJANGO_QSTASH_TRACK_PENDING", True),
+            patch.object(writer, "_ensure_started"),
+        ):
+            webhook.handle_request(build_request("tracked_task", [2]))
+            create_pending_results([{"task_id": "msg-1"}])
+            writer.flush()
+
+        assert TaskResult.objects.get().status == TaskStatus.SUCCESS
+
+    def test_outbox_webhook_runs_during_flush(self, webhook, build_request):
+        with (
+            patch("django_qstash.app.base.DJANGO_QSTASH_PUBLISH_MODE", "outbox"),
+            patch("django_qstash.outbox.services.transaction.on_commit"),
+        ):
+            tracked_task.delay(2)
+
+        def deliver(messages):
+            webhook.handle_request(build_request("tracked_task", [2]))
+            return [Mock(message_id="msg-1")]
+
+        with patch("django_qstash.outbox.services.qstash_client") as mock_client:
+            mock_client.message.batch_json.side_effect = deliver
+            assert flush_outbox() == 1
+
+        assert TaskResult.objects.get().status == TaskStatus.SUCCESS
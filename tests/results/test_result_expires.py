@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+
+from django_qstash.app import stashed_task
+from django_qstash.db.models import TaskStatus
+from django_qstash.results.models import TaskResult
+from django_qstash.results.services import store_task_result
+
+pytestmark = pytest.mark.django_db
+
+
+@stashed_task(result_expires=timedelta(hours=1))
+def short_lived_task(x):
+    return x
+
+
+@stashed_task
+def default_task(x):
+    return x
+
+
+def test_result_expires_accepts_timedelta():
+    assert short_lived_task.result_expires == 3600
+    assert default_task.result_expires is None
+
+
+def test_store_task_result_sets_expires_at():
+    task_result = store_task_result("msg-1", "task", TaskStatus.SUCCESS, expires=60)
+
+    assert task_result.expires_at == task_result.date_done + timedelta(seconds=60)
+
+
+def test_webhook_stamps_expires_at(webhook, build_request):
+    webhook.handle_request(build_request("short_lived_task", [1]))
+
+    task_result = TaskResult.objects.get()
+    assert task_result.expires_at == task_result.date_done + timedelta(hours=1)
+
+
+def test_webhook_without_result_expires(webhook, build_request):
+    webhook.handle_request(build_request("default_task", [1]))
+
+    assert TaskResult.objects.get().expires_at is None
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.utils import timezone
+
+from django_qstash.app import stashed_task
+from django_qstash.db.models import TaskStatus
+from django_qstash.results.models import TaskResult
+from django_qstash.results.models import TaskStats
+from django_qstash.results.stats import DurationSketch
+from django_qstash.results.stats import StatsAccumulator
+from django_qstash.results.stats import get_bucket
+from django_qstash.results.stats import record_task_stats
+from django_qstash.results.stats import summarize_task_stats
+from django_qstash.results.tasks import clear_stale_results_task
+
+pytestmark = pytest.mark.django_db
+
+
+@stashed_task
+def measured_task(x):
+    if x < 0:
+        raise ValueError("negative")
+    return x
+
+
+@pytest.fixture
+def accumulator():
+    accumulator = StatsAccumulator(flush_interval=60)
+    with (
+        patch("django_qstash.results.stats.DJANGO_QSTASH_TASK_STATS", True),
+        patch(
+            "django_qstash.results.stats.get_stats_accumulator",
+            return_value=accumulator,
+        ),
+        patch.object(accumulator, "_ensure_started"),
+    ):
+        yield accumulator
+
+
+class TestDurationSketch:
+    def test_quantiles_are_within_relative_accuracy(self):
+        sketch = DurationSketch()
+        for ms in range(1, 1001):
+            sketch.add(ms / 1000)
+
+        assert sketch.quantile(0.5) == pytest.approx(0.5, rel=0.02)
+        assert sketch.quantile(0.95) == pytest.approx(0.95, rel=0.02)
+        assert DurationSketch().quantile(0.5) is None
+
+    def test_merge_matches_a_single_sketch(self):
+        single, first, second = DurationSketch(), DurationSketch(), DurationSketch()
+        for ms in range(1, 101):
+            single.add(ms / 1000)
+            (first if ms % 2 else second).add(ms / 1000)
+
+        first.merge(DurationSketch.from_dict(second.to_dict()))
+
+        assert first.to_dict() == single.to_dict()
+
+
+class TestStatsAccumulator:
+    def test_flush_merges_into_the_minute_row(self, accumulator):
+        now = timezone.now()
+        with patch("django_qstash.results.stats.timezone.now", return_value=now):
+            record_task_stats("task", TaskStatus.SUCCESS, now - timedelta(seconds=2))
+            record_task_stats("task", TaskStatus.EXECUTION_ERROR)
+            assert accumulator.flush() == 1
+
+            record_task_stats("task", TaskStatus.SUCCESS, now - timedelta(seconds=4))
+            accumulator.flush()
+
+        stats = TaskStats.objects.get()
+        assert stats.bucket == get_bucket(now)
+        assert stats.total_count == 3
+        assert stats.success_count == 2
+        assert stats.failure_count == 1
+        assert stats.duration_count == 2
+        assert stats.min_duration == 2
+        assert stats.max_duration == 4
+        assert stats.avg_duration == 3
+        assert stats.p50_duration == pytest.approx(2, rel=0.02)
+
+    def test_flush_merges_into_a_row_inserted_concurrently(self, accumulator):
+        now = timezone.now()
+        bulk_create = TaskStats.objects.bulk_create
+
+        def insert_first(objs, **kwargs):
+            # Another process flushed the same minute right before us
+            TaskStats.objects.create(
+                task_name="task", bucket=get_bucket(now), total_count=1, success_count=1
+            )
+            return bulk_create(objs, **kwargs)
+
+        accumulator.add("task", TaskStatus.SUCCESS, None, now)
+        with patch.object(TaskStats.objects, "bulk_create", side_effect=insert_first):
+            assert accumulator.flush() == 1
+
+        stats = TaskStats.objects.get()
+        assert stats.total_count == 2
+        assert stats.success_count == 2
+
+    def test_disabled_by_default(self):
+        accumulator = StatsAccumulator()
+        with patch(
+            "django_qstash.results.stats.get_stats_accumulator",
+            return_value=accumulator,
+        ):
+            record_task_stats("task", TaskStatus.SUCCESS)
+        assert accumulator.flush() == 0
+
+    def test_webhook_records_executions(self, accumulator, webhook, build_request):
+        webhook.handle_request(build_request("measured_task", [1]))
+        webhook.handle_request(build_request("measured_task", [-1]))
+        accumulator.flush()
+
+        stats = TaskStats.objects.get()
+        assert stats.success_count == 1
+        assert stats.execution_error_count == 1
+        assert stats.duration_count == 2
+
+    def test_stats_outlive_results(self, accumulator, webhook, build_request):
+        webhook.handle_request(build_request("measured_task", [1]))
+        accumulator.flush()
+        TaskResult.objects.update(date_done=timezone.now() - timedelta(days=30))
+
+        clear_stale_results_task(exclude_errors=False)
+
+        assert not TaskResult.objects.exists()
+        assert TaskStats.objects.get().total_count == 1
+
+
+def test_summarize_task_stats(accumulator):
+    now = timezone.now()
+    accumulator.add("task", TaskStatus.SUCCESS, 1.0, now - timedelta(minutes=1))
+    accumulator.add("task", TaskStatus.INTERNAL_ERROR, 3.0, now)
+    accumulator.add("other", TaskStatus.SUCCESS, None, now)
+    accumulator.flush()
+
+    summary = summarize_task_stats(TaskStats.objects.all())
+
+    assert summary["task"]["total_count"] == 2
+    assert summary["task"]["failure_count"] == 1
+    assert summary["task"]["avg_duration"] == 2.0
+    assert summary["task"]["max_duration"] == 3.0
+    assert summary["other"]["p50_duration"] is None
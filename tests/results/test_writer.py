@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+from django_qstash.app import stashed_task
+from django_qstash.db.models import TaskStatus
+from django_qstash.results.models import TaskResult
+from django_qstash.results.services import store_task_result
+from django_qstash.results.writer import ResultWriter
+
+pytestmark = pytest.mark.django_db
+
+
+@stashed_task(store_result=False)
+def unstored_task(x):
+    return x
+
+
+@stashed_task(store_errors_only=True)
+def errors_only_task(x):
+    if x < 0:
+        raise ValueError("negative")
+    return x
+
+
+@pytest.fixture
+def writer():
+    writer = ResultWriter(buffer_size=2, flush_interval=60)
+    with (
+        patch(
+            "django_qstash.results.backends.DJANGO_QSTASH_RESULT_WRITE_MODE", "buffered"
+        ),
+        patch("django_qstash.results.backends.get_result_writer", return_value=writer),
+    ):
+        yield writer
+    writer.shutdown()
+
+
+class TestResultWriter:
+    def test_buffers_successful_results(self, writer):
+        with patch.object(writer, "_ensure_started"):
+            assert store_task_result("a", "task", TaskStatus.SUCCESS) is None
+            assert not TaskResult.objects.exists()
+
+            assert writer.flush() == 1
+        assert TaskResult.objects.get().task_id == "a"
+
+    def test_writes_errors_immediately(self, writer):
+        with patch.object(writer, "_ensure_started"):
+            result = store_task_result(
+                "a", "task", TaskStatus.EXECUTION_ERROR, traceback="boom"
+            )
+
+        assert result.pk is not None
+        assert writer.flush() == 0
+
+    def test_wakes_writer_when_buffer_is_full(self, writer):
+        with patch.object(writer, "_ensure_started"):
+            store_task_result("a", "task", TaskStatus.SUCCESS)
+            assert not writer._wakeup.is_set()
+            store_task_result("b", "task", TaskStatus.SUCCESS)
+        assert writer._wakeup.is_set()
+
+    def test_shutdown_writes_buffered_results(self, writer):
+        with patch.object(writer, "_ensure_started"):
+            store_task_result("a", "task", TaskStatus.SUCCESS)
+        writer.shutdown()
+
+        assert TaskResult.objects.count() == 1
+        # Results stored after shutdown are written synchronously
+        store_task_result("b", "task", TaskStatus.SUCCESS)
+        assert TaskResult.objects.count() == 2
+
+    def test_write_errors_are_logged(self, writer):
+        with (
+            patch.object(writer, "_ensure_started"),
+            patch.object(TaskResult.objects, "bulk_create", side_effect=Exception),
+        ):
+            store_task_result("a", "task", TaskStatus.SUCCESS)
+            assert writer.flush() == 1
+
+
+class TestStoreResultOptions:
+    def test_store_result_false(self, webhook, build_request):
+        response, status = webhook.handle_request(build_request("unstored_task", [1]))
+
+        assert status == 200
+        assert not TaskResult.objects.exists()
+
+    def test_store_errors_only(self, webhook, build_request):
+        webhook.handle_request(build_request("errors_only_task", [1]))
+        assert not TaskResult.objects.exists()
+
+        response, status = webhook.handle_request(
+            build_request("errors_only_task", [-1])
+        )
+
+        assert status == 422
+        assert TaskResult.objects.get().status == TaskStatus.EXECUTION_ERROR
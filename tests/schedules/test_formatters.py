@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 import json
+from unittest.mock import patch
 
 import pytest
 
 from django_qstash.callbacks import get_callback_url
+from django_qstash.compression import decompress_body
 from django_qstash.schedules.formatters import format_task_schedule_for_qstash
 from django_qstash.schedules.formatters import prepare_qstash_payload
 from django_qstash.schedules.models import TaskSchedule
+from django_qstash.serializers import get_serializer
 
 
 @pytest.mark.django_db
@@ -79,3 +82,24 @@ class TestFormatters:
 
         # Verify schedule_id is not in data
         assert "schedule_id" not in data
+
+    def test_format_task_schedule_compresses_large_payload(
+        self, task_schedule: TaskSchedule
+    ):
+        """Test large schedule payloads are compressed"""
+        task_schedule.args = ["lorem ipsum " * 1000]
+        task_schedule.save()
+
+        with (
+            patch("django_qstash.compression.DJANGO_QSTASH_COMPRESSION", "gzip"),
+            patch(
+                "django_qstash.compression.DJANGO_QSTASH_COMPRESSION_THRESHOLD", 1024
+            ),
+        ):
+            data = format_task_schedule_for_qstash(task_schedule)
+
+        body = json.loads(data["body"])
+        assert body["compression"] == "gzip"
+        assert decompress_body(body, get_serializer("json"))["args"] == [
+            "lorem ipsum " * 1000
+        ]
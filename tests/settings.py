@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import os
+
 SECRET_KEY = "NOTASECRET"
 
 DEBUG = True
@@ -10,10 +12,25 @@ DATABASES = {
     }
 }
 
+# PostgreSQL-only tests (e.g. result partitions) run against this database
+# when DJANGO_QSTASH_TEST_POSTGRES_HOST is set, and are skipped otherwise.
+if os.environ.get("DJANGO_QSTASH_TEST_POSTGRES_HOST"):
+    DATABASES["postgres"] = {
+        "ENGINE": "django.db.backends.postgresql",
+        "HOST": os.environ["DJANGO_QSTASH_TEST_POSTGRES_HOST"],
+        "PORT": os.environ.get("DJANGO_QSTASH_TEST_POSTGRES_PORT", ""),
+        "NAME": os.environ.get("DJANGO_QSTASH_TEST_POSTGRES_NAME", "postgres"),
+        "USER": os.environ.get("DJANGO_QSTASH_TEST_POSTGRES_USER", "postgres"),
+        "PASSWORD": os.environ.get("DJANGO_QSTASH_TEST_POSTGRES_PASSWORD", ""),
+    }
+
 INSTALLED_APPS: list[str] = [
     "django_qstash",
     "django_qstash.results",
     "django_qstash.schedules",
+    "django_qstash.outbox",
+    "django_qstash.claimcheck",
+    "django_qstash.canvas",
     "tests.discovery",
 ]
 
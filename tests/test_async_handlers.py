@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import json
+import threading
+from unittest.mock import patch
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+
+from django_qstash.app import stashed_task
+from django_qstash.db.models import TaskStatus
+from django_qstash.handlers import QStashWebhook
+from django_qstash.handlers import get_webhook
+from django_qstash.results.models import TaskResult
+from django_qstash.views import async_qstash_webhook_view
+
+pytestmark = pytest.mark.django_db
+
+
+@stashed_task
+async def async_add(x, y):
+    await asyncio.sleep(0)
+    return x + y
+
+
+@stashed_task
+def sync_thread_name():
+    return threading.current_thread().name
+
+
+def test_ahandle_request_awaits_async_task(webhook, build_request):
+    response, status = async_to_sync(webhook.ahandle_request)(
+        build_request("async_add", [2, 3])
+    )
+
+    assert status == 200
+    assert response["result"] == 5
+    task_result = TaskResult.objects.get(task_id="msg-1")
+    assert task_result.status == TaskStatus.SUCCESS
+    assert task_result.result == {"result": 5}
+
+
+def test_ahandle_request_runs_sync_task_in_pool(webhook, build_request):
+    response, status = async_to_sync(webhook.ahandle_request)(
+        build_request("sync_thread_name", [])
+    )
+
+    assert status == 200
+    assert response["result"].startswith("django-qstash-task")
+
+
+def test_ahandle_request_task_error(webhook, build_request):
+    response, status = async_to_sync(webhook.ahandle_request)(
+        build_request("async_add", [2, "x"])
+    )
+
+    assert status == 422
+    assert response["error_type"] == "TaskError"
+    assert TaskResult.objects.get(task_id="msg-1").status == (
+        TaskStatus.EXECUTION_ERROR
+    )
+
+
+def test_ahandle_request_signature_error(build_request):
+    request = build_request("async_add", [2, 3])
+    request.headers = {}
+
+    response, status = async_to_sync(QStashWebhook().ahandle_request)(request)
+
+    assert status == 400
+    assert response["error_type"] == "SignatureError"
+
+
+def test_sync_handler_awaits_async_task(webhook, build_request):
+    response, status = webhook.handle_request(build_request("async_add", [2, 3]))
+
+    assert status == 200
+    assert response["result"] == 5
+
+
+def test_async_view():
+    payload = {
+        "function": "async_add",
+        "module": __name__,
+        "args": [1, 2],
+        "kwargs": {},
+    }
+
+    async def post():
+        return await AsyncClient().post(
+            "/qstash/async-webhook/",
+            data=json.dumps(payload),
+            content_type="application/json",
+            headers={"Upstash-Message-Id": "msg-2"},
+        )
+
+    with (
+        patch("django_qstash.views.get_webhook", return_value=get_webhook()),
+        patch.object(get_webhook(), "verify_signature"),
+    ):
+        response = async_to_sync(post)()
+
+    assert response.status_code == 200
+    assert json.loads(response.content)["result"] == 3
+
+
+def test_async_view_stays_a_coroutine_function():
+    assert inspect.iscoroutinefunction(async_qstash_webhook_view)
+    assert async_qstash_webhook_view.csrf_exempt
+
+
+def test_async_view_rejects_get():
+    async def get():
+        return await AsyncClient().get("/qstash/async-webhook/")
+
+    assert async_to_sync(get)().status_code == 405
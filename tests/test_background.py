@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import threading
+from unittest.mock import Mock
+from unittest.mock import patch
+
+from django_qstash.background import ProcessSingleton
+
+
+class Worker:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+        self.shutdown = Mock()
+
+    def _reset(self):
+        self.held = []
+
+
+def build_singleton(**kwargs) -> ProcessSingleton:
+    with patch("django_qstash.background.atexit.register"):
+        return ProcessSingleton(Worker, **kwargs)
+
+
+def test_instance_is_created_once():
+    singleton = build_singleton()
+
+    assert singleton.instance is None
+    assert singleton.get() is singleton.get()
+
+
+def test_shutdown_only_created_instance():
+    singleton = build_singleton(shutdown_timeout=5)
+    singleton.shutdown()
+
+    singleton.get()
+    singleton.shutdown()
+
+    singleton.instance.shutdown.assert_called_once_with(timeout=5)
+
+
+def test_registers_shutdown_at_exit():
+    with patch("django_qstash.background.atexit.register") as mock_register:
+        singleton = ProcessSingleton(Worker)
+
+    mock_register.assert_called_once_with(singleton.shutdown)
+
+
+def test_fork_resets_instance():
+    singleton = build_singleton()
+    worker = singleton.get()
+    worker.held.append("item")
+    lock = worker._lock
+
+    singleton._reset_after_fork()
+
+    assert singleton.get() is worker
+    assert worker.held == []
+    assert worker._lock is not lock
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import pytest
+from asgiref.sync import async_to_sync
+
+from django_qstash.app import stashed_task
+from django_qstash.db.models import TaskStatus
+from django_qstash.results.models import TaskResult
+
+pytestmark = pytest.mark.django_db
+
+
+@stashed_task
+def add(x, y):
+    if x < 0:
+        raise ValueError("negative")
+    return x + y
+
+
+@stashed_task(max_retries=1)
+def add_once(x, y):
+    if x < 0:
+        raise ValueError("negative")
+    return x + y
+
+
+class TestPublishBundle:
+    def test_bundle_packs_items_per_message(self, mock_qstash_client):
+        results = add.bundle([(1, 2), (3, 4), (5, 6)], size=2)
+
+        assert [result.task_id for result in results] == ["batch-id-0", "batch-id-1"]
+        messages = mock_qstash_client.message.batch_json.call_args[0][0]
+        assert [message["body"]["args"] for message in messages] == [
+            ([1, 2], [3, 4]),
+            ([5, 6],),
+        ]
+        assert all(message["body"]["kwargs"] == {} for message in messages)
+        assert all(message["body"]["bundle"] == {"attempt": 0} for message in messages)
+
+    def test_bundle_remembers_countdown(self, mock_qstash_client):
+        add.bundle([(1, 2)], countdown=30)
+
+        message = mock_qstash_client.message.batch_json.call_args[0][0][0]
+        assert message["delay"] == "30s"
+        assert message["body"]["bundle"] == {"attempt": 0, "countdown": 30}
+
+    def test_bundle_empty(self, mock_qstash_client):
+        assert add.bundle([]) == []
+        mock_qstash_client.message.batch_json.assert_not_called()
+
+    def test_bundle_rejects_invalid_size(self):
+        with pytest.raises(ValueError):
+            add.bundle([(1, 2)], size=0)
+
+
+class TestHandleBundle:
+    def test_runs_every_item(self, webhook, build_request):
+        response, status = webhook.handle_request(
+            build_request("add", [[1, 2], [3, 4]], bundle={"attempt": 0})
+        )
+
+        assert status == 200
+        assert response["result"] == {
+            "total": 2,
+            "succeeded": 2,
+            "failed": 0,
+            "retried": False,
+        }
+        results = TaskResult.objects.filter(task_id__startswith="msg-1:")
+        assert {result.task_id: result.result for result in results} == {
+            "msg-1:0": {"result": 3},
+            "msg-1:1": {"result": 7},
+        }
+        assert all(result.status == TaskStatus.SUCCESS for result in results)
+        summary = TaskResult.objects.get(task_id="msg-1")
+        assert summary.result == response["result"]
+
+    def test_republishes_failed_items(self, webhook, mock_qstash_client, build_request):
+        response, status = webhook.handle_request(
+            build_request("add", [[1, 2], [-1, 2], [-3, 4]], bundle={"attempt": 0})
+        )
+
+        assert status == 200
+        assert response["result"]["failed"] == 2
+        assert response["result"]["retried"] is True
+        message = mock_qstash_client.message.batch_json.call_args[0][0][0]
+        assert message["body"]["args"] == ([-1, 2], [-3, 4])
+        assert message["body"]["bundle"] == {
+            "attempt": 1,
+            "task_ids": ["msg-1:1", "msg-1:2"],
+        }
+        failed = TaskResult.objects.filter(status=TaskStatus.RETRY)
+        assert sorted(failed.values_list("task_id", flat=True)) == [
+            "msg-1:1",
+            "msg-1:2",
+        ]
+        assert "negative" in failed.first().traceback
+
+    def test_republished_items_keep_task_ids(
+        self, webhook, mock_qstash_client, build_request
+    ):
+        webhook.handle_request(
+            build_request(
+                "add_once", [[-1, 2]], bundle={"attempt": 1, "task_ids": ["msg-0:4"]}
+            )
+        )
+
+        assert TaskResult.objects.get(task_id="msg-0:4").status == (
+            TaskStatus.EXECUTION_ERROR
+        )
+
+    def test_republish_keeps_countdown_and_options(
+        self, webhook, mock_qstash_client, build_request
+    ):
+        webhook.handle_request(
+            build_request(
+                "add",
+                [[-1, 2]],
+                bundle={"attempt": 0, "countdown": 30},
+                options={"max_retries": 5},
+            )
+        )
+
+        message = mock_qstash_client.message.batch_json.call_args[0][0][0]
+        assert message["delay"] == "30s"
+        assert message["retries"] == 5
+        assert message["body"]["bundle"]["countdown"] == 30
+        assert message["body"]["options"]["max_retries"] == 5
+
+    def test_stops_retrying_after_max_retries(
+        self, webhook, mock_qstash_client, build_request
+    ):
+        response, status = webhook.handle_request(
+            build_request("add_once", [[-1, 2]], bundle={"attempt": 1})
+        )
+
+        assert status == 200
+        assert response["result"]["retried"] is False
+        mock_qstash_client.message.batch_json.assert_not_called()
+        assert TaskResult.objects.get(task_id="msg-1:0").status == (
+            TaskStatus.EXECUTION_ERROR
+        )
+
+    def test_async_handler(self, webhook, build_request):
+        response, status = async_to_sync(webhook.ahandle_request)(
+            build_request("add", [[1, 2], [3, 4]], bundle={"attempt": 0})
+        )
+
+        assert status == 200
+        assert response["result"]["succeeded"] == 2
+        assert TaskResult.objects.filter(task_id__startswith="msg-1:").count() == 2
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import json
+from unittest.mock import patch
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+
+from django_qstash.app import stashed_task
+from django_qstash.compression import compress_body
+from django_qstash.compression import decompress_body
+from django_qstash.exceptions import PayloadError
+from django_qstash.handlers import QStashWebhook
+from django_qstash.serializers import get_serializer
+
+BODY = {
+    "function": "test_func",
+    "module": "test_module",
+    "args": ["lorem ipsum " * 1000],
+    "kwargs": {"key": "value"},
+}
+
+
+@pytest.fixture(params=["gzip", "zstd"])
+def codec(request):
+    if request.param == "zstd":
+        pytest.importorskip("zstandard")
+    with (
+        patch("django_qstash.compression.DJANGO_QSTASH_COMPRESSION", request.param),
+        patch("django_qstash.compression.DJANGO_QSTASH_COMPRESSION_THRESHOLD", 1024),
+    ):
+        yield request.param
+
+
+@pytest.mark.parametrize("serializer_name", ["json", "orjson", "msgpack"])
+def test_compress_roundtrip(codec, serializer_name):
+    if serializer_name != "json":
+        pytest.importorskip(serializer_name)
+    serializer = get_serializer(serializer_name)
+    compressed = compress_body(BODY, serializer)
+
+    assert compressed["compression"] == codec
+    assert len(serializer.dumps(compressed)) * 5 < len(serializer.dumps(BODY))
+    assert decompress_body(compressed, serializer) == BODY
+
+
+def test_small_bodies_are_not_compressed(codec):
+    body = {**BODY, "args": ["short"]}
+    assert compress_body(body, get_serializer("json")) is body
+
+
+def test_compression_disabled_by_default():
+    assert compress_body(BODY, get_serializer("json")) is BODY
+
+
+def test_unknown_codec():
+    with patch("django_qstash.compression.DJANGO_QSTASH_COMPRESSION", "brotli"):
+        with pytest.raises(ImproperlyConfigured, match="Unknown DJANGO_QSTASH"):
+            compress_body(BODY, get_serializer("json"))
+
+
+def test_decompress_invalid_payload():
+    with pytest.raises(PayloadError, match="Invalid gzip compressed payload"):
+        decompress_body({"compression": "gzip", "data": "bm90IGd6aXA="}, None)
+    with pytest.raises(PayloadError, match="Unknown payload compression"):
+        decompress_body({"compression": "lz4", "data": ""}, None)
+
+
+def test_webhook_parses_compressed_payload(codec):
+    serializer = get_serializer("json")
+    body = json.dumps(compress_body(BODY, serializer))
+
+    payload = QStashWebhook().parse_payload(body, "application/json")
+
+    assert payload.args == BODY["args"]
+    assert payload.kwargs == BODY["kwargs"]
+
+
+@stashed_task
+def echo_task(text):
+    return text
+
+
+def test_delay_compresses_large_body(codec):
+    with patch("django_qstash.app.base.qstash_client") as mock_client:
+        echo_task.delay("lorem ipsum " * 1000)
+
+    body = mock_client.message.publish_json.call_args.kwargs["body"]
+    assert body["compression"] == codec
+    assert decompress_body(body, get_serializer("json"))["args"] == [
+        "lorem ipsum " * 1000
+    ]
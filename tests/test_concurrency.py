@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import json
+import pickle
+import threading
+from unittest.mock import patch
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import Client
+
+from django_qstash.app import stashed_task
+from django_qstash.concurrency import ConcurrencyLimit
+from django_qstash.concurrency import acquire_slots
+from django_qstash.concurrency import release_slots
+from django_qstash.exceptions import ConcurrencyLimitExceeded
+from django_qstash.handlers import get_webhook
+
+pytestmark = pytest.mark.django_db
+
+
+@stashed_task(concurrency=2)
+def limited_task(x):
+    return x
+
+
+@stashed_task
+def unlimited_task(x):
+    return x
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+def test_limit_hands_out_each_slot_once():
+    limit = ConcurrencyLimit("test", 3)
+    slots = [limit.acquire() for _ in range(3)]
+
+    assert sorted(slots) == sorted(limit.keys)
+    assert limit.acquire() is None
+    release_slots(slots[:1])
+    assert limit.acquire() == slots[0]
+
+
+def test_limit_is_safe_across_threads():
+    limit = ConcurrencyLimit("threads", 5)
+    acquired = []
+    barrier = threading.Barrier(20)
+
+    def worker():
+        barrier.wait()
+        acquired.append(limit.acquire())
+
+    threads = [threading.Thread(target=worker) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    held = [slot for slot in acquired if slot is not None]
+    assert sorted(held) == sorted(limit.keys)
+
+
+def test_acquire_slots_releases_on_failure():
+    task_slots = acquire_slots(limited_task)
+    acquire_slots(limited_task)
+    with patch("django_qstash.concurrency.DJANGO_QSTASH_MAX_CONCURRENCY", 5):
+        with pytest.raises(ConcurrencyLimitExceeded) as exc_info:
+            acquire_slots(limited_task)
+        # The global slot taken before the task limit failed was freed
+        assert cache.get_many(ConcurrencyLimit("global", 5).keys) == {}
+    assert exc_info.value.retry_after == 10
+    release_slots(task_slots)
+
+
+def test_limit_exceeded_survives_pickling():
+    error = pickle.loads(pickle.dumps(ConcurrencyLimitExceeded("Busy", 10)))
+
+    assert str(error) == "Busy"
+    assert error.retry_after == 10
+
+
+def test_webhook_rejects_over_task_limit(webhook, build_request):
+    held = [acquire_slots(limited_task), acquire_slots(limited_task)]
+
+    response, status = webhook.handle_request(build_request("limited_task", [1]))
+    assert status == 429
+    assert response["error_type"] == "ConcurrencyLimitExceeded"
+    assert response["retry_after"] == 10
+
+    release_slots(held[0])
+    response, status = webhook.handle_request(build_request("limited_task", [1]))
+    assert status == 200
+    # The delivery released its slot when it finished
+    assert (
+        len(cache.get_many(ConcurrencyLimit(f"task:{limited_task.task_path}", 2).keys))
+        == 1
+    )
+
+
+def test_global_limit(webhook, build_request):
+    with patch("django_qstash.concurrency.DJANGO_QSTASH_MAX_CONCURRENCY", 1):
+        held = acquire_slots(unlimited_task)
+        _, status = webhook.handle_request(build_request("unlimited_task", [1]))
+        assert status == 429
+        release_slots(held)
+        _, status = webhook.handle_request(build_request("unlimited_task", [1]))
+        assert status == 200
+
+
+def test_async_webhook_rejects_over_limit(webhook, build_request):
+    acquire_slots(limited_task)
+    acquire_slots(limited_task)
+
+    response, status = async_to_sync(webhook.ahandle_request)(
+        build_request("limited_task", [1])
+    )
+
+    assert status == 429
+
+
+def test_view_sends_retry_after_header():
+    acquire_slots(limited_task)
+    acquire_slots(limited_task)
+    with patch.object(get_webhook(), "verify_signature"):
+        response = Client().post(
+            "/qstash/webhook/",
+            data=json.dumps(
+                {
+                    "function": "limited_task",
+                    "module": __name__,
+                    "args": [1],
+                    "kwargs": {},
+                }
+            ),
+            content_type="application/json",
+            headers={"Upstash-Message-Id": "msg-1"},
+        )
+
+    assert response.status_code == 429
+    assert response["Retry-After"] == "10"
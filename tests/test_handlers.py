@@ -6,12 +6,21 @@ from unittest.mock import patch
 
 import pytest
 from django.http import HttpRequest
+from django.test import override_settings
 
+from django_qstash.app import stashed_task
 from django_qstash.exceptions import PayloadError
 from django_qstash.exceptions import SignatureError
 from django_qstash.exceptions import TaskError
 from django_qstash.handlers import QStashWebhook
 from django_qstash.handlers import TaskPayload
+from django_qstash.handlers import get_webhook
+
+
+@stashed_task
+def registered_task(a, b, key=None):
+    return [a, b, key]
+
 
 # Add pytest mark for database access
 pytestmark = pytest.mark.django_db
@@ -57,9 +66,19 @@ class TestQStashWebhook:
         with pytest.raises(PayloadError, match="Invalid JSON payload"):
             webhook.parse_payload("invalid json")
 
-    def test_execute_task_import_error(self, webhook):
+    def test_execute_task_unknown_task(self, webhook):
         payload = Mock(function_path="nonexistent.module")
-        with pytest.raises(TaskError, match="Could not import task function"):
+        with (
+            patch("importlib.import_module") as mock_import,
+            pytest.raises(TaskError, match="Unknown task 'nonexistent.module'"),
+        ):
+            webhook.execute_task(payload)
+        mock_import.assert_not_called()
+
+    def test_execute_task_rejects_unregistered_callable(self, webhook):
+        # Importable, but not a django_qstash task
+        payload = Mock(function_path="os.system", args=["true"], kwargs={})
+        with pytest.raises(TaskError, match="Unknown task 'os.system'"):
             webhook.execute_task(payload)
 
     def test_handle_request_success(self, webhook):
@@ -134,18 +153,31 @@ class TestQStashWebhook:
         assert response["error"] == "An unexpected error occurred"
         assert response["task_name"] is None
 
-    def test_execute_task_with_actual_func(self, webhook):
-        def actual_function(*args, **kwargs):
-            return "actual result"
+    def test_execute_registered_task(self, webhook):
+        payload = Mock(
+            function_path=f"{__name__}.registered_task",
+            args=[1, 2],
+            kwargs={"key": "value"},
+        )
 
-        mock_func = Mock()
-        mock_func.actual_func = actual_function
+        result = webhook.execute_task(payload)
 
-        payload = Mock(function_path="test.path", args=[1, 2], kwargs={"key": "value"})
+        assert result == [1, 2, "value"]
 
-        with patch(
-            "django_qstash.handlers.utils.import_string", return_value=mock_func
-        ):
-            result = webhook.execute_task(payload)
 
-        assert result == "actual result"
+class TestGetWebhook:
+    def test_webhook_is_reused(self):
+        assert get_webhook() is get_webhook()
+
+    def test_webhook_rebuilt_when_settings_change(self):
+        webhook = get_webhook()
+        with override_settings(QSTASH_CURRENT_SIGNING_KEY="rotated-key"):
+            rotated = get_webhook()
+            assert rotated is not webhook
+            assert rotated.receiver._current_signing_key == "rotated-key"
+        assert get_webhook().receiver._current_signing_key == "current-key"
+
+    def test_webhook_kept_for_unrelated_settings(self):
+        webhook = get_webhook()
+        with override_settings(DEBUG=False):
+            assert get_webhook() is webhook
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+
+from django_qstash.app import stashed_task
+from django_qstash.idempotency import CLAIMED
+from django_qstash.idempotency import DONE
+from django_qstash.idempotency import RUNNING
+from django_qstash.idempotency import DeliveryClaim
+
+pytestmark = pytest.mark.django_db
+
+calls = []
+
+
+@stashed_task(idempotent=True)
+def expensive_task(x):
+    calls.append(x)
+    if x < 0:
+        raise ValueError("negative")
+    return x * 2
+
+
+@stashed_task
+def regular_task(x):
+    calls.append(x)
+    return x
+
+
+@pytest.fixture(autouse=True)
+def reset():
+    cache.clear()
+    calls.clear()
+
+
+def test_claim_lifecycle():
+    claim = DeliveryClaim("msg-1")
+    assert claim.claim() == (CLAIMED, None)
+    assert DeliveryClaim("msg-1").claim() == (RUNNING, None)
+    claim.complete({"value": 1})
+    assert DeliveryClaim("msg-1").claim() == (DONE, {"value": 1})
+
+
+def test_released_claim_can_be_claimed_again():
+    claim = DeliveryClaim("msg-1")
+    claim.claim()
+    claim.release()
+    assert DeliveryClaim("msg-1").claim() == (CLAIMED, None)
+
+
+def test_stale_claim_expires():
+    with patch("django_qstash.idempotency.DJANGO_QSTASH_IDEMPOTENCY_CLAIM_TIMEOUT", 0):
+        DeliveryClaim("msg-1").claim()
+    assert DeliveryClaim("msg-1").claim() == (CLAIMED, None)
+
+
+def test_redelivery_returns_stored_result(webhook, build_request):
+    first, first_status = webhook.handle_request(build_request("expensive_task", [2]))
+    second, second_status = webhook.handle_request(build_request("expensive_task", [2]))
+
+    assert first_status == second_status == 200
+    assert first["result"] == second["result"] == 4
+    assert calls == [2]
+
+
+def test_running_delivery_is_rejected(webhook, build_request):
+    DeliveryClaim("msg-1").claim()
+
+    response, status = webhook.handle_request(build_request("expensive_task", [2]))
+
+    assert status == 409
+    assert response["error_type"] == "DuplicateDelivery"
+    assert calls == []
+
+
+def test_failed_delivery_releases_claim(webhook, build_request):
+    _, status = webhook.handle_request(build_request("expensive_task", [-1]))
+    assert status == 422
+    assert DeliveryClaim("msg-1").claim() == (CLAIMED, None)
+
+
+def test_regular_tasks_are_not_guarded(webhook, build_request):
+    webhook.handle_request(build_request("regular_task", [1]))
+    webhook.handle_request(build_request("regular_task", [1]))
+    assert calls == [1, 1]
+
+
+def test_async_redelivery_returns_stored_result(webhook, build_request):
+    ahandle = async_to_sync(webhook.ahandle_request)
+    first, _ = ahandle(build_request("expensive_task", [3]))
+    second, status = ahandle(build_request("expensive_task", [3]))
+
+    assert status == 200
+    assert first["result"] == second["result"] == 6
+    assert calls == [3]
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import threading
+from unittest.mock import Mock
+from unittest.mock import patch
+
+import pytest
+
+from django_qstash.app import stashed_task
+from django_qstash.app.base import AsyncResult
+from django_qstash.exceptions import PublishDropped
+from django_qstash.exceptions import PublishError
+from django_qstash.exceptions import PublishQueueFull
+from django_qstash.publisher import BackgroundPublisher
+
+
+@stashed_task
+def background_task(x, y):
+    return x + y
+
+
+@pytest.fixture
+def mock_qstash_client():
+    with patch("django_qstash.publisher.qstash_client") as mock_client:
+        mock_client.message.batch_json = Mock(
+            side_effect=lambda messages: [
+                Mock(message_id=f"id-{message['body']}") for message in messages
+            ]
+        )
+        yield mock_client
+
+
+class TestBackgroundPublisher:
+    def test_submit_resolves_message_id(self, mock_qstash_client):
+        publisher = BackgroundPublisher(workers=1)
+        future = publisher.submit({"url": "https://example.com", "body": 1})
+
+        assert future.result(timeout=5) == "id-1"
+        publisher.shutdown(timeout=5)
+
+    def test_worker_coalesces_queued_messages(self, mock_qstash_client):
+        publisher = BackgroundPublisher(workers=1, batch_size=10)
+        release = threading.Event()
+        first_batch = mock_qstash_client.message.batch_json.side_effect
+
+        def blocking_batch_json(messages):
+            release.wait(timeout=5)
+            return first_batch(messages)
+
+        mock_qstash_client.message.batch_json.side_effect = blocking_batch_json
+        futures = [publisher.submit({"body": i}) for i in range(5)]
+        release.set()
+        publisher.flush()
+
+        assert [future.result(timeout=5) for future in futures] == [
+            f"id-{i}" for i in range(5)
+        ]
+        # The first message is sent alone while the remaining four are coalesced
+        assert mock_qstash_client.message.batch_json.call_count <= 2
+        publisher.shutdown(timeout=5)
+
+    def test_publish_error_is_set_on_futures(self, mock_qstash_client):
+        mock_qstash_client.message.batch_json.side_effect = Exception("QStash down")
+        publisher = BackgroundPublisher(workers=1)
+        future = publisher.submit({"body": 1})
+
+        with pytest.raises(Exception, match="QStash down"):
+            future.result(timeout=5)
+        publisher.shutdown(timeout=5)
+
+    def test_shutdown_publishes_queued_messages(self, mock_qstash_client):
+        publisher = BackgroundPublisher(workers=2)
+        futures = [publisher.submit({"body": i}) for i in range(20)]
+        publisher.shutdown(timeout=5)
+
+        assert all(future.done() for future in futures)
+        with pytest.raises(PublishError):
+            publisher.submit({"body": 21})
+
+    @pytest.mark.parametrize("full_policy", ["drop", "raise"])
+    def test_full_queue_policy(self, mock_qstash_client, full_policy):
+        publisher = BackgroundPublisher(
+            max_queue_size=1, workers=1, full_policy=full_policy
+        )
+        # Keep the worker from draining the queue
+        publisher._threads = [Mock()]
+        publisher.submit({"body": 1})
+
+        if full_policy == "raise":
+            with pytest.raises(PublishQueueFull):
+                publisher.submit({"body": 2})
+        else:
+            future = publisher.submit({"body": 2})
+            with pytest.raises(PublishDropped):
+                AsyncResult(future=future).id
+
+    def test_invalid_full_policy(self):
+        with pytest.raises(ValueError):
+            BackgroundPublisher(full_policy="ignore")
+
+
+def test_background_publish_mode(mock_qstash_client):
+    publisher = BackgroundPublisher(workers=1)
+    with (
+        patch("django_qstash.app.base.DJANGO_QSTASH_PUBLISH_MODE", "background"),
+        patch(
+            "django_qstash.app.base.get_background_publisher", return_value=publisher
+        ),
+        patch("django_qstash.app.base.qstash_client") as mock_base_client,
+    ):
+        result = background_task.delay(2, 3)
+        results = background_task.starmap([(4, 5)])
+
+    mock_base_client.message.publish_json.assert_not_called()
+    assert result.id.startswith("id-")
+    assert results[0].id.startswith("id-")
+    publisher.shutdown(timeout=5)
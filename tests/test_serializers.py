@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import datetime
+import decimal
+import uuid
+from unittest.mock import Mock
+from unittest.mock import patch
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+
+from django_qstash.exceptions import PayloadError
+from django_qstash.handlers import QStashWebhook
+from django_qstash.serializers import batch_messages
+from django_qstash.serializers import get_serializer
+from django_qstash.serializers import get_serializer_for_content_type
+from django_qstash.serializers import publish_message
+
+PAYLOAD = {
+    "function": "test_func",
+    "module": "test_module",
+    "args": [
+        datetime.datetime(2025, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc),
+        datetime.date(2025, 1, 2),
+        uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        decimal.Decimal("1.10"),
+    ],
+    "kwargs": {"key": "value"},
+}
+
+
+def test_unknown_serializer():
+    with pytest.raises(ImproperlyConfigured, match="Unknown DJANGO_QSTASH_SERIALIZER"):
+        get_serializer("pickle")
+
+
+def test_json_serializer_uses_sdk_json():
+    message_api = Mock()
+    message = {"url": "https://example.com", "body": {"args": [1]}}
+
+    publish_message(message_api, message)
+    batch_messages(message_api, [message])
+
+    message_api.publish_json.assert_called_once_with(**message)
+    message_api.batch_json.assert_called_once_with([message])
+
+
+def test_msgpack_round_trip():
+    pytest.importorskip("msgpack")
+    serializer = get_serializer("msgpack")
+
+    encoded = serializer.dumps(PAYLOAD)
+
+    assert isinstance(encoded, str)
+    assert serializer.loads(encoded) == PAYLOAD
+
+
+def test_orjson_encodes_native_types():
+    pytest.importorskip("orjson")
+    serializer = get_serializer("orjson")
+
+    data = serializer.loads(serializer.dumps(PAYLOAD))
+
+    assert data["args"] == [
+        "2025-01-02T03:04:05+00:00",
+        "2025-01-02",
+        "12345678-1234-5678-1234-567812345678",
+        "1.10",
+    ]
+
+
+def test_publish_message_with_msgpack():
+    pytest.importorskip("msgpack")
+    message_api = Mock()
+    message = {"url": "https://example.com", "body": PAYLOAD, "retries": 3}
+
+    with patch("django_qstash.serializers.DJANGO_QSTASH_SERIALIZER", "msgpack"):
+        publish_message(message_api, message)
+        batch_messages(message_api, [message])
+
+    message_api.publish_json.assert_not_called()
+    publish_kwargs = message_api.publish.call_args[1]
+    assert publish_kwargs["content_type"] == "application/x-msgpack+base64"
+    assert publish_kwargs["retries"] == 3
+    assert get_serializer("msgpack").loads(publish_kwargs["body"]) == PAYLOAD
+    (batch_message,) = message_api.batch.call_args[0][0]
+    assert batch_message["body"] == publish_kwargs["body"]
+
+
+@pytest.mark.parametrize(
+    "content_type,expected",
+    [
+        (None, "json"),
+        ("application/json", "json"),
+        ("application/json; charset=utf-8", "json"),
+        ("application/x-msgpack+base64", "msgpack"),
+        ("text/plain", "json"),
+    ],
+)
+def test_get_serializer_for_content_type(content_type, expected):
+    pytest.importorskip("msgpack")
+    assert get_serializer_for_content_type(content_type).name == expected
+
+
+def test_json_content_type_uses_configured_orjson():
+    pytest.importorskip("orjson")
+    with patch("django_qstash.serializers.DJANGO_QSTASH_SERIALIZER", "orjson"):
+        assert get_serializer_for_content_type("application/json").name == "orjson"
+
+
+class TestWebhookDecoding:
+    def test_parse_msgpack_payload(self):
+        pytest.importorskip("msgpack")
+        body = get_serializer("msgpack").dumps(PAYLOAD)
+
+        payload = QStashWebhook().parse_payload(body, "application/x-msgpack+base64")
+
+        assert payload.args == PAYLOAD["args"]
+        assert payload.function_path == "test_module.test_func"
+
+    def test_parse_invalid_msgpack_payload(self):
+        pytest.importorskip("msgpack")
+        with pytest.raises(PayloadError, match="Invalid msgpack payload"):
+            QStashWebhook().parse_payload("not msgpack", "application/x-msgpack+base64")
+
+    def test_parse_non_object_payload(self):
+        with pytest.raises(PayloadError, match="expected an object"):
+            QStashWebhook().parse_payload("[1, 2]")
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+
+from django_qstash.app import stashed_task
+from django_qstash.exceptions import SoftTimeLimitExceeded
+from django_qstash.exceptions import TimeLimitExceeded
+from django_qstash.idempotency import CLAIMED
+from django_qstash.idempotency import DeliveryClaim
+from django_qstash.timelimits import arun_with_time_limits
+from django_qstash.timelimits import run_with_time_limits
+
+pytestmark = pytest.mark.django_db
+
+
+def busy(seconds: float) -> None:
+    # Short sleeps so asynchronous exceptions are delivered promptly
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+@stashed_task(soft_time_limit=0.05)
+def cleanup_task():
+    try:
+        busy(5)
+    except SoftTimeLimitExceeded:
+        return "cleaned up"
+    return "finished"
+
+
+@stashed_task(time_limit=0.1, idempotent=True)
+def runaway_task():
+    busy(5)
+
+
+@stashed_task(time_limit=1)
+def quick_task(x):
+    return x + 1
+
+
+@stashed_task(time_limit=0.05)
+async def slow_async_task():
+    await asyncio.sleep(5)
+
+
+@stashed_task(soft_time_limit=0.05, time_limit=1)
+async def async_cleanup_task():
+    try:
+        await asyncio.sleep(5)
+    except SoftTimeLimitExceeded:
+        await asyncio.sleep(0)
+        return "cleaned up"
+    return "finished"
+
+
+@stashed_task(soft_time_limit=0.05, time_limit=0.1)
+async def async_stubborn_task():
+    try:
+        await asyncio.sleep(5)
+    except SoftTimeLimitExceeded:
+        await asyncio.sleep(5)
+
+
+def test_run_with_time_limits_returns_result():
+    assert run_with_time_limits(lambda: 42, time_limit=1) == 42
+
+
+def test_run_with_time_limits_reraises_task_errors():
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        run_with_time_limits(fail, time_limit=1)
+
+
+def test_soft_time_limit_is_raised_in_task(webhook, build_request):
+    response, status = webhook.handle_request(build_request("cleanup_task", []))
+
+    assert status == 200
+    assert response["result"] == "cleaned up"
+
+
+def test_hard_time_limit_returns_retryable_status(webhook, build_request):
+    cache.clear()
+    start = time.monotonic()
+    response, status = webhook.handle_request(build_request("runaway_task", []))
+
+    assert time.monotonic() - start < 1
+    assert status == 503
+    assert response["error_type"] == "TimeLimitExceeded"
+    # QStash's retry may run the task again
+    assert DeliveryClaim("msg-1").claim() == (CLAIMED, None)
+
+
+def test_hard_time_limit_is_not_delayed_by_soft_limit():
+    start = time.monotonic()
+    with pytest.raises(TimeLimitExceeded):
+        run_with_time_limits(lambda: busy(5), time_limit=0.1, soft_time_limit=5)
+
+    assert time.monotonic() - start < 1
+
+
+def test_task_within_time_limit(webhook, build_request):
+    response, status = webhook.handle_request(build_request("quick_task", [1]))
+
+    assert status == 200
+    assert response["result"] == 2
+
+
+def test_async_task_time_limit(webhook, build_request):
+    response, status = async_to_sync(webhook.ahandle_request)(
+        build_request("slow_async_task", [])
+    )
+
+    assert status == 503
+    assert response["error_type"] == "TimeLimitExceeded"
+
+
+def test_async_soft_time_limit_is_raised_in_task(webhook, build_request):
+    response, status = async_to_sync(webhook.ahandle_request)(
+        build_request("async_cleanup_task", [])
+    )
+
+    assert status == 200
+    assert response["result"] == "cleaned up"
+
+
+def test_async_task_is_cancelled_at_hard_time_limit(webhook, build_request):
+    start = time.monotonic()
+    response, status = async_to_sync(webhook.ahandle_request)(
+        build_request("async_stubborn_task", [])
+    )
+
+    assert time.monotonic() - start < 1
+    assert status == 503
+    assert response["error_type"] == "TimeLimitExceeded"
+
+
+def test_arun_with_time_limits_soft_limit_not_after_hard_limit():
+    async def run():
+        await arun_with_time_limits(asyncio.sleep(5), 0.05, soft_time_limit=5)
+
+    start = time.monotonic()
+    with pytest.raises(TimeLimitExceeded):
+        async_to_sync(run)()
+
+    assert time.monotonic() - start < 1
@@ -13,7 +13,7 @@ class TestQStashWebhook:
         self.client = Client()
         self.url = "/qstash/webhook/"
 
-    @patch("django_qstash.views.QStashWebhook")
+    @patch("django_qstash.views.get_webhook")
     def test_valid_webhook_request(self, mock_webhook_class):
         """Test webhook with valid signature and payload"""
         # Setup mock webhook instance
@@ -43,7 +43,7 @@ class TestQStashWebhook:
         # Verify webhook was called correctly
         mock_webhook.handle_request.assert_called_once()
 
-    @patch("django_qstash.views.QStashWebhook")
+    @patch("django_qstash.views.get_webhook")
     def test_invalid_request(self, mock_webhook_class):
         """Test webhook with invalid request"""
         # Setup mock webhook instance
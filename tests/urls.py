@@ -5,4 +5,5 @@ from django.urls import path
 
 urlpatterns = [
     path("qstash/webhook/", include("django_qstash.urls")),
+    path("qstash/async-webhook/", include("django_qstash.async_urls")),
 ]